@@ -1,71 +1,302 @@
-import copy
-from typing import Any, Callable, Dict, List, Tuple
+import heapq
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from bounds import make_bound
+
+
+class TrailDomains:
+    """
+    Undo-log domain store for backtracking search.
+
+    Each variable's domain is a bitset over positions in its initial value list.
+    Changes are recorded on a trail so a search node is undone by popping back
+    to a mark instead of copying every domain. The unassigned count is kept
+    incrementally and MRV uses a lazy heap of (domain size, variable index);
+    stale heap entries are dropped when they surface, and the heap is rebuilt from
+    the unassigned variables once it outgrows them plus the trail.
+    An optional listener (e.g. a bound) is told about every restrict and undo.
+    """
+
+    def __init__(self, sizes: List[int], listener: Any = None):
+        self.listener = listener
+        self.masks = [(1 << d) - 1 for d in sizes]
+        self.sizes = list(sizes)
+        self.assigned = [False] * len(sizes)
+        self.n_unassigned = len(sizes)
+        self.trail: List[Tuple[int, int, int]] = []
+        self.heap = [(d, i) for i, d in enumerate(sizes)]
+        heapq.heapify(self.heap)
+
+    def mark(self) -> int:
+        return len(self.trail)
+
+    def restrict(self, i: int, mask: int) -> None:
+        old = self.masks[i]
+        if mask == old:
+            return
+        self.trail.append((i, old, self.sizes[i]))
+        self.masks[i] = mask
+        self.sizes[i] = mask.bit_count()
+        self._push(i)
+        if self.listener is not None:
+            self.listener.on_restrict(i, old, mask)
+
+    def undo(self, mark: int) -> None:
+        while len(self.trail) > mark:
+            i, mask, size = self.trail.pop()
+            if self.listener is not None:
+                self.listener.on_undo(i, self.masks[i], mask)
+            self.masks[i] = mask
+            self.sizes[i] = size
+            if not self.assigned[i]:
+                self._push(i)
+
+    def assign(self, i: int) -> None:
+        self.assigned[i] = True
+        self.n_unassigned -= 1
+
+    def unassign(self, i: int) -> None:
+        self.assigned[i] = False
+        self.n_unassigned += 1
+        self._push(i)
+
+    def _push(self, i: int) -> None:
+        heapq.heappush(self.heap, (self.sizes[i], i))
+        # Rebuild when stale entries dominate; each rebuild is paid for by at
+        # least len(sizes) pushes, and the heap stays O(variables + trail)
+        if len(self.heap) > 2 * (self.n_unassigned + len(self.trail)) + len(self.sizes):
+            self.heap = [(d, v) for v, d in enumerate(self.sizes) if not self.assigned[v]]
+            heapq.heapify(self.heap)
+
+    def mrv(self) -> int:
+        # Smallest domain first; ties go to the earliest variable, like min() over the list
+        heap = self.heap
+        while heap:
+            size, i = heap[0]
+            if not self.assigned[i] and self.sizes[i] == size:
+                return i
+            heapq.heappop(heap)
+        raise LookupError("no unassigned variable left")
+
+
+def _bits(mask: int):
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
 
 def backtracking_csp(
     variables: List[Any],
     domains: Dict[Any, List[Any]],
     constraints: List[Tuple[Any, Any, Callable[[Any, Any], bool]]],
-    soft_score: Callable[[Any, Any], float]
+    soft_score: Optional[Callable[[Any, Any], float]] = None,
+    score_matrix: Optional[Dict[str, Any]] = None,
+    capacities: Optional[Dict[Any, int]] = None,
+    bound: Any = 'max',
+    time_limit: Optional[float] = None,
+    node_limit: Optional[int] = None,
+    patience: Optional[int] = None,
+    on_improve: Optional[Callable[[Dict[Any, Any], float], Any]] = None,
+    stats: Optional[Dict[str, Any]] = None
 ) -> Tuple[Dict[Any, Any], float]:
     """
     Backtracking CSP with MRV, forward-checking, value ordering, and branch-and-bound.
+    If score_matrix (from fitness.build_score_matrix) is given, variables and values
+    must be student/tutor indices and soft_score is read from score_matrix['score'].
+    Domains may be any subset of tutors, e.g. the top-k candidate lists from
+    fitness.build_candidates on large instances.
+
+    capacities maps a value to the number of variables that may take it (e.g. a
+    tutor's capacity); it is enforced with forward checking. bound selects the
+    pruning bound from bounds.BOUNDS ('max', 'assignment') or is a Bound instance;
+    'assignment' respects capacities and prunes far more on 1-to-1 matching.
+
+    Domains live in a TrailDomains store, so memory grows with search depth only;
+    search order and result are the same as a copy-per-node implementation.
+
+    The search is anytime: time_limit (seconds), node_limit (search nodes) and
+    patience (nodes since the last improving solution) stop it early, and the
+    best complete assignment found so far is returned ({} if none yet).
+    on_improve(assignment, score) is called for every improving solution; a
+    truthy return value stops the search. If a stats dict is given it is filled
+    with 'nodes', 'elapsed' and 'stop_reason' (None when the search completed),
+    plus the search counters 'pruned_bound' (nodes cut by the bound),
+    'pruned_forward' (assignments whose forward check wiped out a domain),
+    'inconsistent' (values rejected by capacity or binary constraints),
+    'solutions' (improving complete assignments) and 'trajectory', a list of
+    (nodes, elapsed, score) per improving solution. The counters are plain
+    integers, so leaving stats out costs nothing measurable.
     """
-    # Initialize
-    init_domains = {v: list(domains.get(v, [])) for v in variables}
+    if time_limit is not None and time_limit < 0:
+        raise ValueError("time_limit must be non-negative")
+    if score_matrix is not None:
+        # Only the cells of the given domains are read, so restricted domains (e.g.
+        # fitness.build_candidates lists) never touch the rest of a large or lazy matrix
+        matrix = score_matrix['score']
+        soft_score = lambda var, val: float(matrix[var, val])
+    if soft_score is None:
+        raise ValueError("backtracking_csp needs soft_score or score_matrix")
+    # Initialize: variables and values are addressed by position from here on
+    n = len(variables)
+    index = {v: i for i, v in enumerate(variables)}
+    values = [list(domains.get(v, [])) for v in variables]
+    scores = [[soft_score(v, val) for val in values[i]] for i, v in enumerate(variables)]
+    # Static value order: descending score, stable on the original domain order
+    order = [sorted(range(len(sc)), key=lambda p, sc=sc: sc[p], reverse=True) for sc in scores]
+
+    # Per-variable constraint lists: (other, cons, var_is_x)
+    neighbors: List[List[Tuple[int, Callable[[Any, Any], bool], bool]]] = [[] for _ in range(n)]
+    for (X, Y, cons) in constraints:
+        if X == Y or X not in index or Y not in index:
+            continue
+        neighbors[index[X]].append((index[Y], cons, True))
+        neighbors[index[Y]].append((index[X], cons, False))
+
+    # Value ids shared across variables, for capacities and the bound
+    value_ids: Dict[Any, int] = {}
+    cols = [[value_ids.setdefault(val, len(value_ids)) for val in vals] for vals in values]
+    capacities = capacities or {}
+    caps: List[Optional[int]] = [None] * len(value_ids)
+    for val, c in value_ids.items():
+        if val in capacities:
+            caps[c] = capacities[val]
+    # Capped value id -> positions (variable, position) holding it
+    holders: Dict[int, List[Tuple[int, int]]] = {c: [] for c, cap in enumerate(caps) if cap is not None}
+    for i in range(n):
+        for p, c in enumerate(cols[i]):
+            if c in holders:
+                holders[c].append((i, p))
+    loads = [0] * len(value_ids)
+
+    bounder = make_bound(bound)
+    store = TrailDomains([len(vals) for vals in values], listener=bounder)
+    bounder.bind(scores, order, cols, caps, store)
+    masks = store.masks
+    assigned = store.assigned
+    chosen: List[int] = [-1] * n
+    path: List[int] = []   # assigned variables in assignment order
     best_assignment: Dict[Any, Any] = {}
     best_score: float = float('-inf')
 
-    def mrv(curr_domains: Dict[Any, List[Any]], assignment: Dict[Any, Any]) -> Any:
-        unassigned = [v for v in variables if v not in assignment]
-        return min(unassigned, key=lambda v: len(curr_domains[v]))
-
-    def forward_check(var: Any, val: Any, curr_domains: Dict[Any, List[Any]], assignment: Dict[Any, Any]) -> Dict[Any, List[Any]]:
-        new_domains = copy.deepcopy(curr_domains)
-        for (X, Y, cons) in constraints:
-            if X == var and Y not in assignment:
-                new_domains[Y] = [w for w in new_domains[Y] if cons(val, w)]
-            if Y == var and X not in assignment:
-                new_domains[X] = [w for w in new_domains[X] if cons(w, val)]
-        return new_domains
-
-    def backtrack(assignment: Dict[Any, Any], curr_domains: Dict[Any, List[Any]], curr_score: float) -> None:
-        nonlocal best_score, best_assignment
-        # Compute optimistic bound on remaining
-        unassigned = [v for v in variables if v not in assignment]
-        rem_upper = 0.0
-        for v in unassigned:
-            if curr_domains[v]:
-                rem_upper += max(soft_score(v, val) for val in curr_domains[v])
-        if curr_score + rem_upper <= best_score:
+    start = time.perf_counter()
+    deadline = None if time_limit is None else start + time_limit
+    nodes = 0
+    last_improve = 0
+    pruned_bound = 0
+    pruned_forward = 0
+    inconsistent = 0
+    trajectory: List[Tuple[int, float, float]] = []
+    stop_reason: Optional[str] = None
+
+    def out_of_budget() -> bool:
+        nonlocal stop_reason
+        if stop_reason is None:
+            if node_limit is not None and nodes >= node_limit:
+                stop_reason = 'node_limit'
+            elif patience is not None and nodes - last_improve >= patience:
+                stop_reason = 'plateau'
+            elif deadline is not None and nodes % 16 == 0 and time.perf_counter() >= deadline:
+                # The clock is read every 16 nodes only
+                stop_reason = 'time'
+        return stop_reason is not None
+
+    def consistent(i: int, p: int, val: Any) -> bool:
+        c = cols[i][p]
+        if caps[c] is not None and loads[c] >= caps[c]:
+            return False
+        for (j, cons, var_is_x) in neighbors[i]:
+            if assigned[j]:
+                other = values[j][chosen[j]]
+                if not (cons(val, other) if var_is_x else cons(other, val)):
+                    return False
+        return True
+
+    def forward_check(i: int, val: Any) -> bool:
+        """Prune unassigned neighbours; False if one of their domains is wiped out."""
+        for (j, cons, var_is_x) in neighbors[i]:
+            if assigned[j]:
+                continue
+            vals_j = values[j]
+            keep = 0
+            for p in _bits(masks[j]):
+                w = vals_j[p]
+                if cons(val, w) if var_is_x else cons(w, val):
+                    keep |= 1 << p
+            store.restrict(j, keep)
+            if not keep:
+                return False
+        # Value just reached its capacity: drop it from every unassigned domain
+        c = cols[i][chosen[i]]
+        if caps[c] is not None and loads[c] >= caps[c]:
+            drop: Dict[int, int] = {}
+            for (j, p) in holders[c]:
+                if not assigned[j]:
+                    drop[j] = drop.get(j, 0) | 1 << p
+            for j, bits in drop.items():
+                keep = masks[j] & ~bits
+                store.restrict(j, keep)
+                if not keep:
+                    return False
+        return True
+
+    def backtrack(curr_score: float) -> None:
+        nonlocal best_score, best_assignment, nodes, last_improve, stop_reason
+        nonlocal pruned_bound, pruned_forward, inconsistent
+        if out_of_budget():
+            return
+        nodes += 1
+        # Optimistic bound on remaining
+        rem_upper = bounder.upper(best_score - curr_score)
+        if rem_upper is None or curr_score + rem_upper <= best_score:
+            pruned_bound += 1
             return
         # If complete, record
-        if not unassigned:
+        if not store.n_unassigned:
             if curr_score > best_score:
                 best_score = curr_score
-                best_assignment = assignment.copy()
+                best_assignment = {variables[v]: values[v][chosen[v]] for v in path}
+                last_improve = nodes
+                if stats is not None:
+                    trajectory.append((nodes, time.perf_counter() - start, best_score))
+                if on_improve is not None and on_improve(dict(best_assignment), best_score):
+                    stop_reason = 'callback'
             return
         # Select var via MRV
-        var = mrv(curr_domains, assignment)
-        # Order values by descending soft_score
-        vals = sorted(curr_domains[var], key=lambda x: soft_score(var, x), reverse=True)
-        for val in vals:
+        var = store.mrv()
+        mask = masks[var]
+        # Values in descending soft_score order
+        for p in [p for p in order[var] if mask >> p & 1]:
+            val = values[var][p]
             # Check binary constraints with assigned vars
-            consistent = True
-            for (X, Y, cons) in constraints:
-                if X == var and Y in assignment and not cons(val, assignment[Y]):
-                    consistent = False; break
-                if Y == var and X in assignment and not cons(assignment[X], val):
-                    consistent = False; break
-            if not consistent:
+            if not consistent(var, p, val):
+                inconsistent += 1
                 continue
             # Assign and recurse
-            assignment[var] = val
-            new_score = curr_score + soft_score(var, val)
-            pruned = forward_check(var, val, curr_domains, assignment)
-            if all(pruned[w] for w in variables if w not in assignment):
-                backtrack(assignment, pruned, new_score)
-            del assignment[var]
+            mark = store.mark()
+            store.assign(var)
+            chosen[var] = p
+            path.append(var)
+            loads[cols[var][p]] += 1
+            bounder.on_assign(var, p)
+            if forward_check(var, val):
+                backtrack(curr_score + scores[var][p])
+            else:
+                pruned_forward += 1
+            store.undo(mark)
+            bounder.on_unassign(var, p)
+            loads[cols[var][p]] -= 1
+            path.pop()
+            store.unassign(var)
+            chosen[var] = -1
+            if stop_reason is not None:
+                return
 
     # Start backtracking
-    backtrack({}, init_domains, 0.0)
-    return best_assignment, best_score
\ No newline at end of file
+    backtrack(0.0)
+    if stats is not None:
+        stats.update(nodes=nodes, elapsed=time.perf_counter() - start, stop_reason=stop_reason,
+                     pruned_bound=pruned_bound, pruned_forward=pruned_forward,
+                     inconsistent=inconsistent, solutions=len(trajectory), trajectory=trajectory)
+    return best_assignment, best_score
@@ -0,0 +1,223 @@
+"""
+Pluggable upper bounds for the branch-and-bound in back_CSP.backtracking_csp.
+
+A bound is told about every search event (domain restrict/undo, assign/unassign)
+and answers upper(need): an optimistic estimate of the score the unassigned
+variables can still add, or None when the remaining subproblem is infeasible.
+The node is pruned unless the estimate exceeds need, so a bound may stop at any
+cheaper estimate that is already <= need.
+"""
+import math
+import os
+import sys
+from typing import Any, List, Optional
+
+import numpy as np
+
+# solve_assignment lives in linear_assignment/src/lap.py; that folder is script-style
+# (flat imports), so its source dir is appended to sys.path when missing
+_LAP_SRC = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                        'linear_assignment', 'src')
+if _LAP_SRC not in sys.path:
+    sys.path.append(_LAP_SRC)
+
+from lap import solve_assignment  # noqa: E402
+
+
+class Bound:
+    """Base class; subclasses override the hooks they need."""
+
+    def bind(self, scores: List[List[float]], order: List[List[int]], cols: List[List[int]],
+             caps: List[Optional[int]], store: Any) -> None:
+        """
+        scores[i][p]: soft score of the p-th initial value of variable i
+        order[i]: positions of variable i sorted by descending score
+        cols[i][p]: id of the p-th value of variable i (shared across variables)
+        caps[c]: capacity of value id c, None if unlimited
+        store: the TrailDomains of the search
+        """
+        self.scores = scores
+        self.order = order
+        self.cols = cols
+        self.caps = caps
+        self.store = store
+
+    def on_restrict(self, i: int, old_mask: int, new_mask: int) -> None:
+        pass
+
+    def on_undo(self, i: int, mask: int, restored: int) -> None:
+        pass
+
+    def on_assign(self, i: int, p: int) -> None:
+        pass
+
+    def on_unassign(self, i: int, p: int) -> None:
+        pass
+
+    def upper(self, need: float = -math.inf) -> Optional[float]:
+        raise NotImplementedError
+
+
+class MaxBound(Bound):
+    """
+    Sum over unassigned variables of their best remaining value (values may repeat).
+    Per-variable maxima and the running total are cached and updated on each event;
+    old values are kept on a stack so undo restores them exactly.
+    """
+
+    def bind(self, scores, order, cols, caps, store) -> None:
+        super().bind(scores, order, cols, caps, store)
+        self.best = [self._best(i, mask) for i, mask in enumerate(store.masks)]
+        self.total = 0.0
+        for b in self.best:
+            self.total += b
+        self.saved: List[tuple] = []
+
+    def _best(self, i: int, mask: int) -> float:
+        for p in self.order[i]:
+            if mask >> p & 1:
+                return self.scores[i][p]
+        return 0.0
+
+    def on_restrict(self, i, old_mask, new_mask) -> None:
+        self.saved.append((self.best[i], self.total))
+        new_best = self._best(i, new_mask)
+        self.total += new_best - self.best[i]
+        self.best[i] = new_best
+
+    def on_undo(self, i, mask, restored) -> None:
+        self.best[i], self.total = self.saved.pop()
+
+    def on_assign(self, i, p) -> None:
+        self.saved.append((self.best[i], self.total))
+        self.total -= self.best[i]
+
+    def on_unassign(self, i, p) -> None:
+        self.best[i], self.total = self.saved.pop()
+
+    def upper(self, need: float = -math.inf) -> Optional[float]:
+        return self.total
+
+
+class AssignmentBound(Bound):
+    """
+    Assignment relaxation: the best completion that respects domains and value
+    capacities, ignoring the other binary constraints. Solved exactly with a
+    Hungarian step over the unassigned variables and the remaining value slots,
+    so it is never looser than MaxBound and detects capacity dead-ends early.
+
+    The Hungarian step only runs when it can change the answer: a MaxBound kept
+    alongside is returned as is when it already prunes the node, or when every
+    variable's best value still fits in that value's remaining capacity (then
+    both relaxations coincide). When it does run it is warm-started from the
+    duals and matching of the nearest ancestor that solved it, since a child
+    only drops rows and slots and forbids cells, so just the rows that lost
+    their slot get re-augmented.
+    """
+
+    def bind(self, scores, order, cols, caps, store) -> None:
+        super().bind(scores, order, cols, caps, store)
+        self.max = MaxBound()
+        self.max.bind(scores, order, cols, caps, store)
+        n, k = len(scores), len(caps)
+        self.weight = np.zeros((n, k))
+        self.allowed = np.zeros((n, k), dtype=bool)
+        for i in range(n):
+            for p, c in enumerate(cols[i]):
+                # Repeated values in one domain: keep the best score
+                if not self.allowed[i, c] or scores[i][p] > self.weight[i, c]:
+                    self.weight[i, c] = scores[i][p]
+                self.allowed[i, c] = True
+        self.count = np.zeros((n, k), dtype=np.int64)
+        for i in range(n):
+            for c in cols[i]:
+                self.count[i, c] += 1
+        self.remaining = np.array([n if c is None else c for c in caps], dtype=np.int64)
+        self.unassigned = np.ones(n, dtype=bool)
+        # (rows, slot keys, row duals, slot duals, picked) of the last solve, saved per depth
+        self.state = None
+        self.saved = []
+        big = float(np.abs(self.weight).max()) if self.weight.size else 0.0
+        self.forbidden = (big + 1.0) * (n + 1)
+
+    def _toggle(self, i: int, removed: int, delta: int) -> None:
+        # Positions -> value ids; a value stays allowed while any of its positions is
+        cols = self.cols[i]
+        while removed:
+            low = removed & -removed
+            c = cols[low.bit_length() - 1]
+            self.count[i, c] += delta
+            self.allowed[i, c] = self.count[i, c] > 0
+            removed ^= low
+
+    def on_restrict(self, i, old_mask, new_mask) -> None:
+        self._toggle(i, old_mask & ~new_mask, -1)
+        self.max.on_restrict(i, old_mask, new_mask)
+
+    def on_undo(self, i, mask, restored) -> None:
+        self._toggle(i, restored & ~mask, +1)
+        self.max.on_undo(i, mask, restored)
+
+    def on_assign(self, i, p) -> None:
+        self.unassigned[i] = False
+        self.remaining[self.cols[i][p]] -= 1
+        self.saved.append(self.state)
+        self.max.on_assign(i, p)
+
+    def on_unassign(self, i, p) -> None:
+        self.unassigned[i] = True
+        self.remaining[self.cols[i][p]] += 1
+        self.state = self.saved.pop()
+        self.max.on_unassign(i, p)
+
+    def upper(self, need: float = -math.inf) -> Optional[float]:
+        rows = np.flatnonzero(self.unassigned)
+        k = len(rows)
+        if k == 0:
+            return 0.0
+        # One column per remaining slot; more than k copies of a value never help
+        copies = np.minimum(self.remaining, k)
+        slots = np.repeat(np.arange(len(self.caps)), copies)
+        if len(slots) < k:
+            return None
+        loose = self.max.upper()
+        if loose <= need:
+            return loose
+        # Every variable's best value fits its remaining capacity: no conflict to resolve
+        weight = np.where(self.allowed[rows], self.weight[rows], -np.inf)
+        best = weight.argmax(axis=1)
+        if np.isfinite(weight[np.arange(k), best]).all() and \
+                (np.bincount(best, minlength=len(self.caps)) <= self.remaining).all():
+            return loose
+        allowed = self.allowed[np.ix_(rows, slots)]
+        cost = np.where(allowed, -self.weight[np.ix_(rows, slots)], self.forbidden)
+        # Slot key = (value, copy); sorted, and a subset of any ancestor's keys
+        keys = slots * (len(self.scores) + 1) + np.arange(len(slots)) - np.repeat(np.cumsum(copies) - copies, copies)
+        warm = None
+        if self.state is not None:
+            prev_rows, prev_keys, u, v, prev_picked = self.state
+            r = np.searchsorted(prev_rows, rows)
+            kept = np.searchsorted(keys, prev_keys[prev_picked[r]])
+            found = kept < len(keys)
+            found[found] = keys[kept[found]] == prev_keys[prev_picked[r]][found]
+            warm = (u[r], v[np.searchsorted(prev_keys, keys)], np.where(found, kept, -1))
+        picked, u, v = solve_assignment(cost, warm, duals=True)
+        self.state = (rows, keys, u, v, picked)
+        if not allowed[np.arange(k), picked].all():
+            return None
+        return float(-cost[np.arange(k), picked].sum())
+
+
+BOUNDS = {
+    'max': MaxBound,
+    'assignment': AssignmentBound,
+}
+
+
+def make_bound(bound: Any) -> Bound:
+    """Accept a Bound instance or one of the names in BOUNDS."""
+    if isinstance(bound, Bound):
+        return bound
+    if bound not in BOUNDS:
+        raise ValueError(f"Unknown bound {bound!r}; expected one of {sorted(BOUNDS)} or a Bound")
+    return BOUNDS[bound]()
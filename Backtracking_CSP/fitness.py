@@ -2,6 +2,13 @@
 """
 Fitness module for Genetic Algorithm matching in Tutas.
 """
+import numpy as np
+import pandas as pd
+
+# Order matters: score_pair sums the weighted terms in this order.
+CRITERIA = ('mata_kuliah', 'subbab', 'gaya_belajar', 'mode', 'waktu')
+# CSV column marking students whose time always counts as a match
+FLEKS_COLUMN = 'fleksibel_waktu'
 
 def time_score(student_time: str, tutor_time: str, fleksibel: bool) -> float:
     """
@@ -17,7 +24,7 @@ def score_pair(s, t, weights):
     Compute weighted score for a student-tutor pair.
     s, t: dict or pandas.Series with keys:
         'mata_kuliah', 'subbab', 'gaya_belajar', 'mode',
-        'waktu', 'fleksibilitas_waktu'
+        'waktu', 'fleksibel_waktu'
     weights: dict with weights for those keys.
     Returns:
         total weighted score (float),
@@ -29,7 +36,7 @@ def score_pair(s, t, weights):
     style_match = 1 if s['gaya_belajar'] == t['gaya_belajar'] else 0
     mode_match  = 1 if s['mode']         == t['mode']         else 0
 
-    fleks = bool(s.get('fleksibilitas_waktu', False))
+    fleks = bool(s.get(FLEKS_COLUMN, False))
     time_match = 1 if (s['waktu'] == t['waktu'] or fleks) else 0
 
     # Weighted score
@@ -45,17 +52,104 @@ def score_pair(s, t, weights):
     return total, satisfied_count
 
 
-def compute_fitness(chromosome, df_students, df_tutors, weights):
+def _match_matrix(s_col, t_col):
+    """
+    Vectorized equality of two categorical columns -> bool matrix (n_s, n_t).
+    Missing values never match, same as NaN == NaN in score_pair.
+    """
+    if isinstance(s_col.dtype, pd.CategoricalDtype) and s_col.dtype == t_col.dtype:
+        # Shared-vocabulary categoricals (encoded loader): compare integer codes directly
+        s_codes = s_col.cat.codes.to_numpy()[:, None]
+        t_codes = t_col.cat.codes.to_numpy()[None, :]
+    else:
+        codes, _ = pd.factorize(pd.concat([s_col, t_col], ignore_index=True))
+        s_codes = codes[:len(s_col), None]
+        t_codes = codes[len(s_col):][None, :]
+    return (s_codes == t_codes) & (s_codes >= 0)
+
+
+def build_score_matrix(df_students, df_tutors, weights):
+    """
+    Compile score_pair for every student-tutor pair in one vectorized pass.
+    df_students, df_tutors: DataFrames with the score_pair columns, index 0..n-1
+    weights: dict of metric weights
+
+    Returns:
+        dict with
+          'score'          : float ndarray (n_students, n_tutors), score_pair total
+          'satisfied'      : int ndarray (n_students, n_tutors), score_pair count
+          'num_constraints': len(weights)
+    """
+    n, m = len(df_students), len(df_tutors)
+    if FLEKS_COLUMN in df_students:
+        fleks = df_students[FLEKS_COLUMN].map(bool).to_numpy(dtype=bool)
+    else:
+        fleks = np.zeros(n, dtype=bool)
+
+    score = np.zeros((n, m))
+    satisfied = np.zeros((n, m), dtype=np.int64)
+    for key in CRITERIA:
+        match = _match_matrix(df_students[key], df_tutors[key])
+        if key == 'waktu':
+            match |= fleks[:, None]
+        score += weights[key] * match
+        satisfied += match
+
+    return {
+        'score': score,
+        'satisfied': satisfied,
+        'num_constraints': len(weights)
+    }
+
+
+CAPACITY_COLUMN = 'kapasitas'
+
+
+def normalize_capacities(capacities, m: int):
+    """
+    Normalize tutor capacities: None (unbounded) stays None, an int applies
+    to every tutor, anything else must be a sequence of length m.
+    """
+    if capacities is None:
+        return None
+    if isinstance(capacities, (int, np.integer)):
+        caps = [int(capacities)] * m
+    else:
+        caps = [int(c) for c in capacities]
+    if len(caps) != m:
+        raise ValueError(f"Expected capacities for {m} tutors, got {len(caps)}")
+    if any(c < 0 for c in caps):
+        raise ValueError("Tutor capacities must be non-negative")
+    return caps
+
+
+def tutor_capacities(df_tutors, default: int = 1):
+    """
+    Per-tutor capacity (maximum number of students) from the 'kapasitas' column.
+    Returns None when the column is absent (tutors may be reused freely, the
+    previous behavior); blank cells get `default`.
+    """
+    if df_tutors is None or CAPACITY_COLUMN not in df_tutors:
+        return None
+    caps = pd.to_numeric(df_tutors[CAPACITY_COLUMN].astype(object)).fillna(default)
+    return normalize_capacities(caps.astype(np.int64).tolist(), len(df_tutors))
+
+
+def compute_fitness(chromosome, df_students, df_tutors, weights, score_matrix=None):
     """
     chromosome: list of tutor_id per student_id
     df_students: pandas.DataFrame indexed by student ID
     df_tutors: pandas.DataFrame indexed by tutor ID
     weights: dict of metric weights
+    score_matrix: optional output of build_score_matrix; skips the .loc lookups
 
     Returns:
         dict with 'total_score' and 'pct_satisfied'
         where 'pct_satisfied' is the average percentage of constraints satisfied per pair.
     """
+    if score_matrix is not None:
+        return _fitness_from_matrix(chromosome, score_matrix)
+
     total_score = 0.0
     total_pct = 0.0
     num_constraints = len(weights)  # e.g., 5
@@ -76,3 +170,16 @@ def compute_fitness(chromosome, df_students, df_tutors, weights):
         'total_score': total_score,
         'pct_satisfied': avg_pct_satisfied
     }
+
+
+def _fitness_from_matrix(chromosome, score_matrix):
+    n = len(chromosome)
+    if n == 0:
+        return {'total_score': 0.0, 'pct_satisfied': 0.0}
+    rows = np.arange(n)
+    total_score = float(score_matrix['score'][rows, chromosome].sum())
+    total_sat = int(score_matrix['satisfied'][rows, chromosome].sum())
+    return {
+        'total_score': total_score,
+        'pct_satisfied': total_sat / score_matrix['num_constraints'] / n
+    }
@@ -0,0 +1,18 @@
+"""
+Kriteria berhenti GA anytime (batas generasi, batas waktu, plateau, callback).
+Implementasinya satu dengan SA: simulated_annealing/src/budget.py, di sini cuma di-import.
+GA manggil Budget(...,check_every=1) biar jam dicek tiap generasi,
+dan tick_times=True kalau butuh durasi per generasi.
+"""
+import os
+import sys
+
+#folder_SA_gaya_script(import_flat),jadi_source_dir-nya_ditambah_ke_sys.path_kalau_belum_ada
+_SA_SRC=os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))),
+                     'simulated_annealing','src')
+if _SA_SRC not in sys.path:
+    sys.path.append(_SA_SRC)
+
+from budget import Budget  # noqa: E402
+
+__all__=['Budget']
@@ -1,6 +1,15 @@
-import random
+import numpy as np
 
-def init_chromosome(num_pairs):
-    tutors = list(range(num_pairs))
-    random.shuffle(tutors)
-    return tutors
+def init_chromosome(num_pairs,rng=None):
+    #rng:seed_atau_numpy_Generator(None=acak_dari_OS)
+    rng=np.random.default_rng(rng)
+    return rng.permutation(num_pairs).tolist()
+
+def init_chromosomes(pop_size,num_pairs,rng):
+    #populasi_sebagai_array_(pop_size,num_pairs),_tiap_baris_permutasi_acak
+    base=np.tile(np.arange(num_pairs),(pop_size,1))
+    return rng.permuted(base,axis=1)
+
+def capacity_slots(capacities):
+    #tutor_t_muncul_capacities[t]_kali;kromosom=permutasi_id_slot,jadi_beban_tutor_ga_mungkin_lewat_kapasitas
+    return np.repeat(np.arange(len(capacities)),np.asarray(capacities,dtype=np.int64))
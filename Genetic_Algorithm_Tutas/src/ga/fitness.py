@@ -1,6 +1,14 @@
 """
 Modul fitness untuk algoritma genetika di sistem matching Tutas.
 """
+from collections import OrderedDict
+import numpy as np
+import pandas as pd
+
+#urutan_penting:score_pair_menjumlah_skor_dengan_urutan_ini
+CRITERIA=('mata_kuliah','subbab','gaya_belajar','mode','waktu')
+#kolom_csv_murid_fleksibel_waktu(waktu_selalu_dianggap_cocok)
+FLEKS_COLUMN='fleksibel_waktu'
 
 def time_score(student_time: str, tutor_time: str, fleksibel: bool) -> float:
     """
@@ -15,7 +23,7 @@ def score_pair(s, t, weights):
     """
     Hitung skor total dan jumlah constraint yang terpenuhi buat 1 pasangan murid-tutor.
     s,t: bisa Series atau dict, harus punya key:
-        'mata_kuliah','subbab','gaya_belajar','mode','waktu','fleksibilitas_waktu'
+        'mata_kuliah','subbab','gaya_belajar','mode','waktu','fleksibel_waktu'
     weights: bobot untuk masing-masing constraint.
     Return:
         - total skor (float)
@@ -27,7 +35,7 @@ def score_pair(s, t, weights):
     style_match=1 if s['gaya_belajar']==t['gaya_belajar'] else 0
     mode_match=1 if s['mode']==t['mode'] else 0
 
-    fleks=bool(s.get('fleksibilitas_waktu',False))
+    fleks=bool(s.get(FLEKS_COLUMN,False))
     time_match=1 if (s['waktu']==t['waktu'] or fleks) else 0
 
     #skor_total_dengan_bobot
@@ -45,16 +53,95 @@ def score_pair(s, t, weights):
     return total,satisfied_count
 
 
-def compute_fitness(chromosome, df_students, df_tutors, weights):
+def _match_matrix(s_col,t_col):
+    """
+    Perbandingan kategori secara vektor -> matriks bool (n_murid, n_tutor).
+    Nilai kosong (NaN) ga pernah dianggap cocok, sama kayak di score_pair.
+    """
+    if isinstance(s_col.dtype,pd.CategoricalDtype) and s_col.dtype==t_col.dtype:
+        #vocab_bersama_dari_loader_terenkode->langsung_bandingkan_kode_integer
+        s_codes=s_col.cat.codes.to_numpy()[:,None]
+        t_codes=t_col.cat.codes.to_numpy()[None,:]
+    else:
+        codes,_=pd.factorize(pd.concat([s_col,t_col],ignore_index=True))
+        s_codes=codes[:len(s_col),None]
+        t_codes=codes[len(s_col):][None,:]
+    return (s_codes==t_codes)&(s_codes>=0)
+
+
+def build_score_matrix(df_students, df_tutors, weights):
+    """
+    Hitung score_pair untuk semua pasangan murid-tutor sekaligus (sekali di awal).
+    df_students/df_tutors: dataframe dengan kolom yang sama kayak score_pair, index 0..n-1
+    weights: bobot per constraint
+
+    Output dict:
+        - score: matriks float (n_murid, n_tutor), total skor score_pair
+        - satisfied: matriks int (n_murid, n_tutor), jumlah constraint terpenuhi
+        - num_constraints: len(weights)
+    """
+    n,m=len(df_students),len(df_tutors)
+    if FLEKS_COLUMN in df_students:
+        fleks=df_students[FLEKS_COLUMN].map(bool).to_numpy(dtype=bool)
+    else:
+        fleks=np.zeros(n,dtype=bool)
+
+    score=np.zeros((n,m))
+    satisfied=np.zeros((n,m),dtype=np.int64)
+    for key in CRITERIA:
+        match=_match_matrix(df_students[key],df_tutors[key])
+        if key=='waktu':
+            match|=fleks[:,None]
+        score+=weights[key]*match
+        satisfied+=match
+
+    return {
+        'score':score,
+        'satisfied':satisfied,
+        'num_constraints':len(weights)
+    }
+
+
+CAPACITY_COLUMN='kapasitas'
+
+
+def normalize_capacities(capacities,m:int):
+    #None=tanpa_batas,int=sama_untuk_semua_tutor,selain_itu_list_panjang_m
+    if capacities is None:
+        return None
+    if isinstance(capacities,(int,np.integer)):
+        caps=[int(capacities)]*m
+    else:
+        caps=[int(c) for c in capacities]
+    if len(caps)!=m:
+        raise ValueError(f"Kapasitas harus ada untuk {m} tutor, bukan {len(caps)}")
+    if any(c<0 for c in caps):
+        raise ValueError("Kapasitas tutor ga boleh negatif")
+    return caps
+
+
+def tutor_capacities(df_tutors,default:int=1):
+    #kapasitas_tiap_tutor_dari_kolom_kapasitas;kolom_ga_ada->None(perilaku_lama),sel_kosong->default
+    if df_tutors is None or CAPACITY_COLUMN not in df_tutors:
+        return None
+    caps=pd.to_numeric(df_tutors[CAPACITY_COLUMN].astype(object)).fillna(default)
+    return normalize_capacities(caps.astype(np.int64).tolist(),len(df_tutors))
+
+
+def compute_fitness(chromosome, df_students, df_tutors, weights, score_matrix=None):
     """
     chromosome: list tutor_id per student
     df_students/df_tutors: dataframe yang udah diset index-nya sesuai ID
     weights: bobot per constraint (total 5)
+    score_matrix: opsional, hasil build_score_matrix (biar ga lookup .loc lagi)
 
     Output:
         - total_score: akumulasi skor semua pasangan
         - pct_satisfied: rata-rata persentase constraint terpenuhi per pasangan
     """
+    if score_matrix is not None:
+        return _fitness_from_matrix(chromosome,score_matrix)
+
     total_score=0.0
     total_pct=0.0
     num_constraints=len(weights)   #misal: 5
@@ -74,3 +161,124 @@ def compute_fitness(chromosome, df_students, df_tutors, weights):
         'total_score':total_score,
         'pct_satisfied':avg_pct_satisfied
     }
+
+
+def _fitness_from_matrix(chromosome,score_matrix):
+    n=len(chromosome)
+    if n==0:
+        return {'total_score':0.0,'pct_satisfied':0.0}
+    rows=np.arange(n)
+    total_score=float(score_matrix['score'][rows,chromosome].sum())
+    total_sat=int(score_matrix['satisfied'][rows,chromosome].sum())
+    return {
+        'total_score':total_score,
+        'pct_satisfied':total_sat/score_matrix['num_constraints']/n
+    }
+
+
+def population_fitness(population,score_matrix,slots=None):
+    """
+    Total skor semua kromosom sekaligus (gather+sum ke matriks skor).
+    population: array int (pop_size, n), tutor_id per murid tiap kromosom
+    slots: kalau diisi, gen = id slot kapasitas (lihat ga.chromosome.capacity_slots);
+           n gen pertama di-decode jadi tutor lewat slots[gen]
+    score_matrix boleh hasil build_lazy_score_matrix (fitness.py SA): skor dihitung vektor per generasi
+    Output: array total_score (pop_size,)
+    """
+    score=score_matrix['score']
+    if slots is not None:
+        population=slots[population[:,:score.shape[0]]]
+    if 'lazy' in score_matrix:
+        #view_lazy:indexing_(n,pop_size)_langsung,urutan_jumlahnya_sama_dengan_jalur_dense
+        return score[np.arange(score.shape[0])[:,None],population.T].sum(axis=0)
+    #index_datar(row*m+col)+np.take_lebih_cepat_dari_fancy_indexing_2D.
+    #gather_jadi_(n,pop_size)_lalu_sum(axis=0):penjumlahan_berurutan_per_murid
+    offsets=np.arange(population.shape[1])[:,None]*score.shape[1]
+    return np.take(score.ravel(),np.ascontiguousarray(population.T)+offsets).sum(axis=0)
+
+def delta_fitness(base_scores,rows,cols,new,old,score_matrix,slots=None):
+    """
+    Skor kromosom turunan tanpa rescore penuh: base_scores (skor kromosom acuan per baris)
+    ditambah score[k,gen_baru]-score[k,gen_lama] di gen yang berubah saja.
+    rows,cols: baris & posisi gen yang berubah (unik per baris); new,old: gen di posisi itu
+    slots: kalau diisi gen=id_slot, cuma n posisi pertama yang dihitung (sisanya slot kosong)
+    Selisih dijumlah per baris sesuai urutan entri (bincount), sama dengan ga.kernels.breed
+    Output: array total_score (len(base_scores),)
+    """
+    score=score_matrix['score']
+    n,m=score.shape
+    if slots is not None:
+        used=cols<n
+        rows,cols,new,old=rows[used],cols[used],slots[new[used]],slots[old[used]]
+    if 'lazy' in score_matrix:
+        delta=score[cols,new]-score[cols,old]
+    else:
+        flat=score.ravel()
+        delta=np.take(flat,cols*m+new)-np.take(flat,cols*m+old)
+    return base_scores+np.bincount(rows,weights=delta,minlength=len(base_scores))
+
+#default_jumlah_kromosom_yang_disimpan_FitnessCache
+FITNESS_CACHE_SIZE=4096
+
+class FitnessCache:
+    """
+    Cache LRU total_score per kromosom, biar kromosom kembar (populasi yang udah konvergen,
+    mutation_rate kecil) ga diturunin/dihitung ulang tiap generasi.
+    Key=digest 16 byte dari tutor per murid (n gen pertama, di-decode lewat slots kalau ada): dua hash
+    Σ gen[k]*pengali[k] mod 2^64 dengan pengali ganjil acak (seed tetap) per posisi, dihitung satu matmul
+    untuk seluruh populasi. Memori per entri ga ikut n, dan kromosom slot beda dengan assignment sama
+    berbagi satu entri.
+    capacity: jumlah kromosom maksimal; kalau penuh yang paling lama ga dipakai dibuang duluan
+    """
+
+    def __init__(self,capacity:int=FITNESS_CACHE_SIZE):
+        if capacity<1:
+            raise ValueError("capacity minimal 1")
+        self.capacity=capacity
+        self.cache=OrderedDict()
+        self.hits=self.misses=self.evictions=0
+        self.multipliers=np.zeros((0,2),dtype=np.uint64)
+
+    def keys(self,population,num_pairs:int,slots=None)->list:
+        #digest_tiap_baris_dari_tutor_per_murid
+        genes=population[:,:num_pairs]
+        if slots is not None:
+            genes=slots[genes]
+        if len(self.multipliers)!=num_pairs:
+            raw=np.random.default_rng(0).integers(0,2**63,(num_pairs,2),dtype=np.uint64)
+            self.multipliers=(raw<<np.uint64(1))|np.uint64(1)
+        #matmul_integer_wrap_mod_2^64
+        return [row.tobytes() for row in genes.astype(np.uint64)@self.multipliers]
+
+    def lookup(self,keys):
+        #(skor,miss):skor_cache_per_key(nan_kalau_belum_ada),miss=mask_key_yang_belum_ada
+        scores=np.full(len(keys),np.nan)
+        miss=np.ones(len(keys),dtype=bool)
+        cache=self.cache
+        for r,key in enumerate(keys):
+            value=cache.get(key)
+            if value is not None:
+                cache.move_to_end(key)
+                scores[r]=value
+                miss[r]=False
+        hits=len(keys)-int(miss.sum())
+        self.hits+=hits
+        self.misses+=len(keys)-hits
+        return scores,miss
+
+    def store(self,keys,scores):
+        #simpan_skor_per_key,buang_yang_paling_lama_ga_dipakai_kalau_lewat_capacity
+        cache=self.cache
+        for key,value in zip(keys,np.asarray(scores).tolist()):
+            cache[key]=value
+            cache.move_to_end(key)
+            if len(cache)>self.capacity:
+                cache.popitem(last=False)
+                self.evictions+=1
+
+    def cache_info(self)->dict:
+        #statistik_cache:hit/miss/eviction,hit_rate,isi
+        lookups=self.hits+self.misses
+        return {'hits':self.hits,'misses':self.misses,'evictions':self.evictions,
+                'hit_rate':self.hits/lookups if lookups else 0.0,
+                'size':len(self.cache),'capacity':self.capacity}
@@ -2,26 +2,32 @@
 Algoritma Genetika untuk matching murid-tutor di Tutas.
 Ngatur: inisialisasi populasi, seleksi, crossover, mutasi, dan loop GA.
 """
-import random
+import sys
 from typing import List, Dict, Any
-from ga.chromosome import init_chromosome
-from ga.fitness import compute_fitness
+import numpy as np
+from ga import kernels
+from ga.budget import Budget
+from ga.chromosome import capacity_slots,init_chromosome,init_chromosomes
+from ga.fitness import (FitnessCache,build_score_matrix,compute_fitness,delta_fitness,normalize_capacities,
+                        population_fitness,tutor_capacities)
 
-def init_population(pop_size:int,num_pairs:int)->List[List[int]]:
-    #generate_populasi_awal_sebanyak_pop_size
-    return [init_chromosome(num_pairs) for _ in range(pop_size)]
+def init_population(pop_size:int,num_pairs:int,rng=None)->List[List[int]]:
+    #generate_populasi_awal_sebanyak_pop_size;rng:seed_atau_numpy_Generator
+    rng=np.random.default_rng(rng)
+    return [init_chromosome(num_pairs,rng) for _ in range(pop_size)]
 
-def tournament_selection(pop:List[List[int]],fitnesses:List[Dict[str,Any]],k:int=3)->List[int]:
+def tournament_selection(pop:List[List[int]],fitnesses:List[Dict[str,Any]],k:int=3,rng=None)->List[int]:
     #ambil_k_kromosom_acak_dan_pilih_yang_total_score_tertinggi
-    selected=random.sample(list(zip(pop,fitnesses)),k)
-    parent=max(selected,key=lambda pair:pair[1]['total_score'])[0]
-    return parent
+    rng=np.random.default_rng(rng)
+    selected=rng.choice(len(pop),k,replace=False)
+    return pop[max(selected,key=lambda i:fitnesses[i]['total_score'])]
 
-def pmx_crossover(parent1:List[int],parent2:List[int])->List[int]:
+def pmx_crossover(parent1:List[int],parent2:List[int],rng=None)->List[int]:
     #Partially_Mapped_Crossover_untuk_permutesi_kromosom
+    rng=np.random.default_rng(rng)
     size=len(parent1)
     c1,c2=parent1[:],parent2[:]
-    a,b=sorted(random.sample(range(size),2))
+    a,b=sorted(rng.choice(size,2,replace=False).tolist())
     mapping1={c1[i]:c2[i] for i in range(a,b+1)}
     child=[-1]*size
     child[a:b+1]=c1[a:b+1]
@@ -32,46 +38,303 @@ def pmx_crossover(parent1:List[int],parent2:List[int])->List[int]:
         child[i]=gene
     return child
 
-def swap_mutation(chrom:List[int],mutation_rate:float)->List[int]:
+def swap_mutation(chrom:List[int],mutation_rate:float,rng=None)->List[int]:
     #swap_dua_posisi_dengan_probabilitas_tertentu
+    rng=np.random.default_rng(rng)
     child=chrom[:]
-    if random.random()<mutation_rate:
-        i,j=random.sample(range(len(child)),2)
+    if rng.random()<mutation_rate:
+        i,j=rng.choice(len(child),2,replace=False).tolist()
         child[i],child[j]=child[j],child[i]
     return child
 
+def tournament_selection_batch(scores:np.ndarray,num:int,rng,k:int=3)->np.ndarray:
+    #num_turnamen_sekaligus:tiap_baris_ambil_k_indeks_berbeda,pilih_skor_tertinggi
+    pop_size=len(scores)
+    k=min(k,pop_size)
+    cand=rng.random((num,pop_size)).argpartition(k-1,axis=1)[:,:k]
+    return cand[np.arange(num),scores[cand].argmax(axis=1)]
+
+def pmx_cuts(num:int,size:int,rng):
+    #dua_titik_potong_berbeda_per_baris_kayak_pmx_crossover->(a,b),a<b
+    x=rng.integers(0,size,num)
+    y=rng.integers(0,size-1,num)
+    y+=(y>=x)
+    return np.minimum(x,y),np.maximum(x,y)
+
+def pmx_crossover_batch(parents1:np.ndarray,parents2:np.ndarray,rng)->np.ndarray:
+    #PMX_untuk_banyak_pasangan_parent_sekaligus(tiap_baris_punya_segmen_sendiri)
+    num,size=parents1.shape
+    rows=np.arange(num)[:,None]
+    a,b=pmx_cuts(num,size,rng)
+    a,b=a[:,None],b[:,None]
+    pos=np.arange(size)[None,:]
+    in_seg=(pos>=a)&(pos<=b)
+    #inv1[r,gene]=posisi_gene_di_parent1
+    inv1=np.empty_like(parents1)
+    inv1[rows,parents1]=pos
+    child=np.where(in_seg,parents1,parents2)
+    #gen_parent2_di_luar_segmen_yang_udah_ada_di_segmen_parent1_diikutin_mappingnya.
+    #rantai_mapping_saling_lepas,jadi_total_kerja_O(num*size)
+    p=inv1[rows,parents2]
+    r,c=np.nonzero((~in_seg)&(p>=a)&(p<=b))
+    pr=p[r,c]
+    while len(r):
+        gene=parents2[r,pr]
+        child[r,c]=gene
+        pr=inv1[r,gene]
+        keep=(pr>=a[r,0])&(pr<=b[r,0])
+        r,c,pr=r[keep],c[keep],pr[keep]
+    return child
+
+def mutation_draws(num:int,size:int,mutation_rate:float,rng):
+    #(baris_yang_kena_mutasi,posisi_i,posisi_j≠i);kromosom<2_gen_ga_ada_mutasi_dan_ga_ambil_angka_acak
+    if size<2:
+        empty=np.zeros(0,dtype=np.int64)
+        return empty,empty,empty
+    hit=np.flatnonzero(rng.random(num)<mutation_rate)
+    i=rng.integers(0,size,len(hit))
+    j=(i+rng.integers(1,size,len(hit)))%size
+    return hit,i,j
+
+def swap_mutation_batch(pop:np.ndarray,mutation_rate:float,rng)->np.ndarray:
+    #swap_dua_posisi_berbeda_di_baris_yang_kena_mutasi
+    child=pop.copy()
+    hit,i,j=mutation_draws(*child.shape,mutation_rate,rng)
+    child[hit,i],child[hit,j]=child[hit,j],child[hit,i]
+    return child
+
+def _breed_compiled(population,scores,best,best_score,i1,i2,do_cross,mutation_rate,rng,score_matrix,slots):
+    #generasi_baru(+skornya)_lewat_ga.kernels;urutan_ambil_angka_acak_sama_dengan_jalur_numpy_di_evolve
+    num_pairs=population.shape[1]
+    cross=np.flatnonzero(do_cross) if num_pairs>=2 else np.zeros(0,dtype=np.int64)
+    a=b=np.zeros(0,dtype=np.int64)
+    if len(cross):
+        a,b=pmx_cuts(len(cross),num_pairs,rng)
+    hit,mi,mj=mutation_draws(len(i1),num_pairs,mutation_rate,rng)
+    score=np.ascontiguousarray(score_matrix['score'],dtype=np.float64)
+    slots=np.zeros(0,dtype=np.int64) if slots is None else slots
+    return kernels.breed(population,scores,best,best_score,i1,i2,cross,a,b,hit,mi,mj,score,slots)
+
+def population_diversity(population:np.ndarray,best:np.ndarray,num_pairs:int,slots=None):
+    #keragaman_populasi_atas_tutor_per_murid->(fraksi_assignment_unik,
+    #rata2_fraksi_murid_yang_tutornya_beda_dari_best)
+    genes,ref=population[:,:num_pairs],best[:num_pairs]
+    if slots is not None:
+        genes,ref=slots[genes],slots[ref]
+    unique=len(np.unique(genes,axis=0))/len(genes)
+    return unique,float((genes!=ref).mean()) if num_pairs else 0.0
+
+def evolve(population:np.ndarray,scores:np.ndarray,best:np.ndarray,best_score:float,
+           score_matrix,generations:int,crossover_rate:float,mutation_rate:float,rng,slots=None,budget=None,
+           backend:str='numpy',debug:bool=False,cache=None,diversity=None):
+    """
+    Jalankan GA sebanyak `generations` generasi (None=sampai budget habis) dari populasi yang dikasih.
+    Dipakai run_ga dan island model (ga.island).
+    slots: id slot kapasitas (capacity_slots) kalau kromosom di-encode per slot
+    budget: ga.budget.Budget yang udah di-start; bisa berhenti lebih awal (waktu/plateau/callback),
+            dapat kromosom mentah tiap best baru dan di-tick per generasi
+    backend: 'numpy' atau 'numba' (udah di-resolve lewat ga.kernels.resolve_backend); hasil identik
+    Skor anak ga dihitung ulang penuh: anak PMX diturunkan dari skor parent2 + selisih di gen yang beda
+    dari parent2, anak tanpa crossover dari skor parent1, lalu mutasi nambah selisih 2 gen yang ditukar;
+    elite bawa skornya sendiri. debug=True: tiap generasi dicek lawan rescore penuh (population_fitness),
+    beda lebih dari 1e-9 -> RuntimeError
+    cache: ga.fitness.FitnessCache (opsional, cuma backend numpy); anak yang assignment-nya udah ada di cache
+           ambil skor dari sana tanpa diturunin, sisanya disimpan. Di backend numba kernel breed udah menilai
+           semua anak sebelum cache bisa dicek, jadi cache ga menghemat apa-apa dan diabaikan
+    diversity: list (opsional), tiap generasi ditambah (generasi, fraksi_unik, jarak_ke_best), lihat
+               population_diversity
+    Output: (population, scores, best, best_score) setelah generasi terakhir
+    """
+    pop_size,num_pairs=population.shape
+    n=score_matrix['score'].shape[0]
+    for gen in range(sys.maxsize if generations is None else generations):
+        if budget is not None and budget.exhausted():
+            break
+        num_children=pop_size-1
+        i1=tournament_selection_batch(scores,num_children,rng)
+        i2=tournament_selection_batch(scores,num_children,rng)
+        do_cross=rng.random(num_children)<crossover_rate
+        if backend=='numba':
+            population,scores=_breed_compiled(population,scores,best,best_score,i1,i2,do_cross,mutation_rate,rng,
+                                              score_matrix,slots)
+        else:
+            p1,p2=population[i1],population[i2]
+            children=p1.copy()
+            child_scores=scores[i1]
+            cross=np.flatnonzero(do_cross) if num_pairs>=2 else np.zeros(0,dtype=np.int64)
+            kids=None
+            if len(cross):
+                kids=pmx_crossover_batch(p1[cross],p2[cross],rng)
+                children[cross]=kids
+                child_scores[cross]=scores[i2[cross]]
+            hit,mi,mj=mutation_draws(*children.shape,mutation_rate,rng)
+            x,y=children[hit,mi],children[hit,mj]
+            children[hit,mi],children[hit,mj]=y,x
+            if cache is not None:
+                #anak_yang_udah_ada_di_cache_ga_perlu_diturunin
+                keys=cache.keys(children,n,slots)
+                known,miss=cache.lookup(keys)
+                if kids is not None:
+                    keep=miss[cross]
+                    cross,kids=cross[keep],kids[keep]
+                keep=miss[hit]
+                hit,mi,mj,x,y=hit[keep],mi[keep],mj[keep],x[keep],y[keep]
+            if kids is not None:
+                #provenance_anak_PMX:skor_parent2+selisih_di_gen_yang_beda(cuma_n_gen_pertama_yang_dihitung).
+                #populasi_yang_udah_konvergen_bedanya_tinggal_beberapa_persen_gen
+                kid,ref=kids[:,:n],p2[cross,:n]
+                diff=kid!=ref
+                r,c=np.divmod(np.flatnonzero(diff),n)
+                child_scores=delta_fitness(child_scores,cross[r],c,kid[diff],ref[diff],score_matrix,slots)
+            rows,cols=np.concatenate([hit,hit]),np.concatenate([mi,mj])
+            child_scores=delta_fitness(child_scores,rows,cols,np.concatenate([y,x]),np.concatenate([x,y]),
+                                       score_matrix,slots)
+            if cache is not None:
+                child_scores[~miss]=known[~miss]
+                cache.store([k for k,m in zip(keys,miss) if m],child_scores[miss])
+            #elitism:bawa_solusi_terbaik(+skornya)_ke_generasi_selanjutnya
+            population=np.vstack([best[None,:],children])
+            scores=np.concatenate([[best_score],child_scores])
+        if debug:
+            full=population_fitness(population,score_matrix,slots)
+            if not np.allclose(scores,full,rtol=0.0,atol=1e-9):
+                r=int(np.abs(scores-full).argmax())
+                raise RuntimeError(f"Skor delta kromosom {r} di generasi {gen} = {scores[r]!r}, "
+                                   f"rescore penuh = {full[r]!r}")
+        b=int(scores.argmax())
+        if scores[b]>best_score:
+            best,best_score=population[b].copy(),scores[b]
+            if budget is not None:
+                budget.improved(best_score,best.copy)
+        if diversity is not None:
+            diversity.append((gen+1,*population_diversity(population,best,n,slots)))
+        if budget is not None:
+            budget.tick()
+    return population,scores,best,best_score
+
+def capacity_genome(df_tutors,capacities,score_matrix):
+    #(slots,panjang_kromosom);tanpa_kapasitas_slots=None_dan_kromosom_permutasi_n_tutor_kayak_dulu
+    n,m=score_matrix['score'].shape
+    if capacities is None:
+        capacities=tutor_capacities(df_tutors)
+    capacities=normalize_capacities(capacities,m)
+    if capacities is None:
+        #gen=id_tutor_langsung(permutasi_0..n-1),jadi_tutor_harus_minimal_n
+        if m<n:
+            raise ValueError(f"GA tanpa kapasitas butuh jumlah tutor ({m}) minimal jumlah murid ({n}); "
+                             "isi capacities atau kolom 'kapasitas'")
+        return None,n
+    slots=capacity_slots(capacities)
+    if len(slots)<n:
+        raise ValueError(f"Total kapasitas tutor ({len(slots)}) kurang dari jumlah murid ({n})")
+    return slots,len(slots)
+
+def decode_chromosome(chrom:np.ndarray,slots,num_pairs:int)->List[int]:
+    #kromosom->tutor_index_per_murid
+    if slots is None:
+        return chrom.tolist()
+    return slots[chrom[:num_pairs]].tolist()
+
 def run_ga(df_students,df_tutors,
            weights:Dict[str,float],
            pop_size:int=50,
            generations:int=100,
            crossover_rate:float=0.8,
-           mutation_rate:float=0.1)->Dict[str,Any]:
+           mutation_rate:float=0.1,
+           score_matrix=None,
+           capacities=None,
+           time_limit:float=None,
+           patience:int=None,
+           tol:float=0.0,
+           callback=None,
+           seed=None,
+           backend:str='numpy',
+           debug:bool=False,
+           fitness_cache:int=None,
+           diversity:bool=False,
+           stats=None)->Dict[str,Any]:
     """
     Main_loop_algoritma_genetika
-    Output: best_chromosome dan best_fitness-nya
+    score_matrix: hasil build_score_matrix, kalau None dibangun sekali di sini;
+                  boleh juga build_lazy_score_matrix (fitness.py SA) kalau matriks dense ga muat memori.
+                  Kalau diisi, df_students/df_tutors/weights boleh None (kapasitas lewat capacities)
+    capacities: kapasitas tutor (int/list), None=baca kolom 'kapasitas' di df_tutors;
+                kalau ada, kromosom jadi permutasi slot kapasitas (tutor t punya capacities[t] slot)
+                dan n gen pertama dipakai, jadi PMX/swap otomatis patuh kapasitas
+                tanpa kapasitas kromosom=permutasi id tutor 0..n-1 (1:1), jadi butuh tutor>=murid;
+                kalau kurang langsung ValueError
+    generations: batas generasi (None=tanpa batas, perlu time_limit/patience)
+    time_limit: batas waktu (detik), patience: berhenti kalau best ga naik lebih dari tol selama sekian generasi
+    callback: dipanggil tiap best baru dengan info dict (lihat ga.budget.Budget), assignment-nya
+              udah berupa tutor per murid; return True=berhenti
+    seed: seed (int/SeedSequence) atau numpy Generator; semua angka acak GA diambil dari sini,
+          jadi seed sama=hasil sama (None=acak dari OS)
+    backend: 'numpy' (operator batch NumPy), 'numba' (PMX/mutasi/evaluasi dikompilasi di ga.kernels;
+             tanpa numba balik ke 'numpy'), atau 'auto'; untuk seed yang sama hasilnya identik
+    debug: skor anak (turunan dari parent + gen yang berubah) dicek tiap generasi lawan rescore penuh
+    fitness_cache: kapasitas ga.fitness.FitnessCache (LRU per assignment, mis. FITNESS_CACHE_SIZE);
+                   anak kembar ambil skor dari cache tanpa dihitung. None=tanpa cache.
+                   Cuma dipakai backend numpy; di numba kernel udah menilai semua anak, jadi diabaikan
+    diversity: catat keragaman populasi tiap generasi di stats['diversity'] (stats wajib diisi)
+    stats: dict opsional, diisi setelah selesai: 'generations', 'evaluations' (kromosom yang dihitung
+           fitness-nya, penuh atau delta; hit cache ga dihitung), 'improvements', 'trajectory'
+           (list (generasi,elapsed,best_score) tiap best baru), 'generation_times' (detik per generasi),
+           'elapsed', 'backend', plus 'cache' (cache_info()) kalau cache dipakai dan 'diversity'
+           (list (generasi,fraksi_assignment_unik,rata2_fraksi_murid_beda_dari_best)) kalau diversity=True;
+           None=ga dicatat
+    Output: best_chromosome (tutor per murid), best_fitness-nya, generasi yang jalan, stop_reason,
+            dan deterministic (True kalau seed diisi)
     """
-    num_pairs=len(df_students)
-    population=init_population(pop_size,num_pairs)
-    fitnesses=[compute_fitness(ch,df_students,df_tutors,weights) for ch in population]
-    best=max(zip(population,fitnesses),key=lambda p:p[1]['total_score'])
-
-    for gen in range(generations):
-        new_pop=[]
-        #elitism:bawa_solusi_terbaik_ke_generasi_selanjutnya
-        new_pop.append(best[0])
-        while len(new_pop)<pop_size:
-            parent1=tournament_selection(population,fitnesses)
-            parent2=tournament_selection(population,fitnesses)
-            if random.random()<crossover_rate:
-                child=pmx_crossover(parent1,parent2)
-            else:
-                child=parent1[:]
-            child=swap_mutation(child,mutation_rate)
-            new_pop.append(child)
-        population=new_pop
-        fitnesses=[compute_fitness(ch,df_students,df_tutors,weights) for ch in population]
-        current_best=max(zip(population,fitnesses),key=lambda p:p[1]['total_score'])
-        if current_best[1]['total_score']>best[1]['total_score']:
-            best=current_best
-
-    return {'best_chromosome':best[0],'best_fitness':best[1]}
+    if generations is None and time_limit is None and patience is None:
+        raise ValueError("Minimal salah satu dari generations, time_limit, atau patience harus diisi")
+    if diversity and stats is None:
+        raise ValueError("diversity=True butuh dict stats (hasilnya ditulis ke stats['diversity'])")
+    if score_matrix is None:
+        score_matrix=build_score_matrix(df_students,df_tutors,weights)
+    num_pairs=score_matrix['score'].shape[0]
+    if 'lazy' in score_matrix:
+        #kernel_numba_butuh_array_dense
+        if backend=='numba':
+            raise ValueError("backend 'numba' butuh matriks skor dense, bukan build_lazy_score_matrix")
+        backend='numpy'
+    backend=kernels.resolve_backend(backend)
+    slots,genome_len=capacity_genome(df_tutors,capacities,score_matrix)
+    rng=np.random.default_rng(seed)
+    population=init_chromosomes(pop_size,genome_len,rng)
+    scores=population_fitness(population,score_matrix,slots)
+    b=int(scores.argmax())
+    best,best_score=population[b].copy(),scores[b]
+    cache=None
+    if fitness_cache is not None and backend=='numpy':
+        cache=FitnessCache(fitness_cache)
+        cache.store(cache.keys(population,num_pairs,slots),scores)
+    div=None
+    if diversity:
+        div=[(0,*population_diversity(population,best,num_pairs,slots))]
+
+    #callback_user_dapat_assignment_tutor_per_murid,bukan_kromosom_slot
+    report=None
+    if callback is not None:
+        report=lambda info:callback({**info,'assignment':decode_chromosome(info['assignment'],slots,num_pairs)})
+    budget=Budget(generations,time_limit,patience,tol,report,check_every=1,
+                  trace=stats is not None,tick_times=stats is not None).start(best_score)
+    population,scores,best,best_score=evolve(population,scores,best,best_score,score_matrix,
+                                             generations,crossover_rate,mutation_rate,rng,slots,budget,backend,debug,
+                                             cache,div)
+    budget.exhausted()
+
+    best_chromosome=decode_chromosome(best,slots,num_pairs)
+    best_fitness=compute_fitness(best_chromosome,df_students,df_tutors,weights,score_matrix)
+    if stats is not None:
+        #populasi_awal+(pop_size-1)_anak_per_generasi(elite_bawa_skornya),dikurangi_hit_cache
+        evaluations=pop_size+(pop_size-1)*budget.iteration-(cache.hits if cache is not None else 0)
+        stats.update(generations=budget.iteration,evaluations=evaluations,
+                     improvements=len(budget.trajectory)-1,trajectory=budget.trajectory,
+                     generation_times=budget.tick_times,elapsed=budget.elapsed(),backend=backend)
+        if cache is not None:
+            stats['cache']=cache.cache_info()
+        if div is not None:
+            stats['diversity']=div
+    return {'best_chromosome':best_chromosome,'best_fitness':best_fitness,
+            'generations':budget.iteration,'stop_reason':budget.stop_reason,
+            'deterministic':seed is not None}
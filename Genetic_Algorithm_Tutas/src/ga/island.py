@@ -0,0 +1,159 @@
+"""
+Island model GA: beberapa sub-populasi berevolusi paralel di proses terpisah,
+tiap `migration_interval` generasi kromosom elite dikirim ke pulau tetangga.
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Any, List
+import numpy as np
+from ga import kernels
+from ga.budget import Budget
+from ga.chromosome import init_chromosomes
+from ga.fitness import build_score_matrix,compute_fitness,population_fitness
+from ga.ga import capacity_genome,decode_chromosome,evolve
+
+TOPOLOGIES=('ring','full')
+
+#diisi_sekali_per_worker_lewat_initializer(ga_perlu_kirim_matriks_tiap_epoch)
+_worker_matrix=None
+_worker_slots=None
+_worker_backend='numpy'
+
+def _init_worker(score_matrix,slots=None,backend='numpy'):
+    global _worker_matrix,_worker_slots,_worker_backend
+    _worker_matrix=score_matrix
+    _worker_slots=slots
+    _worker_backend=backend
+
+def _evolve_island(state:Dict[str,Any],generations:int,crossover_rate:float,mutation_rate:float,
+                   time_limit:float=None)->Dict[str,Any]:
+    #satu_epoch_untuk_satu_pulau,rng_ikut_dikirim_balik_biar_stream-nya_nyambung
+    #time_limit=sisa_waktu_global,epoch_boleh_berhenti_di_tengah
+    budget=None if time_limit is None else Budget(time_limit=time_limit,check_every=1).start(state['best_score'])
+    population,scores,best,best_score=evolve(state['population'],state['scores'],state['best'],state['best_score'],
+                                             _worker_matrix,generations,crossover_rate,mutation_rate,state['rng'],
+                                             _worker_slots,budget,_worker_backend)
+    done=generations if budget is None else budget.iteration
+    return {'population':population,'scores':scores,'best':best,'best_score':best_score,'rng':state['rng'],
+            'generations':done}
+
+def migration_targets(num_islands:int,topology:str)->List[List[int]]:
+    #targets[i]=daftar_pulau_yang_nerima_emigran_dari_pulau_i
+    if topology=='ring':
+        return [[(i+1)%num_islands] for i in range(num_islands)] if num_islands>1 else [[]]
+    if topology=='full':
+        return [[j for j in range(num_islands) if j!=i] for i in range(num_islands)]
+    raise ValueError(f"topology harus salah satu dari {TOPOLOGIES}, bukan {topology!r}")
+
+def migrate(states:List[Dict[str,Any]],migration_size:int,topology:str)->None:
+    """
+    Kirim `migration_size` kromosom terbaik tiap pulau ke pulau tujuan,
+    imigran menggantikan kromosom terburuk (elite pulau tujuan ga pernah diganti).
+    """
+    targets=migration_targets(len(states),topology)
+    #ambil_emigran_dulu_semua_biar_urutan_pulau_ga_ngaruh
+    emigrants=[]
+    for st in states:
+        top=np.argsort(-st['scores'],kind='stable')[:migration_size]
+        emigrants.append((st['population'][top].copy(),st['scores'][top].copy()))
+    incoming=[[] for _ in states]
+    for i,dest in enumerate(targets):
+        for j in dest:
+            incoming[j].append(emigrants[i])
+    for st,arrivals in zip(states,incoming):
+        if not arrivals:
+            continue
+        chroms=np.vstack([c for c,_ in arrivals])
+        sc=np.concatenate([s for _,s in arrivals])
+        #jumlah_slot_dibatasi_biar_elite(baris_terbaik)_tetap_aman
+        k=min(len(chroms),len(st['scores'])-1)
+        if k<=0:
+            continue
+        worst=np.argsort(st['scores'],kind='stable')[:k]
+        st['population'][worst]=chroms[:k]
+        st['scores'][worst]=sc[:k]
+        b=int(sc[:k].argmax())
+        if sc[b]>st['best_score']:
+            st['best'],st['best_score']=chroms[b].copy(),sc[b]
+
+def run_ga_islands(df_students,df_tutors,
+                   weights:Dict[str,float],
+                   islands:int=4,
+                   pop_size:int=50,
+                   generations:int=100,
+                   crossover_rate:float=0.8,
+                   mutation_rate:float=0.1,
+                   migration_interval:int=10,
+                   migration_size:int=2,
+                   topology:str='ring',
+                   workers:int=None,
+                   seed:int=None,
+                   score_matrix=None,
+                   capacities=None,
+                   time_limit:float=None,
+                   patience:int=None,
+                   tol:float=0.0,
+                   callback=None,
+                   backend:str='numpy')->Dict[str,Any]:
+    """
+    GA island model.
+    islands: jumlah sub-populasi, pop_size: ukuran populasi per pulau
+    migration_interval: tiap berapa generasi migrasi, migration_size: jumlah elite yang dikirim
+    topology: 'ring' (ke pulau berikutnya) atau 'full' (ke semua pulau lain)
+    workers: jumlah proses (default min(islands, cpu)), seed: seed induk untuk SeedSequence
+    capacities: kapasitas tutor, sama seperti run_ga (encoding slot kapasitas)
+    time_limit/patience/tol/callback: sama seperti run_ga; time_limit dicek juga di dalam epoch,
+                                      patience dan callback dicek per epoch (antar migrasi)
+    backend: 'numpy'/'numba'/'auto', sama seperti run_ga (dipakai semua pulau)
+    Output: best_chromosome, best_fitness, skor terbaik tiap pulau ('island_scores'), generations, stop_reason
+    """
+    if generations is None and time_limit is None and patience is None:
+        raise ValueError("Minimal salah satu dari generations, time_limit, atau patience harus diisi")
+    if topology not in TOPOLOGIES:
+        raise ValueError(f"topology harus salah satu dari {TOPOLOGIES}, bukan {topology!r}")
+    if migration_interval<1:
+        raise ValueError("migration_interval minimal 1")
+    backend=kernels.resolve_backend(backend)
+    if score_matrix is None:
+        score_matrix=build_score_matrix(df_students,df_tutors,weights)
+    num_pairs=score_matrix['score'].shape[0]
+    slots,genome_len=capacity_genome(df_tutors,capacities,score_matrix)
+    if workers is None:
+        workers=min(islands,os.cpu_count() or 1)
+
+    #tiap_pulau_punya_stream_rng_sendiri
+    states=[]
+    for child in np.random.SeedSequence(seed).spawn(islands):
+        rng=np.random.default_rng(child)
+        population=init_chromosomes(pop_size,genome_len,rng)
+        scores=population_fitness(population,score_matrix,slots)
+        b=int(scores.argmax())
+        states.append({'population':population,'scores':scores,
+                       'best':population[b].copy(),'best_score':scores[b],'rng':rng})
+
+    report=None
+    if callback is not None:
+        report=lambda info:callback({**info,'assignment':decode_chromosome(info['assignment'],slots,num_pairs)})
+    best_score=max(st['best_score'] for st in states)
+    budget=Budget(generations,time_limit,patience,tol,report,check_every=1).start(best_score)
+    with ProcessPoolExecutor(max_workers=workers,initializer=_init_worker,
+                             initargs=(score_matrix,slots,backend)) as pool:
+        while not budget.exhausted():
+            epoch=migration_interval if generations is None else min(migration_interval,generations-budget.iteration)
+            remaining=None if time_limit is None else max(0.0,budget.remaining())
+            states=list(pool.map(_evolve_island,states,[epoch]*islands,
+                                 [crossover_rate]*islands,[mutation_rate]*islands,[remaining]*islands))
+            budget.tick(max(st['generations'] for st in states))
+            k=int(np.argmax([st['best_score'] for st in states]))
+            if states[k]['best_score']>best_score:
+                best_score=states[k]['best_score']
+                budget.improved(best_score,states[k]['best'].copy)
+            if not budget.exhausted():
+                migrate(states,migration_size,topology)
+
+    island_scores=[float(st['best_score']) for st in states]
+    best=states[int(np.argmax(island_scores))]['best']
+    best_chromosome=decode_chromosome(best,slots,num_pairs)
+    best_fitness=compute_fitness(best_chromosome,df_students,df_tutors,weights,score_matrix)
+    return {'best_chromosome':best_chromosome,'best_fitness':best_fitness,'island_scores':island_scores,
+            'generations':budget.iteration,'stop_reason':budget.stop_reason}
@@ -0,0 +1,98 @@
+"""
+Backend kompilasi (numba) untuk loop crossover/mutasi/evaluasi GA per generasi.
+Angka acaknya diambil di ga.ga dengan urutan yang sama dengan backend numpy,
+kernel cuma ngerjain PMX+swap+jumlah_skor di array integer, jadi hasilnya identik.
+numba opsional: tanpa numba backend 'numba' balik ke 'numpy' dengan warning.
+"""
+import warnings
+import numpy as np
+
+try:
+    from numba import njit
+    HAVE_NUMBA=True
+except ImportError:
+    HAVE_NUMBA=False
+
+    def njit(*args,**kwargs):
+        #pengganti_decorator_numba:fungsi_dipakai_apa_adanya
+        if len(args)==1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda fn:fn
+
+BACKENDS=('numpy','numba','auto')
+
+def resolve_backend(backend:str)->str:
+    #'auto'->'numba'_kalau_terpasang;'numba'_tanpa_numba->'numpy'+warning
+    if backend not in BACKENDS:
+        raise ValueError(f"backend harus salah satu dari {BACKENDS}, bukan {backend!r}")
+    if backend=='auto':
+        return 'numba' if HAVE_NUMBA else 'numpy'
+    if backend=='numba' and not HAVE_NUMBA:
+        warnings.warn("numba tidak terpasang, backend GA pakai 'numpy'",RuntimeWarning,stacklevel=3)
+        return 'numpy'
+    return backend
+
+@njit(cache=True)
+def gene_score(score,slots,k,g):
+    #skor_murid_k_kalau_gennya_g(slots_kosong=gen_langsung_tutor_id)
+    if len(slots):
+        g=slots[g]
+    return score[k,g]
+
+@njit(cache=True)
+def breed(population,scores,best,best_score,i1,i2,cross,a,b,hit,mi,mj,score,slots):
+    """
+    Satu generasi anak: baris 0=elite(best), baris 1+c=anak ke-c dari parent population[i1[c]]
+    dan population[i2[c]]. Anak cross[k] di-PMX dengan segmen [a[k],b[k]], lalu anak hit[k]
+    ditukar gen mi[k]<->mj[k]. Sama persis dengan pmx_crossover_batch+mutasi di evolve.
+    Skornya diturunkan dari skor parent (anak PMX dari parent2 + selisih di gen yang beda, tanpa
+    crossover dari parent1), lalu ditambah selisih 2 gen mutasi, dengan urutan penjumlahan
+    yang sama dengan fitness.delta_fitness.
+    Output: (populasi baru, skornya)
+    """
+    num=len(i1)
+    size=population.shape[1]
+    n=score.shape[0]
+    out=np.empty((num+1,size),dtype=population.dtype)
+    out_scores=np.empty(num+1)
+    out[0]=best
+    out_scores[0]=best_score
+    for c in range(num):
+        out[c+1]=population[i1[c]]
+        out_scores[c+1]=scores[i1[c]]
+    inv=np.empty(size,dtype=np.int64)
+    for k in range(len(cross)):
+        c=cross[k]
+        p1=population[i1[c]]
+        p2=population[i2[c]]
+        lo,hi=a[k],b[k]
+        for g in range(size):
+            inv[p1[g]]=g
+        for g in range(size):
+            if lo<=g<=hi:
+                continue
+            #ikutin_mapping_selama_gen_parent2_udah_ada_di_segmen_parent1
+            gene=p2[g]
+            p=inv[gene]
+            while lo<=p<=hi:
+                gene=p2[p]
+                p=inv[gene]
+            out[c+1,g]=gene
+        acc=0.0
+        for g in range(n):
+            if out[c+1,g]!=p2[g]:
+                acc+=gene_score(score,slots,g,out[c+1,g])-gene_score(score,slots,g,p2[g])
+        out_scores[c+1]=scores[i2[c]]+acc
+    for k in range(len(hit)):
+        r=hit[k]+1
+        i,j=mi[k],mj[k]
+        x,y=out[r,i],out[r,j]
+        out[r,i]=y
+        out[r,j]=x
+        d=0.0
+        if i<n:
+            d+=gene_score(score,slots,i,y)-gene_score(score,slots,i,x)
+        if j<n:
+            d+=gene_score(score,slots,j,x)-gene_score(score,slots,j,y)
+        out_scores[r]+=d
+    return out,out_scores
@@ -0,0 +1,65 @@
+"""
+CLI benchmark, pengganti tiga main.py terpisah kalau mau bandingin engine:
+
+    python -m benchmark --engines sa ga lap --scenarios S1 S2_10 --repeats 5 --out hasil.csv
+    python -m benchmark --param sa.steps=5000 --param ga.generations=200
+    python -m benchmark --engines sa csp --stats --profile cprofile --profile-dir profiles
+"""
+import argparse
+import ast
+import sys
+
+from benchmark.engines import ENGINES
+from benchmark.profiling import PROFILERS
+from benchmark.runner import run_benchmark, write_results
+from benchmark.scenarios import DEFAULT_DATA_DIR, scenario_order
+
+def parse_params(items):
+    """'engine.param=nilai' -> {engine: {param: nilai}}; nilai di-parse sebagai literal Python kalau bisa."""
+    params = {}
+    for item in items or []:
+        key, sep, raw = item.partition('=')
+        name, dot, param = key.partition('.')
+        if not sep or not dot:
+            raise ValueError(f"Format --param harus engine.param=nilai, bukan {item!r}")
+        try:
+            value = ast.literal_eval(raw)
+        except (ValueError, SyntaxError):
+            value = raw
+        params.setdefault(name, {})[param] = value
+    return params
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m benchmark', description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--engines', nargs='+', default=list(ENGINES),
+                        help=f"engine yang dijalankan (pilihan: {', '.join(ENGINES)})")
+    parser.add_argument('--scenarios', nargs='+', default=scenario_order,
+                        help='key skenario, alias pendek (S1, S2_5, S2_10, S2_25, S3) atau path CSV (default: semua skenario bawaan)')
+    parser.add_argument('--data-dir', default=DEFAULT_DATA_DIR)
+    parser.add_argument('--repeats', type=int, default=5)
+    parser.add_argument('--warmup', type=int, default=1)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--param', action='append', metavar='ENGINE.PARAM=VALUE',
+                        help='override parameter engine, boleh diulang')
+    parser.add_argument('--no-memory', action='store_true', help='skip run tracemalloc untuk peak memory')
+    parser.add_argument('--no-cache', action='store_true', help='parse CSV langsung tanpa cache kode kolom')
+    parser.add_argument('--stats', action='store_true',
+                        help='run tambahan dengan counter solver (node, prune, evaluasi, acceptance, lintasan best)')
+    parser.add_argument('--profile', choices=PROFILERS, help='run tambahan di bawah profiler')
+    parser.add_argument('--profile-dir', default='profiles', help='folder output profil (default profiles)')
+    parser.add_argument('--out', help='file hasil .csv atau .json')
+    args = parser.parse_args(argv)
+
+    records = run_benchmark(args.engines, args.scenarios,
+                            repeats=args.repeats, warmup=args.warmup, seed=args.seed,
+                            data_dir=args.data_dir, params=parse_params(args.param),
+                            measure_memory=not args.no_memory, cache=not args.no_cache,
+                            collect_stats=args.stats, profile=args.profile, profile_dir=args.profile_dir)
+    if args.out:
+        write_results(records, args.out)
+        print(f"Hasil ditulis ke {args.out}")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,118 @@
+"""
+Loader skenario kolumnar: tiap kolom CSV di-encode jadi kode integer kecil dengan
+vocab bersama murid+tutor, lalu disimpan sebagai .npy per kolom di cache yang
+di-key hash isi file. Load berikutnya cukup np.load (memory-mapped), tanpa parse CSV.
+
+DataFrame hasilnya pakai pandas Categorical (kode integer + vocab), jadi drop-in
+untuk load_preferences dan build_score_matrix langsung membandingkan kode.
+"""
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import numpy as np
+import pandas as pd
+
+CACHE_VERSION = 1
+CACHE_DIRNAME = '.scenario_cache'
+
+def file_hash(path: str, chunk_size: int = 1 << 20) -> str:
+    """SHA-256 isi file, dibaca per chunk."""
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(chunk_size), b''):
+            h.update(block)
+    return h.hexdigest()
+
+def _code_dtype(size: int):
+    # Kode -1 = kosong, jadi butuh tipe bertanda
+    for dt in (np.int8, np.int16, np.int32):
+        if size < np.iinfo(dt).max:
+            return dt
+    return np.int64
+
+def _to_json(value):
+    return value.item() if isinstance(value, np.generic) else value
+
+def encode_csv(path: str, out_dir: str) -> None:
+    """Parse CSV sekali lalu tulis kode tiap kolom (.npy) + vocab (meta.json) ke out_dir."""
+    df = pd.read_csv(path, index_col=0)
+    df['Status'] = df['Status'].str.lower()
+    # Kolom index (Nama) ga dipakai solver dan vocab-nya sebesar jumlah baris, jadi ga di-cache
+    df = df.reset_index(drop=True)
+
+    meta = {'version': CACHE_VERSION, 'columns': [], 'vocab': {}, 'bool': []}
+    for col in df.columns:
+        codes, uniques = pd.factorize(df[col])
+        uniques = [_to_json(u) for u in uniques]
+        np.save(os.path.join(out_dir, f"{col}.npy"), codes.astype(_code_dtype(len(uniques))))
+        meta['columns'].append(col)
+        meta['vocab'][col] = uniques
+        # Kolom boolean murni (mis. fleksibel_waktu) dikembalikan sebagai bool, bukan kategori
+        if uniques and all(isinstance(u, bool) for u in uniques) and (codes >= 0).all():
+            meta['bool'].append(col)
+    with open(os.path.join(out_dir, 'meta.json'), 'w', encoding='utf-8') as f:
+        json.dump(meta, f, ensure_ascii=False)
+
+def cache_path(path: str, cache_dir: str = None) -> str:
+    """Folder cache untuk isi file ini (default: .scenario_cache di sebelah CSV)."""
+    if cache_dir is None:
+        cache_dir = os.path.join(os.path.dirname(os.path.abspath(path)), CACHE_DIRNAME)
+    return os.path.join(cache_dir, f"v{CACHE_VERSION}-{file_hash(path)}")
+
+def load_encoded(path: str, cache_dir: str = None, mmap: bool = True):
+    """
+    Load kode kolom dari cache (encode dulu kalau belum ada).
+
+    Returns:
+        (arrays, meta): arrays = {kolom: ndarray kode}, memory-mapped kalau mmap=True;
+                        meta['vocab'][kolom][kode] = nilai aslinya
+    """
+    target = cache_path(path, cache_dir)
+    if not os.path.isfile(os.path.join(target, 'meta.json')):
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        # Tulis ke folder sementara lalu rename, biar proses lain ga baca cache setengah jadi
+        tmp = tempfile.mkdtemp(dir=os.path.dirname(target))
+        try:
+            encode_csv(path, tmp)
+            os.replace(tmp, target)
+        except OSError:
+            # Proses lain udah lebih dulu nulis cache yang sama
+            shutil.rmtree(tmp, ignore_errors=True)
+            if not os.path.isfile(os.path.join(target, 'meta.json')):
+                raise
+        except BaseException:
+            shutil.rmtree(tmp, ignore_errors=True)
+            raise
+
+    with open(os.path.join(target, 'meta.json'), encoding='utf-8') as f:
+        meta = json.load(f)
+    mode = 'r' if mmap else None
+    arrays = {col: np.load(os.path.join(target, f"{col}.npy"), mmap_mode=mode) for col in meta['columns']}
+    return arrays, meta
+
+def _frame(arrays, meta, rows):
+    data = {}
+    for col in meta['columns']:
+        if col == 'Status':
+            continue
+        codes = np.asarray(arrays[col][rows])
+        vocab = meta['vocab'][col]
+        if col in meta['bool']:
+            data[col] = np.asarray(vocab, dtype=bool)[codes]
+        else:
+            data[col] = pd.Categorical.from_codes(codes, categories=pd.Index(vocab, dtype=object))
+    return pd.DataFrame(data)
+
+def load_preferences_encoded(path: str, cache_dir: str = None, mmap: bool = True):
+    """
+    Pengganti load_preferences: (df_students, df_tutors) dengan index 0..n-1,
+    tiap kolom atribut berupa Categorical yang vocab-nya sama untuk murid dan tutor.
+    """
+    arrays, meta = load_encoded(path, cache_dir, mmap)
+    status = np.asarray(arrays['Status'])
+    vocab = meta['vocab']['Status']
+    murid = np.flatnonzero(status == vocab.index('murid')) if 'murid' in vocab else np.zeros(0, dtype=np.int64)
+    tutor = np.flatnonzero(status == vocab.index('tutor')) if 'tutor' in vocab else np.zeros(0, dtype=np.int64)
+    return _frame(arrays, meta, murid), _frame(arrays, meta, tutor)
@@ -0,0 +1,159 @@
+"""
+Registry engine benchmark. Tiap engine dibungkus adapter dengan signature seragam:
+
+    adapter(df_students, df_tutors, weights, score_matrix, seed, **params)
+        -> {'best_assignment': List[int], 'best_fitness': {'total_score', 'pct_satisfied'}}
+
+dan punya 'model' matching-nya: 'one_to_one' (tiap tutor max 1 murid) atau
+'reuse' (tutor boleh dipakai banyak murid). Model dipakai buat milih optimum
+referensi waktu hitung optimality gap. Engine 'instrumented' menerima param
+`stats` (dict yang diisi counter solver, lihat run_sa/run_ga/backtracking_csp).
+Engine sa, csp dan csp_1to1 menerima param `candidates=k` (move/domain dibatasi
+ke top-k tutor per murid dari build_candidates) atau `compatible=(kolom, ...)`
+(tutor yang sama di semua kolom itu, dari TutorIndex); dua-duanya untuk instance besar.
+"""
+import os
+import sys
+
+from benchmark.scenarios import REPO_ROOT
+
+# Folder engine masih gaya script (import flat), jadi source dir-nya dimasukin ke sys.path.
+# fitness.py ada salinannya di beberapa folder; semuanya API-nya sama, yang kepake
+# salinan SA (paling depan) karena superset.
+ENGINE_DIRS = [
+    os.path.join(REPO_ROOT, 'simulated_annealing', 'src'),
+    os.path.join(REPO_ROOT, 'Genetic_Algorithm_Tutas', 'src'),
+    os.path.join(REPO_ROOT, 'linear_assignment', 'src'),
+    os.path.join(REPO_ROOT, 'Backtracking_CSP'),
+]
+for _d in reversed(ENGINE_DIRS):
+    if _d not in sys.path:
+        sys.path.insert(0, _d)
+
+from back_CSP import backtracking_csp                  # noqa: E402
+from batch import run_sa_batch                         # noqa: E402
+from fitness import build_candidates, build_score_matrix, compute_fitness, tutor_capacities  # noqa: E402
+from ga.ga import run_ga                               # noqa: E402
+from ga.island import run_ga_islands                   # noqa: E402
+from lap import run_lap                                # noqa: E402
+from multistart import run_sa_multistart               # noqa: E402
+from sa import candidate_arrays, run_sa                # noqa: E402
+from tutor_index import TutorIndex                     # noqa: E402
+from tempering import run_pt                           # noqa: E402
+
+ENGINES = {}
+
+def register_engine(name: str, model: str, instrumented: bool = False, **defaults):
+    """
+    Decorator: daftarkan adapter engine dengan model matching dan parameter default.
+    instrumented=True kalau adapter meneruskan param `stats` ke solver-nya.
+    """
+    if model not in ('one_to_one', 'reuse'):
+        raise ValueError(f"model harus 'one_to_one' atau 'reuse', bukan {model!r}")
+
+    def wrap(fn):
+        ENGINES[name] = {'fn': fn, 'model': model, 'defaults': defaults, 'instrumented': instrumented}
+        return fn
+    return wrap
+
+def _restrict(df_students, df_tutors, weights, capacities, candidates, compatible):
+    """Kandidat tutor per murid dari param `candidates`/`compatible` (None kalau ga diisi)."""
+    if candidates is not None and compatible is not None:
+        raise ValueError("Pilih salah satu: candidates atau compatible")
+    if candidates is not None:
+        return build_candidates(df_students, df_tutors, weights, candidates, capacities)
+    if compatible is not None:
+        index = TutorIndex(df_tutors, capacities=capacities)
+        return index.neighbours(df_students, all_of=tuple(compatible))
+    return None
+
+def _csp(df_students, df_tutors, weights, score_matrix, capacity, bound,
+         candidates=None, compatible=None, **params):
+    n, m = score_matrix['score'].shape
+    variables = list(range(n))
+    # Kolom kapasitas skenario menang atas default engine
+    caps = tutor_capacities(df_tutors)
+    cand = _restrict(df_students, df_tutors, weights, caps, candidates, compatible)
+    if cand is None:
+        domains = {i: list(range(m)) for i in variables}
+    else:
+        indptr, indices, group = candidate_arrays(cand, n)
+        lists = [indices[a:b].tolist() for a, b in zip(indptr[:-1], indptr[1:])]
+        domains = {i: lists[g] for i, g in enumerate(group.tolist())}
+    if caps is not None:
+        capacities, bound = dict(enumerate(caps)), 'assignment'
+    else:
+        capacities = None if capacity is None else {j: capacity for j in range(m)}
+    assignment, _ = backtracking_csp(variables, domains, [], score_matrix=score_matrix,
+                                     capacities=capacities, bound=bound, **params)
+    best = [assignment.get(i) for i in variables]
+    if None in best:
+        return {'best_assignment': best, 'best_fitness': None}
+    return {'best_assignment': best,
+            'best_fitness': compute_fitness(best, df_students, df_tutors, weights, score_matrix)}
+
+@register_engine('csp', model='reuse', instrumented=True)
+def csp_engine(df_students, df_tutors, weights, score_matrix, seed, **params):
+    return _csp(df_students, df_tutors, weights, score_matrix, capacity=None, bound='max', **params)
+
+@register_engine('csp_1to1', model='one_to_one', instrumented=True)
+def csp_1to1_engine(df_students, df_tutors, weights, score_matrix, seed, **params):
+    return _csp(df_students, df_tutors, weights, score_matrix, capacity=1, bound='assignment', **params)
+
+@register_engine('ga', model='one_to_one', instrumented=True, pop_size=50, generations=100,
+                 crossover_rate=0.8, mutation_rate=0.1)
+def ga_engine(df_students, df_tutors, weights, score_matrix, seed, **params):
+    res = run_ga(df_students, df_tutors, weights, seed=seed, score_matrix=score_matrix, **params)
+    return {'best_assignment': res['best_chromosome'], 'best_fitness': res['best_fitness']}
+
+@register_engine('ga_islands', model='one_to_one', islands=4, pop_size=50, generations=100,
+                 migration_interval=10, migration_size=2, topology='ring')
+def ga_islands_engine(df_students, df_tutors, weights, score_matrix, seed, **params):
+    res = run_ga_islands(df_students, df_tutors, weights, seed=seed, score_matrix=score_matrix, **params)
+    return {'best_assignment': res['best_chromosome'], 'best_fitness': res['best_fitness']}
+
+@register_engine('sa', model='reuse', instrumented=True, T0=1.0, cooling=0.995, steps=1000)
+def sa_engine(df_students, df_tutors, weights, score_matrix, seed,
+              candidates=None, compatible=None, **params):
+    params['candidates'] = _restrict(df_students, df_tutors, weights,
+                                     params.get('capacities', tutor_capacities(df_tutors)),
+                                     candidates, compatible)
+    return run_sa(df_students, df_tutors, weights, seed=seed, score_matrix=score_matrix, **params)
+
+@register_engine('sa_multistart', model='reuse', chains=4, T0=1.0, cooling=0.995, steps=1000)
+def sa_multistart_engine(df_students, df_tutors, weights, score_matrix, seed, **params):
+    return run_sa_multistart(df_students, df_tutors, weights, seed=seed, score_matrix=score_matrix, **params)
+
+@register_engine('sa_batch', model='reuse', instrumented=True, chains=64, T0=1.0, cooling=0.995,
+                 steps=1000)
+def sa_batch_engine(df_students, df_tutors, weights, score_matrix, seed, **params):
+    return run_sa_batch(df_students, df_tutors, weights, seed=seed, score_matrix=score_matrix, **params)
+
+@register_engine('sa_pt', model='reuse', T_min=0.01, T_max=1.0, replicas=8, steps=1000)
+def sa_pt_engine(df_students, df_tutors, weights, score_matrix, seed, **params):
+    return run_pt(df_students, df_tutors, weights, seed=seed, score_matrix=score_matrix, **params)
+
+@register_engine('lap', model='one_to_one')
+def lap_engine(df_students, df_tutors, weights, score_matrix, seed, **params):
+    return run_lap(df_students, df_tutors, weights, score_matrix=score_matrix, **params)
+
+def reference_optimum(score_matrix, model: str, capacities=None):
+    """
+    Optimum eksak untuk model matching: 'reuse' = jumlah skor maksimum per murid,
+    'one_to_one' = linear assignment. None kalau 1:1 ga feasible (murid > tutor).
+    Kalau skenario punya kapasitas tutor, semua engine patuh kapasitas itu, jadi
+    optimumnya linear assignment dengan slot kapasitas (None kalau kapasitas kurang).
+    """
+    score = score_matrix['score']
+    n, m = score.shape
+    if capacities is not None:
+        if sum(capacities) < n:
+            return None
+        res = run_lap(None, None, None, capacities=capacities, score_matrix=score_matrix)
+        return res['best_fitness']['total_score']
+    if model == 'reuse':
+        return float(score.max(axis=1).sum()) if m else None
+    if n > m:
+        return None
+    res = run_lap(None, None, None, capacities=1, score_matrix=score_matrix)
+    return res['best_fitness']['total_score']
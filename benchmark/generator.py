@@ -0,0 +1,195 @@
+"""
+Generator skenario sintetis skala besar (10^3–10^6 baris) dengan skema CSV yang sama
+seperti dataset buatan tangan:
+
+    Nama,Status,mata_kuliah,subbab,waktu,gaya_belajar,mode,fleksibel_waktu[,kapasitas]
+
+Baris ditulis per chunk jadi memory tetap kecil berapa pun jumlah barisnya.
+Jalankan dari root repo:
+
+    python -m benchmark.generator --students 100000 --tutors 20000 --skew 1.2 --conflict 0.3 --out big.csv
+"""
+import argparse
+import numpy as np
+import pandas as pd
+
+COLUMNS = ['Nama', 'Status', 'mata_kuliah', 'subbab', 'waktu', 'gaya_belajar', 'mode', 'fleksibel_waktu']
+CAPACITY_COLUMN = 'kapasitas'
+
+# Kosakata diambil dari dataset yang ada; subbab selalu milik mata_kuliah-nya
+CATALOG = {
+    'Kalkulus': ['Limit', 'Turunan', 'Integral', 'Turunan dan Aplikasinya', 'Integral Tentu dan Tak Tentu'],
+    'Struktur Data': ['Binary Tree', 'Hash Table', 'Graph'],
+    'Jaringan Komputer': ['Subnetting', 'OSI Layer', 'Routing', 'Routing dan Switching'],
+    'Teori Graf': ['MST', 'DFS vs BFS', 'Pewarnaan Graf', 'Graf Dasar', 'Pencarian Graf'],
+}
+GAYA_BELAJAR = ['Visual & konsep', 'Langsung latihan soal', 'Diskusi dua arah']
+MODE = ['Online – Video Call', 'Offline (sekitar ITS)', 'Chat Diskusi (WA/Telegram)']
+
+def time_slots(days: int = 10, start_hour: int = 8, end_hour: int = 21):
+    """Slot 30 menit mulai 6/16/2025, format sama seperti kolom waktu di dataset."""
+    return [f"6/{16 + d}/2025 {h}:{mm:02d}"
+            for d in range(days) for h in range(start_hour, end_hour + 1) for mm in (0, 30)]
+
+def popularity(k: int, skew: float) -> np.ndarray:
+    """Distribusi Zipf terpotong: p_r ∝ 1/(r+1)^skew; skew=0 berarti uniform."""
+    p = 1.0 / np.arange(1, k + 1) ** skew
+    return p / p.sum()
+
+class _Vocab:
+    """Kategori tiap atribut + probabilitasnya (urutan populer diacak sekali per seed)."""
+
+    def __init__(self, rng, skew: float, days: int):
+        self.courses = np.array(list(CATALOG), dtype=object)
+        self.slots = np.array(time_slots(days), dtype=object)
+        self.gaya = np.array(GAYA_BELAJAR, dtype=object)
+        self.mode = np.array(MODE, dtype=object)
+        # Kategori paling populer dipilih acak, bukan selalu yang pertama di daftar
+        for name in ('courses', 'slots', 'gaya', 'mode'):
+            setattr(self, name, rng.permutation(getattr(self, name)))
+        # Subbab disusun setelah urutan mata_kuliah diacak supaya tetap sejajar
+        self.subbab = [rng.permutation(np.array(CATALOG[c], dtype=object)) for c in self.courses]
+        self.p_course = popularity(len(self.courses), skew)
+        self.p_subbab = [popularity(len(s), skew) for s in self.subbab]
+        self.p_slot = popularity(len(self.slots), skew)
+        self.p_gaya = popularity(len(self.gaya), skew)
+        self.p_mode = popularity(len(self.mode), skew)
+
+    def sample(self, rng, size: int) -> dict:
+        """Profil preferensi acak (kolom atribut saja) untuk `size` orang."""
+        course = rng.choice(len(self.courses), size=size, p=self.p_course)
+        subbab = np.empty(size, dtype=object)
+        for c in range(len(self.courses)):
+            idx = np.flatnonzero(course == c)
+            subbab[idx] = rng.choice(self.subbab[c], size=len(idx), p=self.p_subbab[c])
+        return {
+            'mata_kuliah': self.courses[course],
+            'subbab': subbab,
+            'waktu': rng.choice(self.slots, size=size, p=self.p_slot),
+            'gaya_belajar': rng.choice(self.gaya, size=size, p=self.p_gaya),
+            'mode': rng.choice(self.mode, size=size, p=self.p_mode),
+        }
+
+def generate_scenario(path: str,
+                      n_students: int,
+                      n_tutors: int,
+                      seed=None,
+                      skew: float = 0.0,
+                      conflict: float = 0.0,
+                      hot_tutors: int = None,
+                      flex_rate: float = 0.5,
+                      days: int = 10,
+                      capacity=None,
+                      chunk_size: int = 100_000) -> str:
+    """
+    Tulis skenario sintetis ke CSV secara streaming (per chunk).
+
+    Args:
+        path      : file CSV tujuan
+        n_students: jumlah murid
+        n_tutors  : jumlah tutor
+        seed      : seed untuk numpy Generator; seed sama = file identik
+        skew      : eksponen Zipf popularitas kategori (0 = uniform, >1 = sangat timpang)
+        conflict  : proporsi murid (0..1) yang menyalin persis profil salah satu
+                    "tutor rebutan", seperti skenario 3 tapi bisa diatur kadarnya
+        hot_tutors: jumlah tutor rebutan (default max(1, n_tutors // 100))
+        flex_rate : peluang fleksibel_waktu True
+        days      : rentang hari slot waktu (makin kecil makin sering bentrok waktu)
+        capacity  : None (tanpa kolom kapasitas), int, atau (min, max) inklusif untuk
+                    kapasitas acak per tutor; baris murid dikosongkan
+        chunk_size: jumlah baris per tulis
+
+    Returns:
+        path
+    """
+    if n_students < 0 or n_tutors < 0:
+        raise ValueError("Jumlah murid/tutor ga boleh negatif")
+    if not 0.0 <= conflict <= 1.0:
+        raise ValueError("conflict harus di antara 0 dan 1")
+    if conflict > 0 and n_tutors == 0:
+        raise ValueError("conflict > 0 butuh minimal 1 tutor")
+    if capacity is not None:
+        lo, hi = (capacity, capacity) if np.isscalar(capacity) else capacity
+        if not 0 <= lo <= hi:
+            raise ValueError("capacity harus int >= 0 atau (min, max) dengan 0 <= min <= max")
+    columns = COLUMNS + ([CAPACITY_COLUMN] if capacity is not None else [])
+    rng = np.random.default_rng(seed)
+    vocab = _Vocab(rng, skew, days)
+    if hot_tutors is None:
+        hot_tutors = max(1, n_tutors // 100)
+    hot_tutors = min(hot_tutors, n_tutors)
+    # Profil rebutan dipegang tutor ke-0..hot_tutors-1 (urutan kemunculan tutor di file)
+    hot = pd.DataFrame(vocab.sample(rng, hot_tutors))
+
+    left_s, left_t = n_students, n_tutors
+    next_s = next_t = 0
+    first = True
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        while first or left_s + left_t > 0:
+            size = min(chunk_size, left_s + left_t)
+            # Jumlah tutor di chunk ini ditarik hipergeometrik supaya total tepat
+            # dan murid/tutor tercampur rata di sepanjang file
+            k_t = int(rng.hypergeometric(left_t, left_s, size)) if size else 0
+            is_tutor = np.zeros(size, dtype=bool)
+            is_tutor[:k_t] = True
+            rng.shuffle(is_tutor)
+
+            chunk = pd.DataFrame(vocab.sample(rng, size))
+            t_rows = np.flatnonzero(is_tutor)
+            s_rows = np.flatnonzero(~is_tutor)
+            t_ids = np.arange(next_t, next_t + k_t)
+            s_ids = np.arange(next_s, next_s + size - k_t)
+
+            hot_rows = t_rows[t_ids < hot_tutors]
+            if len(hot_rows):
+                chunk.iloc[hot_rows] = hot.iloc[t_ids[t_ids < hot_tutors]].to_numpy()
+            if conflict > 0 and len(s_rows):
+                copy = s_rows[rng.random(len(s_rows)) < conflict]
+                chunk.iloc[copy] = hot.iloc[rng.integers(0, hot_tutors, len(copy))].to_numpy()
+
+            names = np.empty(size, dtype=object)
+            names[t_rows] = [f"Tutor{i}" for i in t_ids]
+            names[s_rows] = [f"Murid{i}" for i in s_ids]
+            chunk.insert(0, 'Nama', names)
+            chunk.insert(1, 'Status', np.where(is_tutor, 'tutor', 'murid'))
+            chunk['fleksibel_waktu'] = rng.random(size) < flex_rate
+            if capacity is not None:
+                caps = pd.array(rng.integers(lo, hi + 1, size), dtype='Int64')
+                caps[s_rows] = pd.NA
+                chunk[CAPACITY_COLUMN] = caps
+            chunk[columns].to_csv(f, header=first, index=False)
+
+            first = False
+            left_t -= k_t
+            left_s -= size - k_t
+            next_t += k_t
+            next_s += size - k_t
+    return path
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m benchmark.generator', description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--students', type=int, required=True)
+    parser.add_argument('--tutors', type=int, required=True)
+    parser.add_argument('--seed', type=int, default=None)
+    parser.add_argument('--skew', type=float, default=0.0, help='eksponen Zipf popularitas (0 = uniform)')
+    parser.add_argument('--conflict', type=float, default=0.0, help='proporsi murid yang rebutan tutor yang sama')
+    parser.add_argument('--hot-tutors', type=int, default=None)
+    parser.add_argument('--flex-rate', type=float, default=0.5)
+    parser.add_argument('--days', type=int, default=10)
+    parser.add_argument('--capacity', default=None,
+                        help="kapasitas tutor: angka (mis. 5) atau rentang acak (mis. 3-8)")
+    parser.add_argument('--chunk-size', type=int, default=100_000)
+    parser.add_argument('--out', required=True)
+    args = parser.parse_args(argv)
+    capacity = None
+    if args.capacity is not None:
+        lo, _, hi = args.capacity.partition('-')
+        capacity = (int(lo), int(hi or lo))
+    generate_scenario(args.out, args.students, args.tutors, seed=args.seed, skew=args.skew,
+                      conflict=args.conflict, hot_tutors=args.hot_tutors, flex_rate=args.flex_rate,
+                      days=args.days, capacity=capacity, chunk_size=args.chunk_size)
+    print(f"Skenario ditulis ke {args.out}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,55 @@
+"""
+Hook profiler untuk runner benchmark: satu run tambahan per engine × skenario
+dibungkus cProfile (bawaan) atau pyinstrument (opsional, pip install pyinstrument).
+Hasilnya file di folder profil, jadi kelihatan waktu habis di evaluasi atau di search.
+"""
+import cProfile
+import io
+import os
+import pstats
+
+PROFILERS = ('cprofile', 'pyinstrument')
+
+def check_profiler(kind: str):
+    """Validasi nama profiler; pyinstrument harus terpasang kalau dipilih."""
+    if kind not in PROFILERS:
+        raise ValueError(f"profiler harus salah satu dari {PROFILERS}, bukan {kind!r}")
+    if kind == 'pyinstrument':
+        try:
+            import pyinstrument  # noqa: F401
+        except ImportError:
+            raise ValueError("profiler 'pyinstrument' butuh paket pyinstrument (pip install pyinstrument)") from None
+
+def profile_call(kind: str, path_base: str, fn, *args, **kwargs):
+    """
+    Jalankan fn(*args, **kwargs) di bawah profiler lalu tulis hasilnya:
+      - cprofile    : path_base.prof (buka dengan pstats/snakeviz) + path_base.txt (top kumulatif)
+      - pyinstrument: path_base.html + path_base.txt (call tree)
+
+    Returns:
+        (hasil fn, path file utama)
+    """
+    check_profiler(kind)
+    os.makedirs(os.path.dirname(path_base) or '.', exist_ok=True)
+    if kind == 'cprofile':
+        prof = cProfile.Profile()
+        result = prof.runcall(fn, *args, **kwargs)
+        prof.dump_stats(path_base + '.prof')
+        out = io.StringIO()
+        pstats.Stats(prof, stream=out).sort_stats('cumulative').print_stats(30)
+        with open(path_base + '.txt', 'w', encoding='utf-8') as f:
+            f.write(out.getvalue())
+        return result, path_base + '.prof'
+
+    from pyinstrument import Profiler
+    prof = Profiler()
+    prof.start()
+    try:
+        result = fn(*args, **kwargs)
+    finally:
+        prof.stop()
+    with open(path_base + '.html', 'w', encoding='utf-8') as f:
+        f.write(prof.output_html())
+    with open(path_base + '.txt', 'w', encoding='utf-8') as f:
+        f.write(prof.output_text())
+    return result, path_base + '.html'
@@ -0,0 +1,219 @@
+"""
+Runner benchmark: jalankan engine terdaftar di skenario mana pun dengan warmup,
+repeat, dan seed yang terkontrol, lalu ringkas jadi statistik yang bisa dibandingkan.
+"""
+import json
+import os
+import re
+import time
+import tracemalloc
+import numpy as np
+import pandas as pd
+
+from benchmark.encoding import load_preferences_encoded
+from benchmark.engines import ENGINES, build_score_matrix, reference_optimum, tutor_capacities
+from benchmark.profiling import check_profiler, profile_call
+from benchmark.scenarios import DEFAULT_DATA_DIR, load_preferences, resolve_scenario, title_map
+
+DEFAULT_WEIGHTS = {'mata_kuliah': 0.3, 'subbab': 0.2, 'gaya_belajar': 0.2, 'mode': 0.1, 'waktu': 0.2}
+
+def run_seeds(seed, count: int):
+    """Seed int independen per run dari SeedSequence (None = acak dari OS)."""
+    return [int(c.generate_state(1)[0]) for c in np.random.SeedSequence(seed).spawn(count)]
+
+def _call(engine, df_students, df_tutors, weights, score_matrix, seed, params):
+    start = time.perf_counter()
+    res = engine['fn'](df_students, df_tutors, weights, score_matrix, seed, **params)
+    return res, time.perf_counter() - start
+
+def benchmark_engine(name: str, df_students, df_tutors, weights, score_matrix,
+                     repeats: int = 5, warmup: int = 1, seed=0, params=None,
+                     measure_memory: bool = True, optimum=None,
+                     collect_stats: bool = False, profile: str = None, profile_path: str = None):
+    """
+    Benchmark satu engine di satu skenario (matriks skor udah dibangun).
+
+    Timing diambil dari run biasa; peak memory diukur di run tambahan pakai
+    tracemalloc (overhead-nya ga ikut timing). Memory proses worker
+    (multistart/island) ga kehitung. Run tambahan itu pakai seed repeat pertama,
+    jadi sekalian jadi cek determinisme.
+
+    collect_stats: engine 'instrumented' dijalankan sekali lagi dengan param `stats`
+                   (counter solver + lintasan best) dan hasilnya masuk ke 'stats'
+    profile      : 'cprofile' / 'pyinstrument' -> satu run lagi di bawah profiler,
+                   file-nya ditulis ke profile_path (tanpa ekstensi), path-nya di 'profile'
+
+    Returns:
+        dict ringkasan: waktu median/p95/min, skor median/best, gap, peak memory, dll.
+    """
+    engine = ENGINES[name]
+    params = {**engine['defaults'], **(params or {})}
+    seeds = run_seeds(seed, warmup + repeats)
+
+    for s in seeds[:warmup]:
+        _call(engine, df_students, df_tutors, weights, score_matrix, s, params)
+
+    times, scores, pcts, assignments = [], [], [], []
+    for s in seeds[warmup:]:
+        res, elapsed = _call(engine, df_students, df_tutors, weights, score_matrix, s, params)
+        times.append(elapsed)
+        assignments.append(res['best_assignment'])
+        fit = res['best_fitness']
+        scores.append(np.nan if fit is None else fit['total_score'])
+        pcts.append(np.nan if fit is None else fit['pct_satisfied'])
+
+    mem_peak = None
+    deterministic = None
+    if measure_memory and repeats:
+        tracemalloc.start()
+        try:
+            res, _ = _call(engine, df_students, df_tutors, weights, score_matrix, seeds[warmup], params)
+            mem_peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+        deterministic = res['best_assignment'] == assignments[0]
+
+    # Run diagnostik terpisah supaya overhead counter/profiler ga ikut timing
+    solver_stats = None
+    if collect_stats and engine['instrumented'] and repeats:
+        solver_stats = {}
+        _call(engine, df_students, df_tutors, weights, score_matrix, seeds[warmup],
+              {**params, 'stats': solver_stats})
+    profile_file = None
+    if profile and repeats:
+        _, profile_file = profile_call(profile, profile_path or name, _call, engine, df_students,
+                                       df_tutors, weights, score_matrix, seeds[warmup], params)
+
+    times = np.array(times)
+    scores = np.array(scores, dtype=float)
+    if optimum is None:
+        optimum = reference_optimum(score_matrix, engine['model'], tutor_capacities(df_tutors))
+    gaps = (optimum - scores) / abs(optimum) if optimum else np.full_like(scores, np.nan)
+    gaps[np.abs(gaps) < 1e-9] = 0.0   # noise floating point, bukan selisih beneran
+
+    def stat(fn, arr):
+        return float(fn(arr)) if len(arr) and not np.isnan(arr).all() else None
+
+    return {
+        'engine': name,
+        'model': engine['model'],
+        'repeats': repeats,
+        'warmup': warmup,
+        'seed': seed,
+        'time_median_s': stat(np.median, times),
+        'time_p95_s': stat(lambda a: np.percentile(a, 95), times),
+        'time_min_s': stat(np.min, times),
+        'score_median': stat(np.nanmedian, scores),
+        'score_best': stat(np.nanmax, scores),
+        'pct_satisfied_median': stat(np.nanmedian, np.array(pcts, dtype=float)),
+        'optimum': optimum,
+        'gap_median': stat(np.nanmedian, gaps),
+        'gap_best': stat(np.nanmin, gaps),
+        'mem_peak_mb': None if mem_peak is None else mem_peak / 2**20,
+        'deterministic': deterministic,
+        'params': params,
+        'times_s': times.tolist(),
+        'stats': solver_stats,
+        'profile': profile_file,
+    }
+
+def _stats_summary(stats) -> str:
+    """Counter skalar dari stats solver dalam satu baris (list kayak trajectory dilewati, cache cuma hit rate)."""
+    parts = []
+    for key, value in stats.items():
+        if isinstance(value, float):
+            parts.append(f"{key}={value:.4g}")
+        elif isinstance(value, (int, str)):
+            parts.append(f"{key}={value}")
+        elif isinstance(value, dict) and 'hit_rate' in value:
+            parts.append(f"{key}_hit_rate={value['hit_rate']:.4g}")
+    return ' '.join(parts)
+
+def run_benchmark(engines=None, scenarios=None, weights=None,
+                  repeats: int = 5, warmup: int = 1, seed=0,
+                  data_dir: str = DEFAULT_DATA_DIR, params=None,
+                  measure_memory: bool = True, verbose: bool = True, cache: bool = True,
+                  collect_stats: bool = False, profile: str = None, profile_dir: str = 'profiles'):
+    """
+    Jalankan semua kombinasi engine × skenario.
+
+    Args:
+        engines  : list nama engine (default semua yang terdaftar)
+        scenarios: list key skenario atau path CSV (default scenario_order)
+        params   : dict {nama_engine: {param: nilai}} untuk override default engine
+        cache    : load skenario lewat loader terenkode (cache .npy per hash file)
+        collect_stats: kumpulkan counter solver (engine instrumented) di run tambahan
+        profile  : 'cprofile' / 'pyinstrument' untuk satu run tambahan per engine × skenario,
+                   file ditulis ke profile_dir/<skenario>__<engine>.*
+
+    Returns:
+        list record (satu per skenario × engine)
+    """
+    from benchmark.scenarios import scenario_order
+    engines = list(engines or ENGINES)
+    scenarios = list(scenarios or scenario_order)
+    weights = weights or DEFAULT_WEIGHTS
+    params = params or {}
+    unknown = [e for e in engines if e not in ENGINES]
+    if unknown:
+        raise ValueError(f"Engine ga terdaftar: {unknown}; pilihan: {sorted(ENGINES)}")
+    if profile:
+        check_profiler(profile)
+
+    records = []
+    for scen in scenarios:
+        key, path = resolve_scenario(scen, data_dir)
+        if cache:
+            df_students, df_tutors = load_preferences_encoded(path)
+        else:
+            df_students, df_tutors = load_preferences(path)
+        # Matriks skor dibangun sekali per skenario dan dipakai semua engine
+        score_matrix = build_score_matrix(df_students, df_tutors, weights)
+        capacities = tutor_capacities(df_tutors)
+        optimum = {}
+        for name in engines:
+            model = ENGINES[name]['model']
+            if capacities is not None and sum(capacities) < len(df_students):
+                if verbose:
+                    print(f"[{key}] {name}: dilewati, total kapasitas tutor < jumlah murid")
+                continue
+            if capacities is None and model == 'one_to_one' and len(df_students) > len(df_tutors):
+                if verbose:
+                    print(f"[{key}] {name}: dilewati, murid > tutor ga feasible untuk matching 1:1")
+                continue
+            if model not in optimum:
+                optimum[model] = reference_optimum(score_matrix, model, capacities)
+            rec = benchmark_engine(name, df_students, df_tutors, weights, score_matrix,
+                                   repeats=repeats, warmup=warmup, seed=seed,
+                                   params=params.get(name), measure_memory=measure_memory,
+                                   optimum=optimum[model], collect_stats=collect_stats,
+                                   profile=profile,
+                                   profile_path=os.path.join(profile_dir, re.sub(r'\W+', '_', f"{key}__{name}")))
+            rec = {'scenario': key, 'title': title_map.get(key, key),
+                   'n_students': len(df_students), 'n_tutors': len(df_tutors),
+                   'capacitated': capacities is not None, **rec}
+            records.append(rec)
+            if verbose:
+                print(f"[{key}] {name}: score={rec['score_median']} "
+                      f"gap={rec['gap_median']} median={rec['time_median_s']:.4f}s "
+                      f"p95={rec['time_p95_s']:.4f}s")
+                if rec['stats']:
+                    print(f"[{key}] {name}: {_stats_summary(rec['stats'])}")
+                if rec['profile']:
+                    print(f"[{key}] {name}: profil di {rec['profile']}")
+    return records
+
+def write_results(records, path: str):
+    """Tulis hasil ke .csv (kolom list/dict di-JSON-kan) atau .json sesuai ekstensi."""
+    ext = os.path.splitext(path)[1].lower()
+    if ext == '.json':
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(records, f, indent=2, ensure_ascii=False)
+    elif ext == '.csv':
+        df = pd.DataFrame(records)
+        for col in ('params', 'times_s', 'stats'):
+            if col in df:
+                df[col] = df[col].map(json.dumps)
+        df.to_csv(path, index=False)
+    else:
+        raise ValueError(f"Format output harus .csv atau .json, bukan {ext!r}")
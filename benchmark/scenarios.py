@@ -0,0 +1,59 @@
+"""
+Registry skenario benchmark: urutan, judul, dan cara load CSV jadi DataFrame murid/tutor.
+Dipakai bareng oleh semua engine supaya ga ada lagi scenario_order/title_map per runner.
+"""
+import os
+import pandas as pd
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Dataset yang sama disalin di tiap folder engine; harness pakai salinan SA
+DEFAULT_DATA_DIR = os.path.join(REPO_ROOT, 'simulated_annealing', 'data')
+
+scenario_order = [
+    'scenario1_fixed',
+    'scenario 2_5_fixed',
+    'scenario 2_10_fixed',
+    'scenario 2_25_fixed',
+    'scenario3_conflict_heavy_fleksibel'
+]
+
+title_map = {
+    'scenario1_fixed': 'Skenario 1 – Dataset Lengkap (10 pasang murid dan tutor)',
+    'scenario 2_5_fixed': 'Skenario 2 – Perbandingan Metode Matching (5 pasang murid & tutor)',
+    'scenario 2_10_fixed': 'Skenario 2 – Perbandingan Metode Matching (10 pasang murid & tutor)',
+    'scenario 2_25_fixed': 'Skenario 2 – Perbandingan Metode Matching (25 pasang murid & tutor)',
+    'scenario3_conflict_heavy_fleksibel': 'Skenario 3 – Konflik Preferensi Tinggi (Satu Tutor Diperebutkan Banyak Murid)'
+}
+
+# Nama pendek seperti di README (S1, S2 (10), ...) -> key skenario
+aliases = {
+    'S1': 'scenario1_fixed',
+    'S2_5': 'scenario 2_5_fixed',
+    'S2_10': 'scenario 2_10_fixed',
+    'S2_25': 'scenario 2_25_fixed',
+    'S3': 'scenario3_conflict_heavy_fleksibel'
+}
+
+def load_preferences(path: str):
+    """Baca CSV skenario lalu pisahkan murid dan tutor (index 0..n-1)."""
+    df = pd.read_csv(path, index_col=0)
+    df['Status'] = df['Status'].str.lower()
+    df_students = df[df['Status'] == 'murid'].drop(columns=['Status']).reset_index(drop=True)
+    df_tutors = df[df['Status'] == 'tutor'].drop(columns=['Status']).reset_index(drop=True)
+    return df_students, df_tutors
+
+def resolve_scenario(name: str, data_dir: str = DEFAULT_DATA_DIR):
+    """
+    Terima key skenario terdaftar (mis. 'scenario1_fixed'), alias pendeknya
+    (mis. 'S2_10', lihat aliases), atau path CSV langsung.
+
+    Returns:
+        (key, path)
+    """
+    if os.path.isfile(name):
+        return os.path.splitext(os.path.basename(name))[0], name
+    name = aliases.get(name, name)
+    path = os.path.join(data_dir, f"{name}.csv")
+    if not os.path.isfile(path):
+        raise FileNotFoundError(f"Skenario {name!r} ga ketemu di {data_dir}")
+    return name, path
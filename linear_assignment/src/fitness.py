@@ -0,0 +1,167 @@
+"""
+Modul fitness untuk solver assignment eksak di sistem matching Tutas.
+"""
+import numpy as np
+import pandas as pd
+
+# Urutan penting: score_pair menjumlah skor berbobot dengan urutan ini
+CRITERIA = ('mata_kuliah', 'subbab', 'gaya_belajar', 'mode', 'waktu')
+# Kolom CSV murid yang fleksibel waktunya (waktu selalu dianggap cocok)
+FLEKS_COLUMN = 'fleksibel_waktu'
+
+def time_score(student_time: str, tutor_time: str, fleksibel: bool) -> float:
+    """
+    Skor waktu:
+    - Kalau waktu cocok ATAU murid fleksibel → 1.0
+    - Selain itu → 0.0
+    """
+    return 1.0 if student_time == tutor_time or fleksibel else 0.0
+
+def score_pair(s, t, weights):
+    """
+    Hitung skor total dan jumlah constraint yang terpenuhi buat 1 pasangan murid-tutor.
+    s,t: Series pandas dengan kolom:
+        'mata_kuliah','subbab','gaya_belajar','mode','waktu','fleksibel_waktu'
+    weights: dict bobot untuk tiap constraint.
+    Return:
+      - total skor (float)
+      - jumlah constraint terpenuhi (int)
+    """
+    subj_match   = 1 if s['mata_kuliah'] == t['mata_kuliah'] else 0
+    topic_match  = 1 if s['subbab']        == t['subbab']        else 0
+    style_match  = 1 if s['gaya_belajar']  == t['gaya_belajar']  else 0
+    mode_match   = 1 if s['mode']          == t['mode']          else 0
+    fleks        = bool(s.get(FLEKS_COLUMN, False))
+    time_match   = 1 if (s['waktu'] == t['waktu'] or fleks) else 0
+
+    total = (
+        weights['mata_kuliah']   * subj_match  +
+        weights['subbab']        * topic_match +
+        weights['gaya_belajar']  * style_match +
+        weights['mode']          * mode_match  +
+        weights['waktu']         * time_match
+    )
+
+    satisfied_count = subj_match + topic_match + style_match + mode_match + time_match
+    return total, satisfied_count
+
+def _match_matrix(s_col, t_col):
+    """
+    Perbandingan kategori secara vektor -> matriks bool (n_murid, n_tutor).
+    Nilai kosong (NaN) ga pernah dianggap cocok, sama kayak di score_pair.
+    """
+    if isinstance(s_col.dtype, pd.CategoricalDtype) and s_col.dtype == t_col.dtype:
+        # Kategori dengan vocab bersama (loader terenkode): langsung bandingkan kode integer
+        s_codes = s_col.cat.codes.to_numpy()[:, None]
+        t_codes = t_col.cat.codes.to_numpy()[None, :]
+    else:
+        codes, _ = pd.factorize(pd.concat([s_col, t_col], ignore_index=True))
+        s_codes = codes[:len(s_col), None]
+        t_codes = codes[len(s_col):][None, :]
+    return (s_codes == t_codes) & (s_codes >= 0)
+
+def build_score_matrix(df_students, df_tutors, weights):
+    """
+    Hitung score_pair untuk semua pasangan murid-tutor sekaligus (sekali di awal).
+    df_students, df_tutors: DataFrame dengan kolom score_pair, index 0..n-1
+    weights: dict bobot per constraint
+
+    Returns dict:
+      - score           : ndarray float (n_murid, n_tutor), total skor score_pair
+      - satisfied       : ndarray int (n_murid, n_tutor), jumlah constraint terpenuhi
+      - num_constraints : len(weights)
+    """
+    n, m = len(df_students), len(df_tutors)
+    if FLEKS_COLUMN in df_students:
+        fleks = df_students[FLEKS_COLUMN].map(bool).to_numpy(dtype=bool)
+    else:
+        fleks = np.zeros(n, dtype=bool)
+
+    score     = np.zeros((n, m))
+    satisfied = np.zeros((n, m), dtype=np.int64)
+    for key in CRITERIA:
+        match = _match_matrix(df_students[key], df_tutors[key])
+        if key == 'waktu':
+            match |= fleks[:, None]
+        score     += weights[key] * match
+        satisfied += match
+
+    return {
+        'score': score,
+        'satisfied': satisfied,
+        'num_constraints': len(weights)
+    }
+
+CAPACITY_COLUMN = 'kapasitas'
+
+def normalize_capacities(capacities, m: int):
+    """
+    Samakan format kapasitas tutor: None (tanpa batas) tetap None,
+    int berlaku untuk semua tutor, selain itu list panjang m.
+    """
+    if capacities is None:
+        return None
+    if isinstance(capacities, (int, np.integer)):
+        caps = [int(capacities)] * m
+    else:
+        caps = [int(c) for c in capacities]
+    if len(caps) != m:
+        raise ValueError(f"Kapasitas harus ada untuk {m} tutor, bukan {len(caps)}")
+    if any(c < 0 for c in caps):
+        raise ValueError("Kapasitas tutor ga boleh negatif")
+    return caps
+
+def tutor_capacities(df_tutors, default: int = 1):
+    """
+    Kapasitas tiap tutor (jumlah murid maksimum) dari kolom 'kapasitas'.
+    Kalau kolomnya ga ada -> None (tutor boleh dipakai berapa pun, perilaku lama);
+    sel kosong diisi `default`.
+    """
+    if df_tutors is None or CAPACITY_COLUMN not in df_tutors:
+        return None
+    caps = pd.to_numeric(df_tutors[CAPACITY_COLUMN].astype(object)).fillna(default)
+    return normalize_capacities(caps.astype(np.int64).tolist(), len(df_tutors))
+
+def compute_fitness(chromosome, df_students, df_tutors, weights, score_matrix=None):
+    """
+    chromosome: list tutor_index per student_index
+    df_students, df_tutors: DataFrame dengan index 0..n-1
+    weights: dict bobot per constraint (jumlah kunci 5)
+    score_matrix: opsional, hasil build_score_matrix (tanpa lookup .loc)
+
+    Returns dict:
+      - total_score   : float (jumlah skor semua pasangan)
+      - pct_satisfied : float (rata-rata persentase constraint terpenuhi)
+    """
+    if score_matrix is not None:
+        return _fitness_from_matrix(chromosome, score_matrix)
+
+    total_score = 0.0
+    total_pct   = 0.0
+    num_constraints = len(weights)    # misal 5
+    n = len(chromosome)
+
+    for stu_id, tut_id in enumerate(chromosome):
+        s = df_students.loc[stu_id]
+        t = df_tutors.loc[tut_id]
+        sc, count_sat = score_pair(s, t, weights)
+        total_score += sc
+        total_pct   += (count_sat / num_constraints)
+
+    avg_pct_satisfied = (total_pct / n) if n > 0 else 0.0
+    return {
+        'total_score': total_score,
+        'pct_satisfied': avg_pct_satisfied
+    }
+
+def _fitness_from_matrix(chromosome, score_matrix):
+    n = len(chromosome)
+    if n == 0:
+        return {'total_score': 0.0, 'pct_satisfied': 0.0}
+    rows = np.arange(n)
+    total_score = float(score_matrix['score'][rows, chromosome].sum())
+    total_sat   = int(score_matrix['satisfied'][rows, chromosome].sum())
+    return {
+        'total_score': total_score,
+        'pct_satisfied': total_sat / score_matrix['num_constraints'] / n
+    }
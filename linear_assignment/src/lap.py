@@ -0,0 +1,160 @@
+# lap.py
+
+import time
+import numpy as np
+from fitness import build_score_matrix, compute_fitness, tutor_capacities
+
+def expand_capacities(capacities, m: int) -> np.ndarray:
+    """
+    Ubah kapasitas tutor jadi daftar slot: tutor t muncul capacities[t] kali.
+
+    Args:
+        capacities: None (semua 1), int (sama untuk semua tutor), atau array panjang m
+        m         : jumlah tutor
+
+    Returns:
+        ndarray int, slot_tutor[k] = tutor index untuk kolom ke-k
+    """
+    if capacities is None:
+        capacities = 1
+    caps = np.broadcast_to(np.asarray(capacities, dtype=np.int64), (m,))
+    if (caps < 0).any():
+        raise ValueError("Kapasitas tutor ga boleh negatif")
+    return np.repeat(np.arange(m), caps)
+
+def solve_assignment(cost: np.ndarray, warm=None, duals: bool = False):
+    """
+    Linear assignment problem (minimasi) dengan shortest augmenting path
+    (Hungarian/Jonker-Volgenant, O(n^2 m)). Loop dalam per kolom divektorkan numpy.
+
+    Args:
+        cost : ndarray (n, m) dengan n <= m
+        warm : opsional (u, v, cols) dari solve sebelumnya: dual baris (n,), dual kolom (m,),
+               dan matching parsial (kolom tiap baris, -1 = belum). Biasanya dual hasil solve
+               masalah yang lebih besar (baris/kolom dibuang, cost cuma naik). Baris yang dualnya
+               udah ga valid dilepas lagi, jadi cuma sebagian kecil baris yang di-augment ulang
+        duals: True -> return (kolom, u, v) supaya bisa jadi warm solve berikutnya
+
+    Returns:
+        ndarray int panjang n, kolom yang dipilih untuk tiap baris (plus u, v kalau duals=True)
+    """
+    n, m = cost.shape
+    if n > m:
+        raise ValueError(f"Baris ({n}) lebih banyak dari kolom ({m}), assignment ga feasible")
+    if n == 0:
+        empty = np.zeros(0, dtype=np.int64)
+        return (empty, np.zeros(0), np.zeros(m)) if duals else empty
+
+    # Indeks 1-based: kolom 0 jadi kolom dummy untuk baris yang lagi di-augment
+    u = np.zeros(n + 1)
+    v = np.zeros(m + 1)
+    p = np.zeros(m + 1, dtype=np.int64)     # p[j] = baris yang pegang kolom j (0 = kosong)
+    way = np.zeros(m + 1, dtype=np.int64)
+    pending = range(1, n + 1)
+    if warm is not None:
+        u0, v0, cols0 = warm
+        u[1:] = u0
+        cols0 = np.array(cols0, dtype=np.int64)
+        # Kolom bebas harus punya dual 0, baris ke-match harus tight dan feasible di semua kolom.
+        # Baris yang ngelanggar dilepas (kolomnya ikut bebas) sampai stabil
+        while True:
+            v[1:] = 0.0
+            rows = np.flatnonzero(cols0 >= 0)
+            v[cols0[rows] + 1] = np.minimum(np.asarray(v0)[cols0[rows]], 0.0)
+            slack = cost[rows] - u[rows + 1, None] - v[None, 1:]
+            tol = 1e-9 * (1.0 + np.abs(cost[rows]).max(initial=0.0))
+            bad = (slack.min(axis=1, initial=np.inf) < -tol) | (np.abs(slack[np.arange(len(rows)), cols0[rows]]) > tol)
+            if not bad.any():
+                break
+            cols0[rows[bad]] = -1
+        p[cols0[rows] + 1] = rows + 1
+        pending = (np.flatnonzero(cols0 < 0) + 1).tolist()
+
+    for i in pending:
+        p[0] = i
+        j0 = 0
+        minv = np.full(m + 1, np.inf)
+        used = np.zeros(m + 1, dtype=bool)
+        while True:
+            used[j0] = True
+            i0 = p[j0]
+            free = ~used
+            free[0] = False
+            cur = cost[i0 - 1] - u[i0] - v[1:]
+            better = free[1:] & (cur < minv[1:])
+            minv[1:][better] = cur[better]
+            way[1:][better] = j0
+            masked = np.where(free, minv, np.inf)
+            j1 = int(masked.argmin())
+            delta = masked[j1]
+            u[p[used]] += delta
+            v[used] -= delta
+            minv[free] -= delta
+            j0 = j1
+            if p[j0] == 0:
+                break
+        # Augment sepanjang jalur way
+        while j0:
+            j1 = way[j0]
+            p[j0] = p[j1]
+            j0 = j1
+
+    cols = np.empty(n, dtype=np.int64)
+    matched = np.flatnonzero(p[1:]) + 1
+    cols[p[matched] - 1] = matched - 1
+    if duals:
+        return cols, u[1:], v[1:]
+    return cols
+
+def run_lap(df_students, df_tutors, weights,
+            capacities=None,
+            score_matrix=None):
+    """
+    Solver eksak untuk matching murid→tutor: maksimalkan total skor dengan
+    tiap tutor dapat paling banyak `capacities` murid.
+
+    Args:
+        df_students : pd.DataFrame, index 0..n-1
+        df_tutors   : pd.DataFrame, index 0..m-1
+        weights     : dict, bobot per constraint
+        capacities  : int atau array kapasitas per tutor; slot tutor direplikasi
+                      sesuai kapasitas. None = baca kolom 'kapasitas' di df_tutors,
+                      kalau ga ada jadi 1:1
+        score_matrix: hasil build_score_matrix; kalau None dibangun sekali di sini.
+                      Kalau diisi, df_students/df_tutors/weights boleh None
+
+    Returns:
+        {
+          'best_assignment': List[int],  # tutor index per student index
+          'best_fitness'   : {'total_score':…, 'pct_satisfied':…},
+          'exec_time'      : float,      # detik
+          'deterministic'  : True
+        }
+    """
+    if score_matrix is None:
+        score_matrix = build_score_matrix(df_students, df_tutors, weights)
+    m = score_matrix['score'].shape[1]
+    if capacities is None:
+        capacities = tutor_capacities(df_tutors)
+
+    start = time.perf_counter()
+    slots = expand_capacities(capacities, m)
+    # Maksimasi skor = minimasi skor negatif
+    cols = solve_assignment(-score_matrix['score'][:, slots])
+    best = slots[cols].tolist()
+    exec_time = time.perf_counter() - start
+
+    return {
+        'best_assignment': best,
+        'best_fitness'   : compute_fitness(best, df_students, df_tutors, weights, score_matrix),
+        'exec_time'      : exec_time,
+        'deterministic'  : True
+    }
+
+def optimality_gap(total_score: float, optimum: float) -> float:
+    """
+    Selisih relatif skor heuristik (SA/GA) terhadap optimum eksak, 0.0 = optimal.
+    """
+    if optimum == 0:
+        return 0.0
+    return (optimum - total_score) / abs(optimum)
@@ -0,0 +1,15 @@
+"""
+Runner solver assignment eksak (LAP) untuk semua skenario, sekarang pembungkus tipis harness benchmark
+(registry skenario, loader, timing median/p95, cek determinisme ada di sana):
+
+    python main.py [opsi python -m benchmark lain, mis. --repeats 3 --scenarios scenario1_fixed]
+"""
+import os
+import sys
+
+# Jalan dari root repo biar package benchmark kebaca (bukan folder ini)
+sys.path[0] = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from benchmark.__main__ import main
+
+if __name__ == '__main__':
+    sys.exit(main(['--engines', 'lap', *sys.argv[1:]]))
@@ -0,0 +1,417 @@
+# online.py
+
+import math
+import numpy as np
+from fitness import CRITERIA, FLEKS_COLUMN, tutor_capacities
+from lap import expand_capacities, solve_assignment
+
+# Toleransi perbandingan jarak; mencegah siklus nol (tie) dianggap perbaikan
+_EPS = 1e-9
+_WAKTU = CRITERIA.index('waktu')
+
+class OnlineMatcher:
+    """
+    Matching murid→tutor inkremental: assignment dan matriks skor disimpan di memory,
+    murid/tutor yang datang atau pergi cuma meng-update baris/kolomnya sendiri lalu
+    diperbaiki lokal, tanpa solve ulang dari nol.
+
+    Objektif sama dengan run_lap (maksimalkan total skor, beban tutor <= kapasitas)
+    dan assignment selalu dijaga optimal:
+      - murid baru    : satu shortest augmenting path (murid lain boleh digeser
+                        berantai ke tutor yang masih ada slot)
+      - slot bebas    : murid keluar / tutor baru membuka slot; satu rantai geser
+                        terbaik (siklus negatif) ke slot itu dicari lalu diterapkan
+      - tutor keluar  : murid-muridnya dimasukkan ulang satu per satu
+    Shortest path pakai Bellman-Ford di atas tutor, tiap pass divektorkan numpy O(n·m).
+
+    Kapasitas None = tutor tanpa batas (model reuse, tiap murid cukup ambil skor tertinggi).
+    Tiap operasi mengembalikan daftar perubahan (student_id, tutor_lama, tutor_baru).
+    """
+
+    def __init__(self, weights, default_capacity=None, initial_size: int = 16):
+        self.weights = dict(weights)
+        self.num_constraints = len(weights)
+        self._w = np.array([weights[key] for key in CRITERIA], dtype=float)
+        self.default_capacity = default_capacity
+        self._vocab = [{} for _ in CRITERIA]
+
+        k = len(CRITERIA)
+        self.n = 0
+        self.m = 0
+        self._s_codes = np.full((initial_size, k), -1, dtype=np.int64)
+        self._s_flex  = np.zeros(initial_size, dtype=bool)
+        self._assign  = np.full(initial_size, -1, dtype=np.int64)
+        self._t_codes = np.full((initial_size, k), -1, dtype=np.int64)
+        self._caps    = np.zeros(initial_size)
+        self._loads   = np.zeros(initial_size, dtype=np.int64)
+        self._score   = np.zeros((initial_size, initial_size))
+        self._sat     = np.zeros((initial_size, initial_size), dtype=np.int64)
+
+        self._student_ids = []
+        self._student_index = {}
+        self._tutor_ids = []
+        self._tutor_index = {}
+
+    @classmethod
+    def from_frames(cls, df_students, df_tutors, weights, capacities=None, default_capacity=None):
+        """
+        Bangun matcher dari DataFrame skenario (index dipakai sebagai id).
+        capacities None = kolom 'kapasitas' di df_tutors; kalau ga ada pakai default_capacity.
+        """
+        matcher = cls(weights, default_capacity,
+                      initial_size=max(16, len(df_students), len(df_tutors)))
+        if capacities is None:
+            capacities = tutor_capacities(df_tutors)
+        for j, (tid, row) in enumerate(df_tutors.iterrows()):
+            cap = None if capacities is None else capacities[j]
+            matcher.add_tutor(row, capacity=cap, tutor_id=tid)
+        for sid, row in df_students.iterrows():
+            matcher._insert_student(row, sid)
+        # Kondisi awal di-solve sekali penuh, bukan augment satu per satu
+        matcher._solve()
+        return matcher
+
+    # ---------- operasi publik ----------
+
+    def add_student(self, record, student_id=None):
+        """Tambah murid lalu masukkan lewat shortest augmenting path."""
+        if self.free_capacity() < 1:
+            raise ValueError("Semua tutor penuh, murid baru ga bisa dimasukkan")
+        return self._augment(self._insert_student(record, student_id))
+
+    def remove_student(self, student_id):
+        """Keluarkan murid; kalau tutornya tadinya penuh, slot yang terbuka diisi ulang."""
+        i = self._student_index[student_id]
+        t = int(self._assign[i])
+        was_full = self._loads[t] >= self._caps[t]
+        self._loads[t] -= 1
+        changes = [(student_id, self._tutor_ids[t], None)]
+        self._drop_row(i)
+        if was_full:
+            changes += self._refill(t)
+        return changes
+
+    def update_student(self, student_id, record):
+        """Preferensi murid berubah: keluarkan lalu masukkan lagi dengan id yang sama."""
+        changes = self.remove_student(student_id)
+        return changes + self.add_student(record, student_id=student_id)
+
+    def add_tutor(self, record, capacity=None, tutor_id=None):
+        """Tambah tutor; murid yang lebih cocok digeser ke slot barunya."""
+        tid = self._new_id(tutor_id, self._tutor_index, self.m)
+        if capacity is None:
+            capacity = _record_capacity(record, self.default_capacity)
+        if capacity < 0:
+            raise ValueError("Kapasitas tutor ga boleh negatif")
+        self._grow_cols(self.m + 1)
+        j = self.m
+        self._t_codes[j] = self._encode(record)
+        self._caps[j] = capacity
+        self._loads[j] = 0
+        self.m += 1
+        self._tutor_ids.append(tid)
+        self._tutor_index[tid] = j
+        self._score_col(j)
+
+        if self.n == 0:
+            return []
+        if np.isinf(self._caps[:self.m]).all():
+            return self._reuse_switch(j)
+        changes = []
+        while self._loads[j] < self._caps[j]:
+            step = self._refill(j)
+            if not step:
+                break
+            changes += step
+        return changes
+
+    def remove_tutor(self, tutor_id):
+        """Keluarkan tutor; murid-muridnya dimasukkan ulang ke tutor lain."""
+        j = self._tutor_index[tutor_id]
+        others = np.arange(self.m) != j
+        if (self._caps[:self.m] - self._loads[:self.m])[others].sum() < self._loads[j]:
+            raise ValueError("Kapasitas tutor lain ga cukup untuk menampung murid tutor ini")
+        orphans = np.flatnonzero(self._assign[:self.n] == j)
+        orphan_ids = [self._student_ids[i] for i in orphans]
+        # Lepas dulu sebelum kolom dibuang, karena index tutor terakhir dipindah ke j
+        self._assign[orphans] = -1
+        self._drop_col(j)
+        changes = []
+        for sid in orphan_ids:
+            changes.append((sid, tutor_id, None))
+            changes += self._augment(self._student_index[sid])
+        return changes
+
+    def free_capacity(self) -> float:
+        return float((self._caps[:self.m] - self._loads[:self.m]).sum())
+
+    def assignment(self) -> dict:
+        """{student_id: tutor_id}"""
+        return {sid: self._tutor_ids[t] for sid, t in zip(self._student_ids, self._assign[:self.n])}
+
+    def fitness(self) -> dict:
+        n = self.n
+        if n == 0:
+            return {'total_score': 0.0, 'pct_satisfied': 0.0}
+        rows = np.arange(n)
+        cols = self._assign[:n]
+        return {
+            'total_score'  : float(self._score[rows, cols].sum()),
+            'pct_satisfied': int(self._sat[rows, cols].sum()) / self.num_constraints / n
+        }
+
+    def score_matrix(self) -> dict:
+        """Salinan matriks skor aktif, format sama dengan build_score_matrix."""
+        return {
+            'score'          : self._score[:self.n, :self.m].copy(),
+            'satisfied'      : self._sat[:self.n, :self.m].copy(),
+            'num_constraints': self.num_constraints
+        }
+
+    # ---------- perbaikan lokal ----------
+
+    def _insert_student(self, record, student_id):
+        # Tambah baris murid tanpa tutor (assign -1), belum diperbaiki
+        sid = self._new_id(student_id, self._student_index, self.n)
+        self._grow_rows(self.n + 1)
+        i = self.n
+        self._s_codes[i] = self._encode(record)
+        self._s_flex[i] = bool(record.get(FLEKS_COLUMN, False))
+        self._assign[i] = -1
+        self.n += 1
+        self._student_ids.append(sid)
+        self._student_index[sid] = i
+        self._score_row(i)
+        return i
+
+    def _solve(self):
+        # Solve penuh sekali (LAP dengan slot kapasitas), dipakai waktu inisialisasi
+        n, m = self.n, self.m
+        if n == 0:
+            return
+        score = self._score[:n, :m]
+        caps = self._caps[:m]
+        if np.isinf(caps).all():
+            assign = score.argmax(axis=1)
+        else:
+            if caps.sum() < n:
+                raise ValueError(f"Total kapasitas tutor ({caps.sum():g}) kurang dari jumlah murid ({n})")
+            slot_tutor = expand_capacities(np.minimum(caps, n).astype(np.int64), m)
+            assign = slot_tutor[solve_assignment(-score[:, slot_tutor])]
+        self._assign[:n] = assign
+        self._loads[:m] = np.bincount(assign, minlength=m)
+
+    def _augment(self, s):
+        """
+        Masukkan murid s (belum punya tutor) lewat shortest augmenting path:
+        s masuk tutor t1; kalau t1 penuh salah satu muridnya geser ke t2, dst.
+        sampai rantainya berakhir di tutor yang masih ada slot.
+        """
+        n, m = self.n, self.m
+        score = self._score[:n, :m]
+        assign = self._assign[:n]
+        caps, loads = self._caps[:m], self._loads[:m]
+
+        # dist[t] = biaya (negatif skor) supaya ada 1 murid tambahan di tutor t
+        dist = -score[s].copy()
+        pred = np.full(m, -1, dtype=np.int64)   # murid yang pindah ke t (-1 = s sendiri)
+        full = loads >= caps
+        movable = np.flatnonzero((assign >= 0) & full[np.maximum(assign, 0)])
+        movable = movable[movable != s]
+        if len(movable):
+            cur = assign[movable]
+            stay = score[movable, cur]
+            cols = np.arange(m)
+            for _ in range(m):
+                # Murid k di tutor penuh a_k pindah ke t: dist[a_k] + skor_lama - skor_baru
+                cand = (dist[cur] + stay)[:, None] - score[movable]
+                best = cand.argmin(axis=0)
+                val = cand[best, cols]
+                better = val < dist - _EPS
+                if not better.any():
+                    break
+                dist[better] = val[better]
+                pred[better] = movable[best[better]]
+
+        open_slots = np.flatnonzero(loads < caps)
+        end = int(open_slots[dist[open_slots].argmin()])
+        changes = []
+        t = end
+        while True:
+            k = int(pred[t])
+            if k < 0:
+                assign[s] = t
+                changes.append((self._student_ids[s], None, self._tutor_ids[t]))
+                break
+            old = int(assign[k])
+            assign[k] = t
+            changes.append((self._student_ids[k], self._tutor_ids[old], self._tutor_ids[t]))
+            t = old
+        loads[end] += 1
+        return changes
+
+    def _refill(self, t0):
+        """
+        Tutor t0 punya 1 slot yang baru terbuka: cari rantai geser dengan kenaikan skor
+        terbesar (murid k pindah ke slot itu, slot lamanya diisi murid lain, dst.)
+        dan terapkan kalau memang menaikkan skor.
+        """
+        n, m = self.n, self.m
+        if n == 0:
+            return []
+        score = self._score[:n, :m]
+        assign = self._assign[:n]
+        loads = self._loads[:m]
+        rows = np.arange(n)
+        stay = score[rows, assign]
+
+        # dist[a] = biaya supaya slot bebas "pindah" ke tutor a
+        dist = np.full(m, np.inf)
+        dist[t0] = 0.0
+        pred_k = np.full(m, -1, dtype=np.int64)
+        pred_t = np.full(m, -1, dtype=np.int64)
+        for _ in range(m):
+            reach = np.flatnonzero(np.isfinite(dist))
+            cand = dist[reach][None, :] - score[:, reach]
+            pick = cand.argmin(axis=1)
+            via = cand[rows, pick] + stay
+            # Per tutor asal, ambil murid dengan biaya terkecil
+            order = np.lexsort((via, assign))
+            first = order[np.r_[True, assign[order][1:] != assign[order][:-1]]]
+            a = assign[first]
+            better = via[first] < dist[a] - _EPS
+            if not better.any():
+                break
+            k = first[better]
+            a = a[better]
+            dist[a] = via[k]
+            pred_k[a] = k
+            pred_t[a] = reach[pick[k]]
+
+        end = int(dist.argmin())
+        if not dist[end] < -_EPS:
+            return []
+        changes = []
+        a = end
+        while a != t0:
+            k, t = int(pred_k[a]), int(pred_t[a])
+            assign[k] = t
+            changes.append((self._student_ids[k], self._tutor_ids[a], self._tutor_ids[t]))
+            a = t
+        loads[t0] += 1
+        loads[end] -= 1
+        return changes
+
+    def _reuse_switch(self, j):
+        # Tanpa batas kapasitas: murid yang skornya lebih tinggi di tutor baru langsung pindah
+        n = self.n
+        rows = np.arange(n)
+        assign = self._assign[:n]
+        better = np.flatnonzero(self._score[rows, j] > self._score[rows, assign] + _EPS)
+        changes = [(self._student_ids[i], self._tutor_ids[assign[i]], self._tutor_ids[j]) for i in better]
+        np.subtract.at(self._loads, assign[better], 1)
+        assign[better] = j
+        self._loads[j] += len(better)
+        return changes
+
+    # ---------- skor & penyimpanan ----------
+
+    def _encode(self, record):
+        codes = np.empty(len(CRITERIA), dtype=np.int64)
+        for c, key in enumerate(CRITERIA):
+            value = record.get(key)
+            if value is None or (isinstance(value, float) and math.isnan(value)):
+                codes[c] = -1
+            else:
+                codes[c] = self._vocab[c].setdefault(value, len(self._vocab[c]))
+        return codes
+
+    def _score_row(self, i):
+        code = self._s_codes[i]
+        match = (self._t_codes[:self.m] == code) & (code >= 0)
+        if self._s_flex[i]:
+            match[:, _WAKTU] = True
+        self._score[i, :self.m] = match @ self._w
+        self._sat[i, :self.m] = match.sum(axis=1)
+
+    def _score_col(self, j):
+        s_codes = self._s_codes[:self.n]
+        match = (s_codes == self._t_codes[j]) & (s_codes >= 0)
+        match[:, _WAKTU] |= self._s_flex[:self.n]
+        self._score[:self.n, j] = match @ self._w
+        self._sat[:self.n, j] = match.sum(axis=1)
+
+    @staticmethod
+    def _new_id(given, index, fallback):
+        sid = fallback if given is None else given
+        while sid in index:
+            if given is not None:
+                raise KeyError(f"id {given!r} sudah ada")
+            sid += 1
+        return sid
+
+    def _grow_rows(self, need):
+        size = len(self._s_flex)
+        if need <= size:
+            return
+        size = max(need, 2 * size)
+        self._s_codes = _resize(self._s_codes, (size, len(CRITERIA)), -1)
+        self._s_flex  = _resize(self._s_flex, (size,), False)
+        self._assign  = _resize(self._assign, (size,), -1)
+        self._score   = _resize(self._score, (size, self._score.shape[1]), 0)
+        self._sat     = _resize(self._sat, (size, self._sat.shape[1]), 0)
+
+    def _grow_cols(self, need):
+        size = len(self._caps)
+        if need <= size:
+            return
+        size = max(need, 2 * size)
+        self._t_codes = _resize(self._t_codes, (size, len(CRITERIA)), -1)
+        self._caps    = _resize(self._caps, (size,), 0)
+        self._loads   = _resize(self._loads, (size,), 0)
+        self._score   = _resize(self._score, (self._score.shape[0], size), 0)
+        self._sat     = _resize(self._sat, (self._sat.shape[0], size), 0)
+
+    def _drop_row(self, i):
+        # Swap-remove: baris terakhir pindah ke posisi i supaya array tetap rapat
+        last = self.n - 1
+        sid = self._student_ids[i]
+        if i != last:
+            for arr in (self._s_codes, self._s_flex, self._assign, self._score, self._sat):
+                arr[i] = arr[last]
+            moved = self._student_ids[last]
+            self._student_ids[i] = moved
+            self._student_index[moved] = i
+        self._student_ids.pop()
+        del self._student_index[sid]
+        self.n -= 1
+
+    def _drop_col(self, j):
+        last = self.m - 1
+        tid = self._tutor_ids[j]
+        if j != last:
+            for arr in (self._t_codes, self._caps, self._loads):
+                arr[j] = arr[last]
+            self._score[:, j] = self._score[:, last]
+            self._sat[:, j] = self._sat[:, last]
+            self._assign[:self.n][self._assign[:self.n] == last] = j
+            moved = self._tutor_ids[last]
+            self._tutor_ids[j] = moved
+            self._tutor_index[moved] = j
+        self._tutor_ids.pop()
+        del self._tutor_index[tid]
+        self.m -= 1
+
+def _record_capacity(record, default):
+    # Sama seperti tutor_capacities: kolom ga ada -> default (None = tanpa batas), sel kosong -> 1
+    if 'kapasitas' not in record:
+        return math.inf if default is None else default
+    value = record.get('kapasitas')
+    if value is None or (isinstance(value, float) and math.isnan(value)):
+        return 1
+    return int(value)
+
+def _resize(arr, shape, fill):
+    out = np.full(shape, fill, dtype=arr.dtype)
+    out[tuple(slice(0, s) for s in arr.shape)] = arr
+    return out
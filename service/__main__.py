@@ -0,0 +1,92 @@
+"""
+Service matching lokal dengan micro-batching. Jalankan dari root repo:
+
+    python -m service --tutors simulated_annealing/data/scenario1_fixed.csv --engine sa --port 8080
+    python -m service --tutors pool.csv --engine ga --unix /tmp/tutas.sock --max-batch 32 --max-wait-ms 20
+
+    curl -s localhost:8080/match -d '{"mata_kuliah": "Kalkulus", "subbab": "Limit", "deadline_ms": 2000}'
+"""
+import argparse
+import ast
+import asyncio
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+from benchmark.runner import DEFAULT_WEIGHTS
+from service import worker
+from service.batcher import MicroBatcher
+from service.server import MatchServer, load_tutor_pool
+
+def parse_params(items):
+    """'param=nilai' -> {param: nilai}; nilai di-parse sebagai literal Python kalau bisa."""
+    params = {}
+    for item in items or []:
+        key, sep, raw = item.partition('=')
+        if not sep:
+            raise ValueError(f"Format --param harus param=nilai, bukan {item!r}")
+        try:
+            params[key] = ast.literal_eval(raw)
+        except (ValueError, SyntaxError):
+            params[key] = raw
+    return params
+
+async def serve(args, params):
+    df_tutors, names = load_tutor_pool(args.tutors)
+    max_batch = args.max_batch
+    capacities = worker.service_capacities(args.engine, df_tutors, params)
+    if capacities is not None:
+        # Batch lebih besar dari total slot tutor ga mungkin di-match
+        limit = sum(capacities)
+        if limit < 1:
+            raise ValueError("Total kapasitas tutor 0, ga ada yang bisa di-match")
+        max_batch = min(max_batch, limit)
+    workers = args.workers or os.cpu_count() or 1
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=worker.init_worker,
+                             initargs=(df_tutors, DEFAULT_WEIGHTS, args.engine, params)) as pool:
+        batcher = MicroBatcher(pool, worker.solve_batch,
+                               max_batch=max_batch,
+                               max_wait=args.max_wait_ms / 1e3,
+                               max_pending=args.max_pending,
+                               max_inflight=workers,
+                               seed=args.seed,
+                               capacities=capacities)
+        # Worker di-fork sebelum socket dibuka: kalau fork-nya nanti waktu ada koneksi,
+        # fd klien ikut diwarisi worker dan koneksi ga pernah benar-benar tertutup.
+        # Sekalian memastikan init_worker dan engine jalan sebelum nerima request
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(*(loop.run_in_executor(pool, worker.warmup)
+                               for _ in range(workers)))
+        deadline = args.deadline_ms / 1e3 if args.deadline_ms else None
+        where = args.unix or f"{args.host}:{args.port}"
+        slots = 'reuse' if capacities is None else f"{sum(capacities)} slot"
+        print(f"Service {args.engine} ({len(names)} tutor, {slots}, batch <= {max_batch}, {workers} worker) di {where}")
+        await MatchServer(batcher, names, deadline).serve(args.host, args.port, args.unix)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m service', description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--tutors', required=True, help='CSV skenario; baris tutor jadi pool tutor')
+    parser.add_argument('--engine', default='sa', help='engine benchmark yang dipakai per batch (default sa)')
+    parser.add_argument('--param', action='append', metavar='PARAM=VALUE',
+                        help='override parameter engine, boleh diulang')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8080)
+    parser.add_argument('--unix', help='path Unix socket (menggantikan host/port)')
+    parser.add_argument('--max-batch', type=int, default=64)
+    parser.add_argument('--max-wait-ms', type=float, default=20.0, help='jendela batch dari request pertama')
+    parser.add_argument('--max-pending', type=int, default=1024, help='kapasitas antrian sebelum 503')
+    parser.add_argument('--deadline-ms', type=float, default=5000.0,
+                        help='deadline default per request (0 = tanpa batas)')
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--seed', type=int, default=None)
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(serve(args, parse_params(args.param)))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
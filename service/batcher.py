@@ -0,0 +1,209 @@
+"""
+Micro-batching asyncio: request murid dikumpulkan di antrian terbatas, lalu dikirim
+sebagai satu batch ke process pool begitu batch penuh (max_batch) atau jendela waktu
+(max_wait) habis. Event loop cuma ngatur antrian, solve yang CPU-bound jalan di worker.
+
+Backpressure: antrian penuh -> submit langsung gagal (Overloaded), bukan numpuk di memory.
+Deadline: jendela batch ditutup lebih awal kalau ada request yang deadline-nya dekat,
+dan request yang lewat deadline dibuang dari batch / gagal dengan DeadlineExceeded.
+
+Kapasitas: kalau capacities diisi, sisa slot tiap tutor disimpan di sini dan dipotong
+setelah tiap batch, jadi tutor yang sudah penuh ga dibagi lagi ke batch berikutnya.
+Batch dijalankan satu per satu supaya dua batch ga memakai sisa slot yang sama;
+murid yang ga kebagian slot gagal dengan CapacityExhausted.
+"""
+import asyncio
+import time
+import numpy as np
+
+class Overloaded(Exception):
+    """Antrian request penuh."""
+
+class DeadlineExceeded(Exception):
+    """Request ga selesai sebelum deadline-nya."""
+
+class CapacityExhausted(Exception):
+    """Semua slot tutor sudah terpakai batch sebelumnya."""
+
+class _Pending:
+    __slots__ = ('record', 'deadline', 'future', 'arrived')
+
+    def __init__(self, record, deadline, future, arrived):
+        self.record = record
+        self.deadline = deadline
+        self.future = future
+        self.arrived = arrived
+
+class MicroBatcher:
+    """
+    Args:
+        executor    : concurrent.futures executor (biasanya ProcessPoolExecutor)
+        solve       : fungsi picklable solve(records, seed[, capacities]) -> list hasil per record
+        max_batch   : ukuran batch maksimum
+        max_wait    : detik maksimum request pertama nunggu batch-nya terisi
+        max_pending : kapasitas antrian (backpressure)
+        max_inflight: batch yang boleh jalan bareng di executor (samakan dengan jumlah worker)
+        seed        : seed dasar; tiap batch dapat seed turunan SeedSequence
+        capacities  : kapasitas awal per tutor yang dihabiskan lintas batch (None = model
+                      reuse, tiap batch stateless); kalau diisi max_inflight dipaksa 1
+    """
+
+    def __init__(self, executor, solve,
+                 max_batch: int = 64,
+                 max_wait: float = 0.05,
+                 max_pending: int = 1024,
+                 max_inflight: int = 1,
+                 seed=None,
+                 capacities=None):
+        if max_batch < 1 or max_pending < 1 or max_inflight < 1:
+            raise ValueError("max_batch, max_pending, dan max_inflight minimal 1")
+        self.executor = executor
+        self.solve = solve
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self._remaining = None
+        if capacities is not None:
+            self._remaining = np.array(capacities, dtype=np.int64)
+            max_inflight = 1
+        self._queue = asyncio.Queue(maxsize=max_pending)
+        self._slots = asyncio.Semaphore(max_inflight)
+        self._seeds = np.random.SeedSequence(seed)
+        self._tasks = set()
+        self._getter = None
+        # Perkiraan lama solve per batch (EWMA), dipakai buat nutup jendela sebelum deadline
+        self._solve_estimate = 0.0
+        self.counters = {'accepted': 0, 'rejected': 0, 'expired': 0, 'failed': 0,
+                         'exhausted': 0, 'completed': 0, 'batches': 0}
+
+    async def submit(self, record, timeout: float = None):
+        """
+        Masukkan satu record murid lalu tunggu hasil matching-nya.
+        timeout: detik sampai deadline (None = tanpa deadline).
+        """
+        loop = asyncio.get_running_loop()
+        now = loop.time()
+        deadline = now + timeout if timeout is not None else float('inf')
+        item = _Pending(record, deadline, loop.create_future(), now)
+        try:
+            self._queue.put_nowait(item)
+        except asyncio.QueueFull:
+            self.counters['rejected'] += 1
+            raise Overloaded(f"Antrian penuh ({self._queue.maxsize} request)") from None
+        self.counters['accepted'] += 1
+        try:
+            return await asyncio.wait_for(asyncio.shield(item.future), timeout)
+        except asyncio.TimeoutError:
+            # Tandai batal supaya dispatcher ga ikut nge-solve request ini
+            item.future.cancel()
+            self.counters['expired'] += 1
+            raise DeadlineExceeded("Deadline request lewat sebelum matching selesai") from None
+
+    async def run(self):
+        """Loop dispatcher; jalankan sebagai task selama service hidup."""
+        loop = asyncio.get_running_loop()
+        try:
+            while True:
+                batch = await self._collect(loop)
+                if not batch:
+                    continue
+                await self._slots.acquire()
+                task = loop.create_task(self._dispatch(loop, batch))
+                self._tasks.add(task)
+                task.add_done_callback(self._tasks.discard)
+        finally:
+            if self._getter is not None:
+                self._getter.cancel()
+            for task in self._tasks:
+                task.cancel()
+
+    async def _next(self, timeout=None):
+        # Task get() dipertahankan antar panggilan, jadi item ga hilang waktu timeout
+        if self._getter is None:
+            self._getter = asyncio.ensure_future(self._queue.get())
+        done, _ = await asyncio.wait({self._getter}, timeout=timeout)
+        if not done:
+            return None
+        item, self._getter = self._getter.result(), None
+        return item
+
+    async def _collect(self, loop):
+        batch = []
+        close = None
+        while len(batch) < self.max_batch:
+            timeout = None if close is None else close - loop.time()
+            if timeout is not None and timeout <= 0:
+                break
+            item = await self._next(timeout)
+            if item is None:
+                break
+            if item.future.done():
+                # Udah batal waktu nunggu di antrian, ga dihitung ke ukuran batch
+                continue
+            if close is None:
+                close = loop.time() + self.max_wait
+            batch.append(item)
+            close = min(close, item.deadline - self._solve_estimate)
+
+        # Buang yang pasti telat (atau batal selama jendela batch)
+        now = loop.time()
+        live = []
+        for item in batch:
+            if item.future.done():
+                continue
+            if now >= item.deadline:
+                self.counters['expired'] += 1
+                item.future.set_exception(DeadlineExceeded("Deadline lewat sebelum batch dikirim"))
+                continue
+            live.append(item)
+        return live
+
+    async def _dispatch(self, loop, batch):
+        args = ()
+        if self._remaining is not None:
+            # Kelebihan murid di atas sisa slot langsung ditolak, sisanya tetap di-match
+            slots = int(self._remaining.sum())
+            for item in batch[slots:]:
+                self.counters['exhausted'] += 1
+                item.future.set_exception(CapacityExhausted("Semua slot tutor sudah terpakai"))
+            batch = batch[:slots]
+            if not batch:
+                self._slots.release()
+                return
+            args = (self._remaining.tolist(),)
+        seed = int(self._seeds.spawn(1)[0].generate_state(1)[0])
+        start = time.perf_counter()
+        try:
+            results = await loop.run_in_executor(self.executor, self.solve,
+                                                 [item.record for item in batch], seed, *args)
+        except Exception as exc:
+            self.counters['failed'] += len(batch)
+            for item in batch:
+                if not item.future.done():
+                    item.future.set_exception(exc)
+            return
+        finally:
+            self._slots.release()
+        elapsed = time.perf_counter() - start
+        if self.counters['batches']:
+            elapsed = 0.8 * self._solve_estimate + 0.2 * elapsed
+        self._solve_estimate = elapsed
+        self.counters['batches'] += 1
+
+        # Masih di task yang sama tanpa await, jadi batch berikutnya baru jalan setelah dipotong
+        now = loop.time()
+        for item, result in zip(batch, results):
+            if item.future.done():
+                continue
+            if self._remaining is not None:
+                self._remaining[result['tutor_index']] -= 1
+            self.counters['completed'] += 1
+            item.future.set_result({**result, 'batch_size': len(batch),
+                                    'latency_ms': (now - item.arrived) * 1e3})
+
+    def stats(self) -> dict:
+        remaining = None if self._remaining is None else int(self._remaining.sum())
+        return {**self.counters,
+                'pending': self._queue.qsize(),
+                'inflight': len(self._tasks),
+                'remaining_slots': remaining,
+                'solve_estimate_ms': self._solve_estimate * 1e3}
@@ -0,0 +1,143 @@
+"""
+Endpoint HTTP/1.1 minimal (asyncio streams, tanpa dependency luar) di TCP atau Unix socket:
+
+    POST /match   body JSON record murid (kolom sama seperti CSV skenario), opsional
+                  "deadline_ms"; balasan tutor hasil matching batch-nya
+    GET  /stats   counter antrian/batch
+
+Status error: 400 JSON salah, 404/405, 413 body kebesaran, 503 antrian penuh
+(dengan Retry-After), 409 slot tutor habis, 504 deadline lewat, 500 solve gagal.
+"""
+import asyncio
+import json
+import pandas as pd
+
+from service.batcher import CapacityExhausted, DeadlineExceeded, MicroBatcher, Overloaded
+
+MAX_BODY = 64 * 1024
+REASONS = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed', 409: 'Conflict',
+           413: 'Payload Too Large', 500: 'Internal Server Error',
+           503: 'Service Unavailable', 504: 'Gateway Timeout'}
+
+def load_tutor_pool(path: str):
+    """Baris tutor dari CSV skenario: (df_tutors index 0..m-1, daftar nama tutor)."""
+    df = pd.read_csv(path, index_col=0)
+    df['Status'] = df['Status'].str.lower()
+    tutors = df[df['Status'] == 'tutor'].drop(columns=['Status'])
+    if tutors.empty:
+        raise ValueError(f"Ga ada baris tutor di {path}")
+    return tutors.reset_index(drop=True), [str(name) for name in tutors.index]
+
+class MatchServer:
+    """
+    Args:
+        batcher         : MicroBatcher yang sudah dibuat (dispatcher-nya dijalankan di sini)
+        tutor_names     : nama tutor per index, dipakai di balasan
+        default_deadline: detik deadline kalau request ga kirim deadline_ms (None = tanpa batas)
+    """
+
+    def __init__(self, batcher: MicroBatcher, tutor_names, default_deadline: float = None):
+        self.batcher = batcher
+        self.tutor_names = tutor_names
+        self.default_deadline = default_deadline
+
+    async def serve(self, host: str = '127.0.0.1', port: int = 8080, unix_path: str = None):
+        """Jalan terus sampai di-cancel."""
+        if unix_path:
+            server = await asyncio.start_unix_server(self._handle, path=unix_path)
+        else:
+            server = await asyncio.start_server(self._handle, host, port)
+        dispatcher = asyncio.get_running_loop().create_task(self.batcher.run())
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            dispatcher.cancel()
+
+    async def _handle(self, reader, writer):
+        # Keep-alive: proses request berurutan sampai klien nutup atau minta close
+        try:
+            while True:
+                request = await _read_request(reader)
+                if request is None:
+                    break
+                method, path, headers, body = request
+                if isinstance(body, int):
+                    status, payload, extra = body, {'error': REASONS[body]}, {}
+                else:
+                    status, payload, extra = await self._route(method, path, body)
+                keep = headers.get('connection', '').lower() != 'close'
+                await _write_response(writer, status, payload, extra, keep)
+                if not keep:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def _route(self, method, path, body):
+        if path == '/stats':
+            if method != 'GET':
+                return 405, {'error': REASONS[405]}, {}
+            return 200, self.batcher.stats(), {}
+        if path != '/match':
+            return 404, {'error': REASONS[404]}, {}
+        if method != 'POST':
+            return 405, {'error': REASONS[405]}, {}
+
+        try:
+            record = json.loads(body or b'{}')
+            if not isinstance(record, dict):
+                raise ValueError("body harus object JSON")
+            deadline_ms = record.pop('deadline_ms', None)
+            timeout = self.default_deadline if deadline_ms is None else float(deadline_ms) / 1e3
+        except (ValueError, TypeError) as exc:
+            return 400, {'error': str(exc)}, {}
+
+        try:
+            result = await self.batcher.submit(record, timeout)
+        except Overloaded as exc:
+            return 503, {'error': str(exc)}, {'Retry-After': '1'}
+        except DeadlineExceeded as exc:
+            return 504, {'error': str(exc)}, {}
+        except CapacityExhausted as exc:
+            return 409, {'error': str(exc)}, {}
+        except Exception as exc:
+            return 500, {'error': f"{type(exc).__name__}: {exc}"}, {}
+        return 200, {**result, 'tutor': self.tutor_names[result['tutor_index']]}, {}
+
+async def _read_request(reader):
+    """(method, path, headers, body) atau None kalau koneksi ditutup; body int = kode error."""
+    line = await reader.readline()
+    if not line:
+        return None
+    parts = line.decode('latin-1').split()
+    if len(parts) != 3:
+        return 'GET', '', {}, 400
+    method, path, _ = parts
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b'\r\n', b'\n', b''):
+            break
+        key, _, value = line.decode('latin-1').partition(':')
+        headers[key.strip().lower()] = value.strip()
+    try:
+        length = int(headers.get('content-length', 0))
+    except ValueError:
+        return method, path, headers, 400
+    if length > MAX_BODY:
+        headers['connection'] = 'close'
+        return method, path, headers, 413
+    body = await reader.readexactly(length) if length else b''
+    return method, path.split('?', 1)[0], headers, body
+
+async def _write_response(writer, status, payload, extra, keep):
+    body = json.dumps(payload).encode('utf-8')
+    head = [f"HTTP/1.1 {status} {REASONS[status]}",
+            'Content-Type: application/json',
+            f"Content-Length: {len(body)}",
+            f"Connection: {'keep-alive' if keep else 'close'}"]
+    head += [f"{key}: {value}" for key, value in extra.items()]
+    writer.write(('\r\n'.join(head) + '\r\n\r\n').encode('latin-1') + body)
+    await writer.drain()
@@ -0,0 +1,102 @@
+"""
+Sisi proses worker service matching. Tutor, bobot, dan engine di-set sekali per proses
+lewat initializer; tiap solve_batch cuma bangun matriks skor (batch murid × tutor)
+lalu jalanin engine, jadi biaya persiapan tutor ga diulang per request.
+
+Kapasitas tutor (kolom 'kapasitas', atau 1 per tutor untuk engine 1:1) dipegang
+MicroBatcher di proses utama: sisa kapasitas dikirim ke tiap solve_batch dan ditulis
+ke kolom 'kapasitas' tutor, yang dibaca semua engine.
+"""
+import numpy as np
+import pandas as pd
+
+from benchmark.engines import ENGINES, build_score_matrix, tutor_capacities
+# Folder engine udah masuk sys.path lewat benchmark.engines
+from fitness import CAPACITY_COLUMN, CRITERIA
+
+# Diisi sekali per worker lewat init_worker
+_tutors = None
+_weights = None
+_engine = None
+_params = None
+_capacities = None
+
+def prepare_tutors(df_tutors):
+    """Kolom atribut tutor jadi Categorical sekali; murid tiap batch di-cast ke dtype yang sama."""
+    df = df_tutors.copy()
+    for key in CRITERIA:
+        df[key] = df[key].astype('category')
+    return df
+
+def engine_params(engine: str, df_tutors, params=None) -> dict:
+    """
+    Parameter engine untuk satu batch: default registry + override. Engine 1:1 tanpa
+    kolom kapasitas dijalankan dengan kapasitas 1 per tutor, karena batch biasanya
+    jauh lebih kecil dari jumlah tutor.
+    """
+    if engine not in ENGINES:
+        raise ValueError(f"Engine {engine!r} ga terdaftar (pilihan: {', '.join(ENGINES)})")
+    merged = {**ENGINES[engine]['defaults'], **(params or {})}
+    if ENGINES[engine]['model'] == 'one_to_one' and tutor_capacities(df_tutors) is None:
+        merged.setdefault('capacities', 1)
+    return merged
+
+def service_capacities(engine: str, df_tutors, params=None):
+    """
+    Kapasitas awal per tutor yang dihabiskan service lintas batch: kolom 'kapasitas',
+    kalau ga ada param capacities engine (engine 1:1 default 1). None = model reuse
+    tanpa batas, tiap batch boleh pakai tutor mana pun lagi.
+    """
+    caps = tutor_capacities(df_tutors)
+    if caps is not None:
+        return caps
+    caps = engine_params(engine, df_tutors, params).get('capacities')
+    if caps is None:
+        return None
+    return np.broadcast_to(np.asarray(caps, dtype=np.int64), (len(df_tutors),)).tolist()
+
+def init_worker(df_tutors, weights, engine: str, params=None):
+    global _tutors, _weights, _engine, _params, _capacities
+    _tutors = prepare_tutors(df_tutors)
+    _weights = dict(weights)
+    _engine = ENGINES[engine]
+    _params = engine_params(engine, df_tutors, params)
+    _capacities = service_capacities(engine, df_tutors, params)
+    if _capacities is not None:
+        # Sisa kapasitas datang per batch lewat kolom 'kapasitas', bukan param engine
+        _params.pop('capacities', None)
+
+def student_frame(records):
+    """Record JSON murid -> DataFrame dengan dtype kategori tutor (nilai asing jadi NaN)."""
+    df = pd.DataFrame.from_records(records)
+    for key in CRITERIA:
+        column = df[key] if key in df else pd.Series([None] * len(df))
+        df[key] = column.astype(_tutors[key].dtype)
+    return df
+
+def solve_batch(records, seed, capacities=None):
+    """
+    Matching satu batch murid ke pool tutor.
+    capacities: sisa kapasitas per tutor (list panjang m) dari MicroBatcher; None = pool
+                apa adanya (model reuse tanpa kapasitas)
+
+    Returns:
+        list per murid: {'tutor_index', 'score', 'pct_satisfied'}
+    """
+    df_students = student_frame(records)
+    tutors = _tutors
+    if capacities is not None:
+        tutors = _tutors.assign(**{CAPACITY_COLUMN: capacities})
+    score_matrix = build_score_matrix(df_students, tutors, _weights)
+    res = _engine['fn'](df_students, tutors, _weights, score_matrix, seed, **_params)
+
+    assign = np.asarray(res['best_assignment'], dtype=np.int64)
+    rows = np.arange(len(records))
+    score = score_matrix['score'][rows, assign]
+    satisfied = score_matrix['satisfied'][rows, assign] / score_matrix['num_constraints']
+    return [{'tutor_index': int(t), 'score': float(s), 'pct_satisfied': float(p)}
+            for t, s, p in zip(assign, score, satisfied)]
+
+def warmup():
+    """Satu solve dummy (1 murid kosong) untuk memastikan worker dan engine siap."""
+    solve_batch([dict.fromkeys(CRITERIA)], 0, _capacities)
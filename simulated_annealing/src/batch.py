@@ -0,0 +1,297 @@
+# batch.py
+
+import time
+import numpy as np
+from budget import Budget
+from fitness import build_score_matrix, compute_fitness, is_lazy, normalize_capacities, tutor_capacities
+
+def per_chain(value, chains: int, name: str) -> np.ndarray:
+    """Skalar atau array-like panjang chains -> array float (chains,)."""
+    arr = np.asarray(value, dtype=float)
+    if arr.ndim == 0:
+        return np.full(chains, float(arr))
+    if arr.shape != (chains,):
+        raise ValueError(f"{name} harus skalar atau panjang {chains} (jumlah chain), bukan shape {arr.shape}")
+    return arr.copy()
+
+class ChainMembers:
+    """
+    Murid tiap tutor per chain, layout sama dengan kernels.kernel_state tapi satu baris
+    per chain: members[c, offsets[t]:offsets[t] + loads[c, t]] = murid tutor t di chain c,
+    pos[c, i] = posisi murid i di blok tutornya. Slot di luar loads berisi id basi.
+    """
+
+    def __init__(self, curr: np.ndarray, caps: np.ndarray):
+        chains, n = curr.shape
+        rows = np.arange(chains)
+        self.caps = caps
+        self.offsets = np.zeros(len(caps), dtype=np.int64)
+        self.offsets[1:] = np.cumsum(caps)[:-1]
+        self.loads = np.zeros((chains, len(caps)), dtype=np.int64)
+        np.add.at(self.loads, (np.repeat(rows, n), curr.ravel()), 1)
+        # Urutkan murid per tutor; rank dalam blok = urutan dikurangi awal blok tutornya
+        order = np.argsort(curr, axis=1, kind='stable')
+        tutor = np.take_along_axis(curr, order, axis=1)
+        start = np.cumsum(self.loads, axis=1) - self.loads
+        rank = np.arange(n) - np.take_along_axis(start, tutor, axis=1)
+        r = rows[:, None]
+        self.members = np.zeros((chains, int(caps.sum())), dtype=np.int64)
+        self.members[r, self.offsets[tutor] + rank] = order
+        self.pos = np.empty((chains, n), dtype=np.int64)
+        self.pos[r, order] = rank
+
+    def full(self, rows, a, t) -> np.ndarray:
+        """Tutor t beda dari tutor sekarang a dan sudah penuh di chain-nya."""
+        return (t != a) & (self.loads[rows, t] >= self.caps[t])
+
+    def pick(self, rows, t, v) -> np.ndarray:
+        """Murid ke-floor(v * load) tutor t per chain (seperti state.member di run_sa)."""
+        k = (v * self.loads[rows, t]).astype(np.int64)
+        return self.members[rows, self.offsets[t] + k]
+
+    def swap(self, rows, i, j, a, b) -> None:
+        """Murid i (di tutor a) dan j (di tutor b) tukar tutor; beban tetap."""
+        self.members[rows, self.offsets[a] + self.pos[rows, i]] = j
+        self.members[rows, self.offsets[b] + self.pos[rows, j]] = i
+        self.pos[rows, i], self.pos[rows, j] = self.pos[rows, j], self.pos[rows, i].copy()
+
+    def move(self, rows, i, a, t) -> None:
+        """Pindah murid i dari tutor a ke t (satu move per chain, index ga pernah dobel)."""
+        # Keluarkan i dari blok a (isi lubangnya dengan murid terakhir), lalu taruh di ujung blok t
+        self.loads[rows, a] -= 1
+        last = self.members[rows, self.offsets[a] + self.loads[rows, a]]
+        p = self.pos[rows, i]
+        self.members[rows, self.offsets[a] + p] = last
+        self.pos[rows, last] = p
+        q = self.loads[rows, t]
+        self.members[rows, self.offsets[t] + q] = i
+        self.pos[rows, i] = q
+        self.loads[rows, t] += 1
+
+    def exchange(self, lo, hi) -> None:
+        """Tukar isi chain lo dan hi (replica exchange run_pt)."""
+        for arr in (self.loads, self.members, self.pos):
+            arr[lo], arr[hi] = arr[hi], arr[lo].copy()
+
+class ChainJournal:
+    """
+    Best tiap chain tanpa copy baris (O(n)) tiap kali naik, versi batch dari jurnal
+    _anneal_python: yang dicatat cuma langkah saat best terakhir tiap chain dan jurnal
+    move yang diterima (chain, murid, tutor lama). best baru direkonstruksi di flush:
+    chain yang naik sejak flush terakhir di-copy dari curr, lalu move setelah langkah
+    best-nya dibatalkan mundur. Flush tiap n langkah, jadi O(chains) amortized per langkah.
+    """
+
+    def __init__(self, curr: np.ndarray, totals: np.ndarray):
+        self.best = curr.copy()
+        self.totals = totals.copy()
+        self.step = np.full(len(curr), -1, dtype=np.int64)
+        self.base = 0
+        self.entries = []
+
+    def record(self, step: int, rows, i1, old1, i2, old2) -> None:
+        """Move diterima di langkah step: murid i1/i2 tadinya di tutor old1/old2 (reassign: i2=i1)."""
+        self.entries.append((step, rows, i1, old1, i2, old2))
+
+    def improve(self, step: int, rows, totals) -> None:
+        self.totals[rows] = totals
+        self.step[rows] = step
+
+    def flush(self, curr: np.ndarray, step: int) -> np.ndarray:
+        """Tulis best semua chain yang naik sejak flush terakhir, kosongkan jurnal; return best."""
+        dirty = self.step >= self.base
+        if dirty.any():
+            self.best[dirty] = curr[dirty]
+            for s, rows, i1, old1, i2, old2 in reversed(self.entries):
+                undo = dirty[rows] & (self.step[rows] < s)
+                if undo.any():
+                    r = rows[undo]
+                    self.best[r, i2[undo]] = old2[undo]
+                    self.best[r, i1[undo]] = old1[undo]
+        self.entries.clear()
+        self.base = step + 1
+        return self.best
+
+def run_sa_batch(df_students, df_tutors, weights,
+                 chains: int = 64,
+                 T0=1.0,
+                 cooling=0.995,
+                 steps: int = 1000,
+                 score_matrix=None,
+                 move: str = 'reassign',
+                 capacities=None,
+                 time_limit: float = None,
+                 patience: int = None,
+                 tol: float = 0.0,
+                 callback=None,
+                 seed=None,
+                 stats=None):
+    """
+    SA batch: B chain independen disimpan sebagai satu array (B, n) dan jalan
+    bareng dalam satu proses. Tiap iterasi tiap chain dapat satu move, delta
+    B move dihitung sekaligus lewat fancy indexing matriks skor, dan Metropolis
+    diterapkan per chain dengan suhunya sendiri. Cocok untuk banyak job matching
+    kecil (per kohort): hasil multi-start tanpa overhead proses.
+
+    Args:
+        df_students, df_tutors, weights: sama seperti run_sa
+        chains     : jumlah chain (B)
+        T0         : suhu awal, skalar atau satu per chain
+        cooling    : faktor pendinginan per iterasi, skalar atau satu per chain
+        steps      : batas jumlah iterasi (tiap iterasi = 1 move per chain; None = tanpa batas)
+        score_matrix: hasil build_score_matrix (atau build_lazy_score_matrix);
+                      kalau None dibangun sekali di sini
+        move       : 'reassign' atau 'swap', sama seperti run_sa
+        capacities : kapasitas tutor (int atau list); None = baca kolom 'kapasitas'
+                     di df_tutors. Beban per chain disimpan di array (B, m); reassign
+                     ke tutor penuh diganti swap dengan murid acak (sama seperti run_pt)
+        time_limit, patience, tol, callback: kriteria berhenti anytime, atas best
+                     gabungan semua chain
+        seed       : seed (int/SeedSequence) atau numpy Generator; None = acak dari OS
+        stats      : dict opsional, diisi 'iterations', 'evaluations' (chains per
+                     iterasi), 'accepted', 'acceptance_ratio', 'improvements',
+                     'trajectory', 'elapsed' (plus 'cache' kalau matriksnya lazy)
+
+    Returns:
+        sama seperti run_sa, plus 'chain_stats' = {'mean','std','min','max'}
+        total_score best per chain
+    """
+    if steps is None and time_limit is None and patience is None:
+        raise ValueError("Minimal salah satu dari steps, time_limit, atau patience harus diisi")
+    if chains < 1:
+        raise ValueError("chains minimal 1")
+    if score_matrix is None:
+        score_matrix = build_score_matrix(df_students, df_tutors, weights)
+    if move not in ('reassign', 'swap'):
+        raise ValueError(f"move harus 'reassign' atau 'swap', bukan {move!r}")
+    score = score_matrix['score']
+    n, m = score.shape
+    if move == 'swap' and n < 2:
+        raise ValueError("move 'swap' butuh minimal 2 murid")
+    if capacities is None:
+        capacities = tutor_capacities(df_tutors)
+    capacities = normalize_capacities(capacities, m)
+    T = per_chain(T0, chains, 'T0')
+    cool = per_chain(cooling, chains, 'cooling')
+    rng = np.random.default_rng(seed)
+    rows = np.arange(chains)
+    students = np.arange(n)
+
+    # Inisialisasi acak tiap chain; swap mulai dari matching 1:1 kalau tutor cukup
+    if capacities is not None:
+        caps = np.asarray(capacities, dtype=np.int64)
+        slots = np.repeat(np.arange(m), caps)
+        if len(slots) < n:
+            raise ValueError(f"Total kapasitas tutor ({len(slots)}) kurang dari jumlah murid ({n})")
+        curr = rng.permuted(np.tile(slots, (chains, 1)), axis=1)[:, :n]
+        groups = ChainMembers(curr, caps)
+        open_tutors = np.flatnonzero(caps > 0)
+    elif move == 'swap' and m >= n:
+        curr = rng.permuted(np.tile(np.arange(m), (chains, 1)), axis=1)[:, :n]
+    else:
+        curr = rng.integers(0, m, size=(chains, n))
+    totals = score[students, curr].sum(axis=1)
+    journal = ChainJournal(curr, totals)
+    b = int(totals.argmax())
+    best_score = totals[b]
+    accepted = 0
+
+    start = time.perf_counter()
+    budget = Budget(steps, time_limit, patience, tol, callback,
+                    trace=stats is not None).start(best_score)
+    step = 0
+    while not budget.exhausted():
+        i = rng.integers(0, n, chains)
+        if move == 'swap':
+            j = (i + rng.integers(1, n, chains)) % n
+            a, c = curr[rows, i], curr[rows, j]
+            delta = (score[i, c] + score[j, a]) - (score[i, a] + score[j, c])
+        elif capacities is not None:
+            t = open_tutors[rng.integers(0, len(open_tutors), chains)]
+            a = curr[rows, i]
+            full = groups.full(rows, a, t)
+            # Tutor t penuh: tukar dengan salah satu muridnya supaya beban tetap
+            j = groups.pick(rows, t, rng.random(chains))
+            c = curr[rows, j]
+            delta = np.where(full,
+                             (score[i, c] + score[j, a]) - (score[i, a] + score[j, c]),
+                             score[i, t] - score[i, a])
+        else:
+            t = rng.integers(0, m, chains)
+            a = curr[rows, i]
+            delta = score[i, t] - score[i, a]
+
+        # Metropolis per chain, masing-masing dengan suhunya sendiri
+        with np.errstate(over='ignore', divide='ignore', invalid='ignore'):
+            accept = (delta > 0) | ((T > 0) & (rng.random(chains) < np.exp(delta / T)))
+        r = rows[accept]
+        if len(r):
+            accepted += len(r)
+            if move == 'swap':
+                curr[r, i[accept]], curr[r, j[accept]] = c[accept], a[accept]
+                if capacities is not None:
+                    groups.swap(r, i[accept], j[accept], a[accept], c[accept])
+                journal.record(step, r, i[accept], a[accept], j[accept], c[accept])
+            elif capacities is not None:
+                sw = accept & full
+                re = accept & ~full
+                rs, rr = rows[sw], rows[re]
+                curr[rs, i[sw]], curr[rs, j[sw]] = c[sw], a[sw]
+                curr[rr, i[re]] = t[re]
+                groups.swap(rs, i[sw], j[sw], a[sw], c[sw])
+                groups.move(rr, i[re], a[re], t[re])
+                # Reassign dicatat sebagai pasangan (i, a) dobel biar satu format dengan swap
+                journal.record(step, np.concatenate([rs, rr]),
+                               np.concatenate([i[sw], i[re]]), np.concatenate([a[sw], a[re]]),
+                               np.concatenate([j[sw], i[re]]), np.concatenate([c[sw], a[re]]))
+            else:
+                curr[r, i[accept]] = t[accept]
+                journal.record(step, r, i[accept], a[accept], i[accept], a[accept])
+            totals[r] += delta[accept]
+            up = r[totals[r] > journal.totals[r]]
+            if len(up):
+                journal.improve(step, up, totals[up])
+                k = up[int(totals[up].argmax())]
+                if totals[k] > best_score:
+                    best_score = totals[k]
+                    budget.improved(best_score, curr[k].tolist)
+            if len(journal.entries) >= n:
+                journal.flush(curr, step)
+
+        T *= cool
+        step += 1
+        budget.tick()
+
+    best = journal.flush(curr, step)
+    # Skor akhir dihitung ulang penuh supaya ga kebawa drift float dari delta
+    chain_scores = score[students, best].sum(axis=1)
+    b = int(chain_scores.argmax())
+    best_assignment = best[b].tolist()
+    best_fit = compute_fitness(best_assignment, df_students, df_tutors, weights, score_matrix)
+    exec_time = time.perf_counter() - start
+    if stats is not None:
+        iterations = budget.iteration
+        evaluations = iterations * chains
+        stats.update(iterations=iterations,
+                     evaluations=evaluations,
+                     accepted=accepted,
+                     acceptance_ratio=accepted / evaluations if evaluations else 0.0,
+                     improvements=len(budget.trajectory) - 1,
+                     trajectory=budget.trajectory,
+                     elapsed=exec_time)
+        if is_lazy(score_matrix):
+            stats['cache'] = score_matrix['lazy'].cache_info()
+    return {
+        'best_assignment': best_assignment,
+        'best_fitness'   : best_fit,
+        'exec_time'      : exec_time,
+        'deterministic'  : seed is not None,
+        'iterations'     : budget.iteration,
+        'stop_reason'    : budget.stop_reason,
+        'chain_stats'    : {
+            'mean': float(chain_scores.mean()),
+            'std' : float(chain_scores.std()),
+            'min' : float(chain_scores.min()),
+            'max' : float(chain_scores.max())
+        }
+    }
@@ -0,0 +1,97 @@
+# budget.py
+
+import math
+import time
+
+class Budget:
+    """
+    Kriteria berhenti untuk loop anytime: batas iterasi, batas waktu, dan plateau
+    (best ga naik selama sekian iterasi). Tiap incumbent baru bisa dilaporkan lewat
+    callback, jadi pemanggil selalu punya solusi terbaik sejauh ini.
+
+    Args:
+        max_iter  : batas iterasi (None = tanpa batas)
+        time_limit: batas waktu dalam detik (None = tanpa batas)
+        patience  : berhenti kalau selama sekian iterasi best ga naik lebih dari tol
+        tol       : kenaikan minimum yang dihitung perbaikan untuk patience
+        callback  : callback(info) tiap best baru, info = {'assignment', 'total_score',
+                    'iteration', 'elapsed'}; return True = minta berhenti
+        check_every: jam dicek tiap sekian iterasi supaya perf_counter ga dipanggil tiap langkah
+                    (loop yang iterasinya mahal, mis. generasi GA, pakai 1)
+        trace     : simpan lintasan best (iteration, elapsed, total_score) di self.trajectory
+        tick_times: simpan durasi tiap tick (detik) di self.tick_times
+
+    Satu-satunya salinan; GA memakainya lewat ga/budget.py.
+    """
+
+    def __init__(self, max_iter=None, time_limit=None, patience=None, tol: float = 0.0,
+                 callback=None, check_every: int = 32, trace: bool = False, tick_times: bool = False):
+        if time_limit is not None and time_limit < 0:
+            raise ValueError("time_limit ga boleh negatif")
+        if patience is not None and patience < 1:
+            raise ValueError("patience minimal 1")
+        self.max_iter = max_iter
+        self.time_limit = time_limit
+        self.patience = patience
+        self.tol = tol
+        self.callback = callback
+        self.check_every = max(1, check_every)
+        self.trace = trace
+        self.record_ticks = tick_times
+        self.start(-math.inf)
+
+    def start(self, best_score: float):
+        """Mulai hitung dari sekarang dengan skor awal best_score."""
+        self.t0 = time.perf_counter()
+        self.deadline = math.inf if self.time_limit is None else self.t0 + self.time_limit
+        self.iteration = 0
+        self.plateau_ref = best_score
+        self.plateau_start = 0
+        self.stop_reason = None
+        self.trajectory = None
+        self.tick_times = None
+        if self.trace:
+            self.trajectory = [(0, 0.0, float(best_score))] if best_score > -math.inf else []
+        if self.record_ticks:
+            self.tick_times = []
+            self.last_tick = self.t0
+        return self
+
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.t0
+
+    def remaining(self) -> float:
+        """Sisa detik sampai deadline (inf kalau ga ada time_limit)."""
+        return self.deadline - time.perf_counter()
+
+    def improved(self, best_score: float, incumbent):
+        """Laporkan best baru; incumbent = callable yang mengembalikan assignment-nya."""
+        if best_score > self.plateau_ref + self.tol:
+            self.plateau_ref = best_score
+            self.plateau_start = self.iteration
+        if self.trajectory is not None:
+            self.trajectory.append((self.iteration, self.elapsed(), float(best_score)))
+        if self.callback is not None:
+            info = {'assignment': incumbent(), 'total_score': float(best_score),
+                    'iteration': self.iteration, 'elapsed': self.elapsed()}
+            if self.callback(info):
+                self.stop_reason = 'callback'
+
+    def exhausted(self) -> bool:
+        """True kalau loop harus berhenti sebelum iterasi berikutnya (alasannya di stop_reason)."""
+        if self.stop_reason is not None:
+            return True
+        if self.max_iter is not None and self.iteration >= self.max_iter:
+            self.stop_reason = 'max_iter'
+        elif self.patience is not None and self.iteration - self.plateau_start >= self.patience:
+            self.stop_reason = 'plateau'
+        elif self.iteration % self.check_every == 0 and time.perf_counter() >= self.deadline:
+            self.stop_reason = 'time'
+        return self.stop_reason is not None
+
+    def tick(self, count: int = 1):
+        self.iteration += count
+        if self.tick_times is not None:
+            now = time.perf_counter()
+            self.tick_times.append(now - self.last_tick)
+            self.last_tick = now
@@ -1,6 +1,14 @@
 """
 Modul fitness untuk algoritma genetika dan simulated annealing di sistem matching Tutas.
 """
+from collections import OrderedDict
+import numpy as np
+import pandas as pd
+
+# Urutan penting: score_pair menjumlah skor berbobot dengan urutan ini
+CRITERIA = ('mata_kuliah', 'subbab', 'gaya_belajar', 'mode', 'waktu')
+# Kolom CSV murid yang fleksibel waktunya (waktu selalu dianggap cocok)
+FLEKS_COLUMN = 'fleksibel_waktu'
 
 def time_score(student_time: str, tutor_time: str, fleksibel: bool) -> float:
     """
@@ -14,7 +22,7 @@ def score_pair(s, t, weights):
     """
     Hitung skor total dan jumlah constraint yang terpenuhi buat 1 pasangan murid-tutor.
     s,t: Series pandas dengan kolom:
-        'mata_kuliah','subbab','gaya_belajar','mode','waktu','fleksibilitas_waktu'
+        'mata_kuliah','subbab','gaya_belajar','mode','waktu','fleksibel_waktu'
     weights: dict bobot untuk tiap constraint.
     Return:
       - total skor (float)
@@ -24,7 +32,7 @@ def score_pair(s, t, weights):
     topic_match  = 1 if s['subbab']        == t['subbab']        else 0
     style_match  = 1 if s['gaya_belajar']  == t['gaya_belajar']  else 0
     mode_match   = 1 if s['mode']          == t['mode']          else 0
-    fleks        = bool(s.get('fleksibilitas_waktu', False))
+    fleks        = bool(s.get(FLEKS_COLUMN, False))
     time_match   = 1 if (s['waktu'] == t['waktu'] or fleks) else 0
 
     total = (
@@ -38,16 +46,363 @@ def score_pair(s, t, weights):
     satisfied_count = subj_match + topic_match + style_match + mode_match + time_match
     return total, satisfied_count
 
-def compute_fitness(chromosome, df_students, df_tutors, weights):
+def _shared_codes(s_col, t_col):
+    """Kode integer satu kolom murid & tutor dengan vocab bersama; NaN = -1."""
+    if isinstance(s_col.dtype, pd.CategoricalDtype) and s_col.dtype == t_col.dtype:
+        # Kategori dengan vocab bersama (loader terenkode): langsung pakai kode integer
+        return s_col.cat.codes.to_numpy(), t_col.cat.codes.to_numpy()
+    codes, _ = pd.factorize(pd.concat([s_col, t_col], ignore_index=True))
+    return codes[:len(s_col)], codes[len(s_col):]
+
+def _match_matrix(s_col, t_col):
+    """
+    Perbandingan kategori secara vektor -> matriks bool (n_murid, n_tutor).
+    Nilai kosong (NaN) ga pernah dianggap cocok, sama kayak di score_pair.
+    """
+    s_codes, t_codes = _shared_codes(s_col, t_col)
+    s_codes = s_codes[:, None]
+    return (s_codes == t_codes[None, :]) & (s_codes >= 0)
+
+def _student_fleks(df_students):
+    if FLEKS_COLUMN in df_students:
+        return df_students[FLEKS_COLUMN].map(bool).to_numpy(dtype=bool)
+    return np.zeros(len(df_students), dtype=bool)
+
+def build_score_matrix(df_students, df_tutors, weights):
+    """
+    Hitung score_pair untuk semua pasangan murid-tutor sekaligus (sekali di awal).
+    df_students, df_tutors: DataFrame dengan kolom score_pair, index 0..n-1
+    weights: dict bobot per constraint
+
+    Returns dict:
+      - score           : ndarray float (n_murid, n_tutor), total skor score_pair
+      - satisfied       : ndarray int (n_murid, n_tutor), jumlah constraint terpenuhi
+      - num_constraints : len(weights)
+    """
+    n, m = len(df_students), len(df_tutors)
+    fleks = _student_fleks(df_students)
+
+    score     = np.zeros((n, m))
+    satisfied = np.zeros((n, m), dtype=np.int64)
+    for key in CRITERIA:
+        match = _match_matrix(df_students[key], df_tutors[key])
+        if key == 'waktu':
+            match |= fleks[:, None]
+        score     += weights[key] * match
+        satisfied += match
+
+    return {
+        'score': score,
+        'satisfied': satisfied,
+        'num_constraints': len(weights)
+    }
+
+# Default jumlah pasangan signature yang disimpan cache LazyScoreMatrix
+LAZY_CACHE_SIZE = 1 << 16
+
+class LazyScoreMatrix:
+    """
+    Skor murid-tutor yang dihitung saat diminta dari kode atribut, tanpa matriks
+    n×m (10^5 × 10^4 pasangan ga muat di memori). Memori O((n + m) · kriteria)
+    ditambah cache LRU terbatas.
+
+    Murid dengan tuple atribut (+ fleksibilitas waktu) sama berbagi satu signature,
+    begitu juga tutor, jadi cache dikunci per (signature murid, signature tutor) dan
+    satu entri dipakai semua pasangan dengan atribut yang sama. Nilainya identik
+    dengan build_score_matrix (urutan penjumlahan float-nya sama).
+
+    Akses lewat view 'score'/'satisfied' di dict hasil build_lazy_score_matrix:
+      view[i, t]            -> skalar, lewat cache
+      view[i][t]            -> sama, dipakai IncrementalFitness
+      view[rows, cols]      -> array (broadcast numpy), dihitung vektor tanpa cache
+    """
+
+    def __init__(self, df_students, df_tutors, weights, cache_size: int = LAZY_CACHE_SIZE):
+        if cache_size < 1:
+            raise ValueError("cache_size minimal 1")
+        n, m = len(df_students), len(df_tutors)
+        s_codes = np.empty((n, len(CRITERIA)), dtype=np.int64)
+        t_codes = np.empty((m, len(CRITERIA)), dtype=np.int64)
+        for k, key in enumerate(CRITERIA):
+            s_codes[:, k], t_codes[:, k] = _shared_codes(df_students[key], df_tutors[key])
+        fleks = _student_fleks(df_students)
+
+        # Signature: tuple atribut unik; murid ikut fleksibel_waktu
+        s_keys, s_sig = np.unique(np.column_stack([s_codes, fleks]), axis=0, return_inverse=True)
+        t_keys, t_sig = np.unique(t_codes, axis=0, return_inverse=True)
+        self.shape = (n, m)
+        self.s_codes, self.t_codes, self.fleks = s_codes, t_codes, fleks
+        self.s_sig = s_sig.ravel().tolist()
+        self.t_sig = t_sig.ravel().tolist()
+        self.s_keys = s_keys.tolist()
+        self.t_keys = t_keys.tolist()
+        self.weights = [float(weights[key]) for key in CRITERIA]
+        self.waktu = CRITERIA.index('waktu')
+        self.cache_size = cache_size
+        self.cache = OrderedDict()
+        self.hits = self.misses = self.evictions = 0
+
+    def _compute(self, s, t):
+        s_key, t_key = self.s_keys[s], self.t_keys[t]
+        score, satisfied = 0.0, 0
+        for k, w in enumerate(self.weights):
+            match = int(s_key[k] == t_key[k] and s_key[k] >= 0)
+            if k == self.waktu and s_key[-1]:
+                match = 1
+            score += w * match
+            satisfied += match
+        return score, satisfied
+
+    def pair(self, i, t):
+        """(skor, jumlah constraint terpenuhi) murid i dengan tutor t, lewat cache LRU."""
+        key = (self.s_sig[i], self.t_sig[t])
+        cache = self.cache
+        value = cache.get(key)
+        if value is not None:
+            self.hits += 1
+            cache.move_to_end(key)
+            return value
+        self.misses += 1
+        value = cache[key] = self._compute(*key)
+        if len(cache) > self.cache_size:
+            cache.popitem(last=False)
+            self.evictions += 1
+        return value
+
+    def gather(self, rows, cols):
+        """Skor & satisfied untuk indeks array (broadcast numpy), dihitung vektor tanpa cache."""
+        rows, cols = np.broadcast_arrays(np.asarray(rows), np.asarray(cols))
+        score = np.zeros(rows.shape)
+        satisfied = np.zeros(rows.shape, dtype=np.int64)
+        for k, w in enumerate(self.weights):
+            s = self.s_codes[rows, k]
+            match = (s == self.t_codes[cols, k]) & (s >= 0)
+            if k == self.waktu:
+                match |= self.fleks[rows]
+            score += w * match
+            satisfied += match
+        return score, satisfied
+
+    def cache_info(self):
+        """Statistik cache: hit/miss/eviction, hit rate, isi, dan jumlah signature unik."""
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'size': len(self.cache),
+            'capacity': self.cache_size,
+            'student_signatures': len(self.s_keys),
+            'tutor_signatures': len(self.t_keys),
+        }
+
+class _LazyView:
+    """Satu field LazyScoreMatrix (0 = score, 1 = satisfied) yang bisa di-index kayak ndarray."""
+
+    def __init__(self, lazy, field: int):
+        self.lazy = lazy
+        self.field = field
+        self.shape = lazy.shape
+        self.ndim = 2
+
+    def __getitem__(self, key):
+        if not isinstance(key, tuple):
+            return _LazyRow(self.lazy, key, self.field)
+        i, t = key
+        if np.ndim(i) == 0 and np.ndim(t) == 0:
+            return self.lazy.pair(i, t)[self.field]
+        return self.lazy.gather(i, t)[self.field]
+
+class _LazyRow:
+    __slots__ = ('lazy', 'i', 'field')
+
+    def __init__(self, lazy, i, field):
+        self.lazy, self.i, self.field = lazy, i, field
+
+    def __getitem__(self, t):
+        return self.lazy.pair(self.i, t)[self.field]
+
+def build_lazy_score_matrix(df_students, df_tutors, weights, cache_size: int = LAZY_CACHE_SIZE):
+    """
+    Pengganti build_score_matrix untuk instance besar: format dict-nya sama
+    ('score', 'satisfied', 'num_constraints') tapi isinya view LazyScoreMatrix,
+    plus 'lazy' = objeknya (cache_info() untuk statistik cache).
+    Bisa dipakai run_sa (backend numpy), run_pt, dan run_ga.
+    """
+    lazy = LazyScoreMatrix(df_students, df_tutors, weights, cache_size)
+    return {
+        'score': _LazyView(lazy, 0),
+        'satisfied': _LazyView(lazy, 1),
+        'num_constraints': len(weights),
+        'lazy': lazy
+    }
+
+def is_lazy(score_matrix) -> bool:
+    return 'lazy' in score_matrix
+
+# Default jumlah kandidat tutor per murid
+CANDIDATE_K = 20
+
+def _buckets(codes, tutors):
+    """Kode kategori -> array index tutor (urut naik); NaN (-1) ga masuk bucket."""
+    order = np.argsort(codes[tutors], kind='stable')
+    keys, starts = np.unique(codes[tutors][order], return_index=True)
+    groups = np.split(tutors[order], starts[1:])
+    return {int(c): g for c, g in zip(keys, groups) if c >= 0}
+
+def _signature_scores(s_keys, t_codes, weights, waktu):
+    """
+    Skor semua pasangan (signature murid × tutor): s_keys (G, kriteria + 1, kolom
+    terakhir fleksibilitas), t_codes (P, kriteria). Urutan penjumlahan sama dengan
+    build_score_matrix, jadi nilainya identik.
+    """
+    score = np.zeros((len(s_keys), len(t_codes)))
+    for k, w in enumerate(weights):
+        s = s_keys[:, k, None]
+        match = (s == t_codes[None, :, k]) & (s >= 0)
+        if k == waktu:
+            match |= s_keys[:, -1, None].astype(bool)
+        score += w * match
+    return score
+
+def _top_k(score, pool, k: int):
+    """
+    k kolom terbaik tiap baris, urut skor menurun; seri dipecah ke posisi kolom
+    kecil (pool urut naik = index tutor kecil), sama dengan argsort stable tapi
+    cuma partisi O(P) per baris ditambah sort k elemen.
+    """
+    kth = -np.partition(-score, k - 1, axis=1)[:, k - 1:k]
+    above = score > kth
+    tie = score == kth
+    need = k - above.sum(axis=1, keepdims=True)
+    pick = above | (tie & (np.cumsum(tie, axis=1) <= need))
+    cols = np.nonzero(pick)[1].reshape(len(score), k)
+    vals = np.take_along_axis(score, cols, axis=1)
+    order = np.argsort(-vals, axis=1, kind='stable')
+    return pool[np.take_along_axis(cols, order, axis=1)], np.take_along_axis(vals, order, axis=1)
+
+# Batas sel (signature × tutor pool) yang dinilai sekaligus di build_candidates
+CANDIDATE_CHUNK = 1 << 18
+
+def build_candidates(df_students, df_tutors, weights, k: int = CANDIDATE_K, capacities=None):
+    """
+    Daftar kandidat top-k tutor per murid, urut score_pair menurun (seri: index
+    tutor kecil dulu), tanpa scan n×m. Tutor dikelompokkan per mata_kuliah dan
+    per subbab; murid dikelompokkan per signature atribut (lihat LazyScoreMatrix),
+    dan semua signature dengan pasangan (mata_kuliah, subbab) sama dinilai sekaligus
+    dulu cuma terhadap tutor sebucket (mata_kuliah ATAU subbab sama). Tutor di luar
+    pool paling banter dapat jumlah bobot kriteria lain, jadi signature yang skor
+    ke-k-nya belum melewati batas itu (atau pool-nya kurang dari k) dinilai ulang
+    terhadap semua tutor; hasilnya tetap top-k eksak seperti argsort baris
+    build_score_matrix.
+
+    capacities: kapasitas tutor (int/list); tutor berkapasitas 0 ga pernah jadi kandidat.
+
+    Returns dict:
+      - tutors : ndarray int (n, k), index tutor kandidat tiap murid
+      - score  : ndarray float (n, k), skor pasangannya (sama dengan build_score_matrix)
+      - k      : jumlah kandidat per murid (dipotong ke jumlah tutor yang bisa dipakai)
+    """
+    if k < 1:
+        raise ValueError("k minimal 1")
+    lazy = LazyScoreMatrix(df_students, df_tutors, weights, cache_size=1)
+    m = lazy.shape[1]
+    tutors = np.arange(m)
+    capacities = normalize_capacities(capacities, m)
+    if capacities is not None:
+        tutors = tutors[np.asarray(capacities) > 0]
+    if len(tutors) == 0:
+        raise ValueError("Ga ada tutor yang bisa jadi kandidat")
+    k = min(k, len(tutors))
+
+    subj, topic = CRITERIA.index('mata_kuliah'), CRITERIA.index('subbab')
+    by_subj  = _buckets(lazy.t_codes[:, subj], tutors)
+    by_topic = _buckets(lazy.t_codes[:, topic], tutors)
+    empty = tutors[:0]
+    # Skor maksimum tutor yang ga cocok mata_kuliah maupun subbab (toleransi buat beda urutan jumlah float)
+    off_pool = sum(max(w, 0.0) for c, w in enumerate(lazy.weights) if c not in (subj, topic)) + 1e-9
+
+    # Signature murid dikelompokkan per bucket (mata_kuliah, subbab)
+    s_keys = np.asarray(lazy.s_keys, dtype=np.int64).reshape(len(lazy.s_keys), len(CRITERIA) + 1)
+    groups = {}
+    for s, (c_subj, c_topic) in enumerate(s_keys[:, [subj, topic]].tolist()):
+        groups.setdefault((c_subj, c_topic), []).append(s)
+
+    sig_tutors = np.empty((len(s_keys), k), dtype=np.int64)
+    sig_score  = np.empty((len(s_keys), k))
+
+    def rank(sigs, pool):
+        t_codes = lazy.t_codes[pool]
+        step = max(1, CANDIDATE_CHUNK // len(pool))
+        for a in range(0, len(sigs), step):
+            rows = sigs[a:a + step]
+            score = _signature_scores(s_keys[rows], t_codes, lazy.weights, lazy.waktu)
+            sig_tutors[rows], sig_score[rows] = _top_k(score, pool, k)
+
+    for (c_subj, c_topic), sigs in groups.items():
+        pool = np.union1d(by_subj.get(c_subj, empty), by_topic.get(c_topic, empty))
+        sigs = np.asarray(sigs)
+        if len(pool) < k:
+            rank(sigs, tutors)
+            continue
+        rank(sigs, pool)
+        if len(pool) < len(tutors):
+            redo = sigs[sig_score[sigs, -1] <= off_pool]
+            if len(redo):
+                rank(redo, tutors)
+
+    s_sig = np.asarray(lazy.s_sig, dtype=np.int64)
+    return {
+        'tutors': sig_tutors[s_sig],
+        'score': sig_score[s_sig],
+        'k': k
+    }
+
+CAPACITY_COLUMN = 'kapasitas'
+
+def normalize_capacities(capacities, m: int):
+    """
+    Samakan format kapasitas tutor: None (tanpa batas) tetap None,
+    int berlaku untuk semua tutor, selain itu list panjang m.
+    """
+    if capacities is None:
+        return None
+    if isinstance(capacities, (int, np.integer)):
+        caps = [int(capacities)] * m
+    else:
+        caps = [int(c) for c in capacities]
+    if len(caps) != m:
+        raise ValueError(f"Kapasitas harus ada untuk {m} tutor, bukan {len(caps)}")
+    if any(c < 0 for c in caps):
+        raise ValueError("Kapasitas tutor ga boleh negatif")
+    return caps
+
+def tutor_capacities(df_tutors, default: int = 1):
+    """
+    Kapasitas tiap tutor (jumlah murid maksimum) dari kolom 'kapasitas'.
+    Kalau kolomnya ga ada -> None (tutor boleh dipakai berapa pun, perilaku lama);
+    sel kosong diisi `default`.
+    """
+    if df_tutors is None or CAPACITY_COLUMN not in df_tutors:
+        return None
+    caps = pd.to_numeric(df_tutors[CAPACITY_COLUMN].astype(object)).fillna(default)
+    return normalize_capacities(caps.astype(np.int64).tolist(), len(df_tutors))
+
+def compute_fitness(chromosome, df_students, df_tutors, weights, score_matrix=None):
     """
     chromosome: list tutor_index per student_index
     df_students, df_tutors: DataFrame dengan index 0..n-1
     weights: dict bobot per constraint (jumlah kunci 5)
+    score_matrix: opsional, hasil build_score_matrix (tanpa lookup .loc)
 
     Returns dict:
       - total_score   : float (jumlah skor semua pasangan)
       - pct_satisfied : float (rata-rata persentase constraint terpenuhi)
     """
+    if score_matrix is not None:
+        return _fitness_from_matrix(chromosome, score_matrix)
+
     total_score = 0.0
     total_pct   = 0.0
     num_constraints = len(weights)    # misal 5
@@ -65,3 +420,114 @@ def compute_fitness(chromosome, df_students, df_tutors, weights):
         'total_score': total_score,
         'pct_satisfied': avg_pct_satisfied
     }
+
+def _fitness_from_matrix(chromosome, score_matrix):
+    n = len(chromosome)
+    if n == 0:
+        return {'total_score': 0.0, 'pct_satisfied': 0.0}
+    rows = np.arange(n)
+    total_score = float(score_matrix['score'][rows, chromosome].sum())
+    total_sat   = int(score_matrix['satisfied'][rows, chromosome].sum())
+    return {
+        'total_score': total_score,
+        'pct_satisfied': total_sat / score_matrix['num_constraints'] / n
+    }
+
+class IncrementalFitness:
+    """
+    Fitness yang di-update per langkah: simpan total skor & jumlah constraint
+    terpenuhi, jadi delta satu move cukup O(1) tanpa hitung ulang semua murid.
+
+    Move yang didukung:
+      - reassign: murid i pindah ke tutor t
+      - swap    : murid i dan j tukeran tutor
+
+    Kalau capacities diisi, beban tiap tutor (loads) dan daftar muridnya (members)
+    ikut di-update per move, jadi cek kapasitas juga O(1), ga perlu hitung ulang.
+    """
+
+    def __init__(self, assignment, score_matrix, capacities=None):
+        # list-of-list lebih cepat daripada indexing skalar numpy di loop Python;
+        # matriks lazy dipakai langsung (score[i][t] lewat cache LRU)
+        if is_lazy(score_matrix):
+            self.score     = score_matrix['score']
+            self.satisfied = score_matrix['satisfied']
+        else:
+            self.score     = score_matrix['score'].tolist()
+            self.satisfied = score_matrix['satisfied'].tolist()
+        self.num_constraints = score_matrix['num_constraints']
+        self.assignment = list(assignment)
+        self.total_score = 0.0
+        self.total_sat   = 0
+        for i, t in enumerate(self.assignment):
+            self.total_score += self.score[i][t]
+            self.total_sat   += self.satisfied[i][t]
+
+        self.capacities = capacities
+        if capacities is not None:
+            m = len(capacities)
+            self.loads   = [0] * m
+            self.members = [[] for _ in range(m)]
+            self.pos     = [0] * len(self.assignment)   # posisi murid di members tutornya
+            for i, t in enumerate(self.assignment):
+                self.pos[i] = len(self.members[t])
+                self.members[t].append(i)
+                self.loads[t] += 1
+            over = [t for t in range(m) if self.loads[t] > capacities[t]]
+            if over:
+                raise ValueError(f"Assignment awal melebihi kapasitas tutor {over}")
+
+    def is_full(self, t):
+        return self.capacities is not None and self.loads[t] >= self.capacities[t]
+
+    def member(self, t, k):
+        """Murid ke-k (0 <= k < loads[t]) yang lagi pegang tutor t."""
+        return self.members[t][k]
+
+    def delta_reassign(self, i, t):
+        row = self.score[i]
+        return row[t] - row[self.assignment[i]]
+
+    def apply_reassign(self, i, t, delta=None):
+        old = self.assignment[i]
+        if delta is None:
+            delta = self.score[i][t] - self.score[i][old]
+        self.total_score += delta
+        self.total_sat   += self.satisfied[i][t] - self.satisfied[i][old]
+        self.assignment[i] = t
+        if self.capacities is not None and t != old:
+            # Keluarkan i dari members[old] (tukar dengan elemen terakhir), masukkan ke members[t]
+            group = self.members[old]
+            last = group.pop()
+            if last != i:
+                group[self.pos[i]] = last
+                self.pos[last] = self.pos[i]
+            self.pos[i] = len(self.members[t])
+            self.members[t].append(i)
+            self.loads[old] -= 1
+            self.loads[t]   += 1
+
+    def delta_swap(self, i, j):
+        a, b = self.assignment[i], self.assignment[j]
+        return (self.score[i][b] + self.score[j][a]) - (self.score[i][a] + self.score[j][b])
+
+    def apply_swap(self, i, j, delta=None):
+        a, b = self.assignment[i], self.assignment[j]
+        if delta is None:
+            delta = self.delta_swap(i, j)
+        self.total_score += delta
+        self.total_sat   += (self.satisfied[i][b] + self.satisfied[j][a]
+                             - self.satisfied[i][a] - self.satisfied[j][b])
+        self.assignment[i], self.assignment[j] = b, a
+        if self.capacities is not None and a != b:
+            # Beban tetap, cuma isi members yang tukeran posisi
+            self.members[a][self.pos[i]] = j
+            self.members[b][self.pos[j]] = i
+            self.pos[i], self.pos[j] = self.pos[j], self.pos[i]
+
+    def fitness(self):
+        n = len(self.assignment)
+        return {
+            'total_score': self.total_score,
+            'pct_satisfied': (self.total_sat / self.num_constraints / n) if n > 0 else 0.0
+        }
@@ -0,0 +1,138 @@
+# kernels.py
+
+"""
+Backend kompilasi (numba) untuk loop move/accept SA. State-nya array integer
+(assignment, beban & daftar murid per tutor), angka acaknya blok yang sama persis
+dengan loop Python (sa.move_blocks), jadi untuk seed yang sama hasilnya identik.
+
+numba opsional: kalau ga terpasang, backend 'numba' balik ke 'numpy' (loop Python
+di sa.py) dengan warning, dan kernel di sini tetap bisa dipanggil sebagai Python biasa.
+"""
+import math
+import warnings
+import numpy as np
+
+try:
+    from numba import njit
+    HAVE_NUMBA = True
+except ImportError:
+    HAVE_NUMBA = False
+
+    def njit(*args, **kwargs):
+        """Pengganti decorator numba: fungsi dipakai apa adanya."""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda fn: fn
+
+BACKENDS = ('numpy', 'numba', 'auto')
+
+# Jenis move untuk anneal_block
+MOVE_SWAP     = 0
+MOVE_REASSIGN = 1
+
+def resolve_backend(backend: str) -> str:
+    """'auto' -> 'numba' kalau terpasang; 'numba' tanpa numba -> 'numpy' + warning."""
+    if backend not in BACKENDS:
+        raise ValueError(f"backend harus salah satu dari {BACKENDS}, bukan {backend!r}")
+    if backend == 'auto':
+        return 'numba' if HAVE_NUMBA else 'numpy'
+    if backend == 'numba' and not HAVE_NUMBA:
+        warnings.warn("numba tidak terpasang, backend SA pakai 'numpy'", RuntimeWarning, stacklevel=3)
+        return 'numpy'
+    return backend
+
+@njit(cache=True)
+def anneal_block(score, assign, best, caps, loads, members, offsets, pos,
+                 ii, other, uu, vv, start, count, mode, capped,
+                 T, cooling, total, best_score, stop_on_improve):
+    """
+    Jalankan sampai `count` langkah SA pakai angka acak ii/other/uu/vv[start:].
+    Logikanya sama persis dengan loop di run_sa + IncrementalFitness, termasuk
+    urutan operasi float-nya. assign/best/loads/members/pos di-update in-place;
+    members[offsets[t]:offsets[t] + loads[t]] = murid tutor t (kalau capped).
+
+    Returns:
+        (langkah yang jalan, T, total, best_score, ada best baru, move yang diterima)
+        Kalau stop_on_improve, berhenti tepat setelah langkah yang menghasilkan best baru.
+    """
+    improved = False
+    accepted = 0
+    k = 0
+    while k < count:
+        s = start + k
+        i = ii[s]
+        a = assign[i]
+        j = -1
+        b = -1
+        t = -1
+        swap = mode == MOVE_SWAP
+        if swap:
+            j = other[s]
+            b = assign[j]
+        else:
+            t = other[s]
+            if capped and t != a and loads[t] >= caps[t]:
+                # Tutor t penuh: tukar dengan salah satu muridnya supaya beban tetap
+                j = members[offsets[t] + int(vv[s] * loads[t])]
+                b = t
+                swap = True
+        if swap:
+            delta = (score[i, b] + score[j, a]) - (score[i, a] + score[j, b])
+        else:
+            delta = score[i, t] - score[i, a]
+
+        # Metropolis criterion
+        if delta > 0 or (T > 0 and uu[s] < math.exp(delta / T)):
+            total += delta
+            accepted += 1
+            if swap:
+                assign[i] = b
+                assign[j] = a
+                if capped and a != b:
+                    members[offsets[a] + pos[i]] = j
+                    members[offsets[b] + pos[j]] = i
+                    p = pos[i]
+                    pos[i] = pos[j]
+                    pos[j] = p
+            else:
+                assign[i] = t
+                if capped and t != a:
+                    # Keluarkan i dari members[a] (tukar dengan elemen terakhir), masukkan ke members[t]
+                    last = members[offsets[a] + loads[a] - 1]
+                    if last != i:
+                        members[offsets[a] + pos[i]] = last
+                        pos[last] = pos[i]
+                    pos[i] = loads[t]
+                    members[offsets[t] + loads[t]] = i
+                    loads[a] -= 1
+                    loads[t] += 1
+            if total > best_score:
+                best_score = total
+                best[:] = assign
+                improved = True
+
+        T *= cooling
+        k += 1
+        if improved and stop_on_improve:
+            break
+    return k, T, total, best_score, improved, accepted
+
+def kernel_state(state, capacities):
+    """
+    Salin IncrementalFitness ke array int64 untuk anneal_block:
+    (assign, caps, loads, members, offsets, pos). Urutan members sama dengan state,
+    jadi pilihan murid di tutor penuh juga sama.
+    """
+    assign = np.array(state.assignment, dtype=np.int64)
+    if capacities is None:
+        empty = np.zeros(0, dtype=np.int64)
+        return assign, empty, empty, empty, empty, empty
+    caps    = np.asarray(capacities, dtype=np.int64)
+    offsets = np.zeros(len(caps), dtype=np.int64)
+    offsets[1:] = np.cumsum(caps)[:-1]
+    members = np.full(int(caps.sum()), -1, dtype=np.int64)
+    for t, group in enumerate(state.members):
+        members[offsets[t]:offsets[t] + len(group)] = group
+    loads = np.array(state.loads, dtype=np.int64)
+    pos   = np.array(state.pos, dtype=np.int64)
+    return assign, caps, loads, members, offsets, pos
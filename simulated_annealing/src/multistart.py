@@ -0,0 +1,135 @@
+# multistart.py
+
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+import numpy as np
+from fitness import build_score_matrix, is_lazy, tutor_capacities
+from sa import run_sa
+
+# Diisi di tiap worker oleh _attach_worker
+_worker_matrix = None
+_worker_shm = []
+
+def share_score_matrix(score_matrix):
+    """
+    Salin matriks skor ke shared memory supaya worker ga perlu pickle DataFrame/array.
+
+    Returns:
+        handle : dict kecil (nama blok, shape, dtype) yang aman dikirim ke worker
+        blocks : list SharedMemory; pemanggil wajib close() + unlink() setelah selesai
+    """
+    handle = {'num_constraints': score_matrix['num_constraints'], 'arrays': {}}
+    blocks = []
+    for key in ('score', 'satisfied'):
+        arr = np.ascontiguousarray(score_matrix[key])
+        shm = shared_memory.SharedMemory(create=True, size=max(arr.nbytes, 1))
+        np.ndarray(arr.shape, dtype=arr.dtype, buffer=shm.buf)[...] = arr
+        handle['arrays'][key] = (shm.name, arr.shape, arr.dtype.str)
+        blocks.append(shm)
+    return handle, blocks
+
+def attach_score_matrix(handle):
+    """
+    Buka matriks skor dari handle share_score_matrix (tanpa copy).
+
+    Returns:
+        (score_matrix, blocks) — blocks harus tetap hidup selama matriks dipakai
+    """
+    score_matrix = {'num_constraints': handle['num_constraints']}
+    blocks = []
+    for key, (name, shape, dtype) in handle['arrays'].items():
+        # Worker pakai resource_tracker yang sama dengan induk, jadi unlink tetap sekali di induk
+        shm = shared_memory.SharedMemory(name=name)
+        score_matrix[key] = np.ndarray(shape, dtype=np.dtype(dtype), buffer=shm.buf)
+        blocks.append(shm)
+    return score_matrix, blocks
+
+def _attach_worker(handle):
+    global _worker_matrix, _worker_shm
+    _worker_matrix, _worker_shm = attach_score_matrix(handle)
+
+def _run_chain(chain_seed, sa_params):
+    res = run_sa(None, None, None, score_matrix=_worker_matrix, seed=chain_seed, **sa_params)
+    return {
+        'seed'           : chain_seed,
+        'best_assignment': res['best_assignment'],
+        'best_fitness'   : res['best_fitness'],
+        'exec_time'      : res['exec_time']
+    }
+
+def chain_seeds(seed, chains: int):
+    """Seed independen per chain dari SeedSequence (None = acak dari OS)."""
+    children = np.random.SeedSequence(seed).spawn(chains)
+    return [int(c.generate_state(1)[0]) for c in children]
+
+def run_sa_multistart(df_students, df_tutors, weights,
+                      chains: int = 4,
+                      workers: int = None,
+                      seed: int = None,
+                      score_matrix=None,
+                      **sa_params):
+    """
+    Multi-start SA: K chain independen (seed beda-beda) dijalankan paralel
+    di ProcessPoolExecutor, matriks skor dibagi lewat shared memory.
+
+    Args:
+        df_students, df_tutors, weights: sama seperti run_sa
+        chains      : jumlah chain independen (K)
+        workers     : jumlah proses, default min(chains, os.cpu_count())
+        seed        : seed induk; None = hasil ga bisa diulang
+        score_matrix: hasil build_score_matrix; kalau None dibangun sekali di sini
+        sa_params   : diteruskan ke run_sa (T0, cooling, steps, move, capacities,
+                      time_limit/patience per chain; callback dipanggil di proses worker);
+                      capacities None = baca kolom 'kapasitas' di df_tutors di sini,
+                      karena worker cuma dapat matriks skor
+
+    Returns:
+        {
+          'best_assignment': List[int],   # dari chain terbaik
+          'best_fitness'   : {'total_score':…, 'pct_satisfied':…},
+          'exec_time'      : float,       # wall-clock semua chain
+          'deterministic'  : bool,        # True kalau seed diisi
+          'chains'         : List[dict],  # per chain: seed, best_fitness, exec_time
+          'chain_stats'    : {'mean':…, 'std':…, 'min':…, 'max':…}  # total_score antar chain
+        }
+    """
+    if score_matrix is None:
+        score_matrix = build_score_matrix(df_students, df_tutors, weights)
+    if is_lazy(score_matrix):
+        raise ValueError("Multi-start butuh matriks skor dense untuk shared memory; pakai run_sa per chain")
+    if sa_params.get('capacities') is None:
+        sa_params['capacities'] = tutor_capacities(df_tutors)
+    if workers is None:
+        workers = min(chains, os.cpu_count() or 1)
+    seeds = chain_seeds(seed, chains)
+
+    start = time.perf_counter()
+    handle, blocks = share_score_matrix(score_matrix)
+    try:
+        with ProcessPoolExecutor(max_workers=workers,
+                                 initializer=_attach_worker,
+                                 initargs=(handle,)) as pool:
+            results = list(pool.map(_run_chain, seeds, [sa_params] * chains))
+    finally:
+        for shm in blocks:
+            shm.close()
+            shm.unlink()
+    exec_time = time.perf_counter() - start
+
+    scores = np.array([r['best_fitness']['total_score'] for r in results])
+    best = results[int(scores.argmax())]
+    return {
+        'best_assignment': best['best_assignment'],
+        'best_fitness'   : best['best_fitness'],
+        'exec_time'      : exec_time,
+        'deterministic'  : seed is not None,
+        'chains'         : [{k: r[k] for k in ('seed', 'best_fitness', 'exec_time')} for r in results],
+        'chain_stats'    : {
+            'mean': float(scores.mean()),
+            'std' : float(scores.std()),
+            'min' : float(scores.min()),
+            'max' : float(scores.max())
+        }
+    }
@@ -1,14 +1,202 @@
 # sa.py
 
-import random
+import math
 import time
 import numpy as np
-from fitness import compute_fitness
+import kernels
+from budget import Budget
+from fitness import (IncrementalFitness, build_score_matrix, compute_fitness, is_lazy,
+                     normalize_capacities, tutor_capacities)
+
+# Jumlah langkah yang angka acaknya diambil sekaligus
+RNG_BLOCK = 4096
+
+def capacity_start(n: int, capacities, rng=None):
+    """Assignment awal acak yang patuh kapasitas: ambil n slot tutor tanpa pengembalian."""
+    rng = np.random.default_rng(rng)
+    slots = np.repeat(np.arange(len(capacities)), np.asarray(capacities, dtype=np.int64))
+    if len(slots) < n:
+        raise ValueError(f"Total kapasitas tutor ({len(slots)}) kurang dari jumlah murid ({n})")
+    return rng.permutation(slots)[:n].tolist()
+
+def move_blocks(rng, n: int, m: int, move: str, open_tutors=None, block: int = RNG_BLOCK,
+                candidates=None):
+    """
+    Angka acak loop SA per blok numpy: (i, j_atau_t, u, v) masing-masing array
+    sepanjang block — murid i, pasangan swap j (≠ i) atau tutor tujuan t,
+    uniform untuk Metropolis, dan uniform untuk milih murid di tutor penuh.
+    candidates: (indptr, indices, group) dari candidate_arrays; t diambil acak dari
+    kandidat murid i.
+    """
+    while True:
+        i = rng.integers(0, n, block)
+        if move == 'swap':
+            other = (i + rng.integers(1, n, block)) % n
+        elif candidates is not None:
+            indptr, indices, group = candidates
+            g = group[i]
+            other = indices[indptr[g] + rng.integers(0, indptr[g + 1] - indptr[g])]
+        elif open_tutors is None:
+            other = rng.integers(0, m, block)
+        else:
+            other = open_tutors[rng.integers(0, len(open_tutors), block)]
+        u = rng.random(block)
+        v = rng.random(block) if open_tutors is not None else u
+        yield i, other, u, v
+
+def move_stream(rng, n: int, m: int, move: str, open_tutors=None, block: int = RNG_BLOCK,
+                candidates=None):
+    """move_blocks yang di-yield per langkah sebagai tuple Python (i, j_atau_t, u, v)."""
+    for i, other, u, v in move_blocks(rng, n, m, move, open_tutors, block, candidates):
+        yield from zip(i.tolist(), other.tolist(), u.tolist(), v.tolist())
+
+def candidate_arrays(candidates, n: int, capacities=None):
+    """
+    Samakan format kandidat jadi CSR (indptr, indices, group): kandidat murid i =
+    indices[indptr[group[i]]:indptr[group[i] + 1]]. Terima tabel (n, k) dari
+    build_candidates ({'tutors', ...}) atau TutorIndex.neighbours ({'indptr', 'indices', 'group'}).
+    """
+    if 'tutors' in candidates:
+        table = np.asarray(candidates['tutors'], dtype=np.int64)
+        if table.ndim != 2 or len(table) != n:
+            raise ValueError(f"candidates harus untuk {n} murid, bukan shape {table.shape}")
+        k = table.shape[1]
+        indptr, indices, group = np.arange(0, n * k + 1, k), table.ravel(), np.arange(n)
+    else:
+        indptr  = np.asarray(candidates['indptr'], dtype=np.int64)
+        indices = np.asarray(candidates['indices'], dtype=np.int64)
+        group   = np.asarray(candidates['group'], dtype=np.int64)
+        if len(group) != n:
+            raise ValueError(f"candidates harus untuk {n} murid, bukan {len(group)}")
+    if (np.diff(indptr)[group] == 0).any():
+        raise ValueError("Ada murid tanpa kandidat tutor")
+    if capacities is not None and (np.asarray(capacities)[indices] == 0).any():
+        raise ValueError("candidates berisi tutor kapasitas 0; bangun ulang dengan capacities")
+    return indptr, indices, group
+
+def _rewind(assignment, journal):
+    """Assignment sebelum move-move di journal (list (murid, tutor lama), urut waktu)."""
+    best = assignment.copy()
+    for i, t in reversed(journal):
+        best[i] = t
+    return best
+
+def _anneal_python(state, capacities, move, moves, budget, T, cooling):
+    """
+    Loop SA di Python atas IncrementalFitness; moves = move_stream.
+
+    Best ga di-copy tiap kali naik (O(n) per perbaikan, berat untuk n besar):
+    yang disimpan jurnal (murid, tutor lama) sejak best terakhir, dan best
+    direkonstruksi dari assignment sekarang. Jurnal yang lebih panjang dari n
+    dibekukan jadi satu copy, jadi biayanya tetap O(1) amortized per langkah.
+
+    Returns:
+        (best_assignment, best_score, jumlah move yang diterima)
+    """
+    n = len(state.assignment)
+    best_score = state.total_score
+    journal = []
+    frozen = None   # copy best kalau jurnal udah dibekukan
+    accepted = 0
+    while not budget.exhausted():
+        i, other, u, v = next(moves)
+        swap = move == 'swap'
+        if swap:
+            j = other
+            delta = state.delta_swap(i, j)
+        elif capacities is None:
+            t = other
+            delta = state.delta_reassign(i, t)
+        else:
+            t = other
+            if t != state.assignment[i] and state.is_full(t):
+                # Tutor t penuh: tukar dengan salah satu muridnya supaya beban tetap
+                j = state.member(t, int(v * state.loads[t]))
+                delta = state.delta_swap(i, j)
+                swap = True
+            else:
+                delta = state.delta_reassign(i, t)
+
+        # Metropolis criterion
+        if delta > 0 or (T > 0 and u < math.exp(delta / T)):
+            accepted += 1
+            if frozen is None:
+                journal.append((i, state.assignment[i]))
+                if swap:
+                    journal.append((j, state.assignment[j]))
+            if swap:
+                state.apply_swap(i, j, delta)
+            else:
+                state.apply_reassign(i, t, delta)
+            if state.total_score > best_score:
+                best_score = state.total_score
+                journal.clear()
+                frozen = None
+                budget.improved(best_score, state.assignment.copy)
+            elif len(journal) > n:
+                frozen = _rewind(state.assignment, journal)
+                journal.clear()
+
+        T *= cooling
+        budget.tick()
+    best = frozen if frozen is not None else _rewind(state.assignment, journal)
+    return best, best_score, accepted
+
+def _anneal_compiled(state, score, capacities, move, blocks, budget, T, cooling):
+    """
+    Loop SA lewat kernels.anneal_block. Kernel dipanggil per potongan sampai titik
+    cek budget berikutnya (batas iterasi, patience, jam), dan berhenti di tiap best
+    baru kalau ada callback/patience/trace, jadi langkah dan berhentinya sama dengan loop Python.
+
+    Returns:
+        (best_assignment, best_score, jumlah move yang diterima)
+    """
+    assign, caps, loads, members, offsets, pos = kernels.kernel_state(state, capacities)
+    best = assign.copy()
+    total = best_score = state.total_score
+    mode = kernels.MOVE_SWAP if move == 'swap' else kernels.MOVE_REASSIGN
+    stop_on_improve = budget.callback is not None or budget.patience is not None or budget.trace
+    accepted = 0
+    ii = other = uu = vv = None
+    start = RNG_BLOCK
+    while not budget.exhausted():
+        if start == RNG_BLOCK:
+            ii, other, uu, vv = next(blocks)
+            start = 0
+        count = min(RNG_BLOCK - start, budget.check_every - budget.iteration % budget.check_every)
+        if budget.max_iter is not None:
+            count = min(count, budget.max_iter - budget.iteration)
+        if budget.patience is not None:
+            count = min(count, budget.patience - (budget.iteration - budget.plateau_start))
+        done, T, total, best_score, improved, acc = kernels.anneal_block(
+            score, assign, best, caps, loads, members, offsets, pos,
+            ii, other, uu, vv, start, count, mode, capacities is not None,
+            T, cooling, total, best_score, stop_on_improve)
+        start += done
+        accepted += acc
+        if improved and stop_on_improve:
+            budget.tick(done - 1)
+            budget.improved(best_score, best.tolist)
+            budget.tick()
+        else:
+            budget.tick(done)
+    return best.tolist(), best_score, accepted
 
 def run_sa(df_students, df_tutors, weights,
            T0: float = 1.0,
            cooling: float = 0.995,
-           steps: int = 1000):
+           steps: int = 1000,
+           score_matrix=None,
+           move: str = 'reassign',
+           capacities=None,
+           time_limit: float = None,
+           patience: int = None,
+           tol: float = 0.0,
+           callback=None,
+           seed=None,
+           backend: str = 'numpy',
+           candidates=None,
+           stats=None):
     """
     Simulated Annealing untuk matching murid→tutor.
 
@@ -18,49 +206,121 @@ def run_sa(df_students, df_tutors, weights,
         weights    : dict, bobot per constraint
         T0         : suhu awal
         cooling    : faktor pendinginan per iterasi
-        steps      : jumlah iterasi
+        steps      : batas jumlah iterasi (None = tanpa batas, perlu time_limit/patience)
+        score_matrix: hasil build_score_matrix; kalau None dibangun sekali di sini.
+                      Kalau diisi, df_students/df_tutors/weights boleh None.
+                      Hasil build_lazy_score_matrix juga bisa (instance besar, backend numpy)
+        move       : 'reassign' (ganti tutor 1 murid) atau 'swap' (tukar tutor 2 murid,
+                     beban tiap tutor tetap; mulai dari matching 1:1 kalau m >= n)
+        capacities : kapasitas tutor (int atau list per tutor); None = baca kolom
+                     'kapasitas' di df_tutors, kalau ga ada tutor ga dibatasi.
+                     Reassign ke tutor penuh diubah jadi swap dengan salah satu muridnya
+        time_limit : batas waktu (detik); yang keluar best sejauh ini
+        patience   : berhenti kalau best ga naik lebih dari tol selama sekian iterasi
+        tol        : kenaikan minimum yang dihitung perbaikan untuk patience
+        callback   : dipanggil tiap best baru (lihat Budget); return True = berhenti
+        seed       : seed (int/SeedSequence) atau numpy Generator; None = acak dari OS
+        backend    : 'numpy' (loop Python, angka acak per blok NumPy), 'numba' (kernel
+                     kompilasi di kernels.py; tanpa numba balik ke 'numpy'), atau 'auto'.
+                     Untuk seed yang sama hasil semua backend identik
+        candidates : hasil build_candidates atau TutorIndex.neighbours (instance besar):
+                     move reassign cuma ke tutor kandidat murid itu, dan tanpa kapasitas
+                     assignment awal juga diambil dari kandidat. Dengan kapasitas, swap
+                     ke tutor penuh bisa memindah murid lain ke luar kandidatnya
+        stats      : dict opsional, diisi counter setelah selesai: 'iterations',
+                     'evaluations' (delta fitness O(1), satu per langkah), 'accepted',
+                     'acceptance_ratio', 'improvements', 'trajectory' (list
+                     (iteration, elapsed, best_score) tiap best baru), 'elapsed', 'backend',
+                     dan 'cache' (LazyScoreMatrix.cache_info) kalau matriksnya lazy.
+                     None = ga ada yang dicatat selain counter integer
 
     Returns:
         {
           'best_assignment': List[int],  # tutor index per student index
           'best_fitness'   : {'total_score':…, 'pct_satisfied':…},
           'exec_time'      : float,      # detik
-          'deterministic'  : False
+          'deterministic'  : bool,       # True kalau seed diisi
+          'iterations'     : int,
+          'stop_reason'    : 'max_iter' | 'time' | 'plateau' | 'callback'
         }
     """
-    n = len(df_students)
-    m = len(df_tutors)
+    if steps is None and time_limit is None and patience is None:
+        raise ValueError("Minimal salah satu dari steps, time_limit, atau patience harus diisi")
+    if score_matrix is None:
+        score_matrix = build_score_matrix(df_students, df_tutors, weights)
+    n, m = score_matrix['score'].shape
+    if move not in ('reassign', 'swap'):
+        raise ValueError(f"move harus 'reassign' atau 'swap', bukan {move!r}")
+    if capacities is None:
+        capacities = tutor_capacities(df_tutors)
+    capacities = normalize_capacities(capacities, m)
+    if move == 'swap' and n < 2:
+        raise ValueError("move 'swap' butuh minimal 2 murid")
+    cand = None
+    if candidates is not None:
+        if move == 'swap':
+            raise ValueError("candidates cuma dipakai move 'reassign'")
+        cand = candidate_arrays(candidates, n, capacities)
+    if is_lazy(score_matrix):
+        # Kernel numba butuh array dense
+        if backend == 'numba':
+            raise ValueError("backend 'numba' butuh matriks skor dense, bukan build_lazy_score_matrix")
+        backend = 'numpy'
+    backend = kernels.resolve_backend(backend)
+    rng = np.random.default_rng(seed)
 
-    # Inisialisasi acak
-    curr = [random.randrange(m) for _ in range(n)]
-    fit_curr = compute_fitness(curr, df_students, df_tutors, weights)
-    best = curr.copy()
-    best_fit = fit_curr.copy()
+    # Inisialisasi acak; swap cuma menukar, jadi mulai dari matching 1:1 kalau tutor cukup
+    open_tutors = None
+    if capacities is not None:
+        init = capacity_start(n, capacities, rng)
+        open_tutors = np.flatnonzero(np.asarray(capacities) > 0)
+    elif move == 'swap' and m >= n:
+        init = rng.choice(m, n, replace=False).tolist()
+    elif cand is not None:
+        indptr, indices, group = cand
+        init = indices[indptr[group] + rng.integers(0, indptr[group + 1] - indptr[group])].tolist()
+    else:
+        init = rng.integers(0, m, n).tolist()
+    state = IncrementalFitness(init, score_matrix, capacities)
 
     T = T0
     start = time.perf_counter()
-    for _ in range(steps):
-        i = random.randrange(n)
-        child = curr.copy()
-        child[i] = random.randrange(m)
-
-        fit_child = compute_fitness(child, df_students, df_tutors, weights)
-        delta = fit_child['total_score'] - fit_curr['total_score']
-
-        # Metropolis criterion
-        if delta > 0 or random.random() < np.exp(delta / T):
-            curr = child
-            fit_curr = fit_child
-            if fit_child['total_score'] > best_fit['total_score']:
-                best = child.copy()
-                best_fit = fit_child.copy()
-
-        T *= cooling
+    if backend == 'numba':
+        # Jam cukup dicek per blok; kernel ga bisa baca jam di tengah potongan
+        budget = Budget(steps, time_limit, patience, tol, callback, check_every=RNG_BLOCK,
+                        trace=stats is not None).start(state.total_score)
+        score = np.ascontiguousarray(score_matrix['score'], dtype=np.float64)
+        blocks = move_blocks(rng, n, m, move, open_tutors, candidates=cand)
+        best, best_score, accepted = _anneal_compiled(state, score, capacities, move, blocks,
+                                                      budget, T, cooling)
+    else:
+        budget = Budget(steps, time_limit, patience, tol, callback,
+                        trace=stats is not None).start(state.total_score)
+        best, best_score, accepted = _anneal_python(state, capacities, move,
+                                                    move_stream(rng, n, m, move, open_tutors,
+                                                                candidates=cand),
+                                                    budget, T, cooling)
 
+    # Skor akhir dihitung ulang penuh supaya ga kebawa drift float dari delta
+    best_fit = compute_fitness(best, df_students, df_tutors, weights, score_matrix)
     exec_time = time.perf_counter() - start
+    if stats is not None:
+        iterations = budget.iteration
+        stats.update(iterations=iterations,
+                     evaluations=iterations,
+                     accepted=accepted,
+                     acceptance_ratio=accepted / iterations if iterations else 0.0,
+                     improvements=len(budget.trajectory) - 1,
+                     trajectory=budget.trajectory,
+                     elapsed=exec_time,
+                     backend=backend)
+        if is_lazy(score_matrix):
+            stats['cache'] = score_matrix['lazy'].cache_info()
     return {
         'best_assignment': best,
         'best_fitness'   : best_fit,
         'exec_time'      : exec_time,
-        'deterministic'  : False
+        'deterministic'  : seed is not None,
+        'iterations'     : budget.iteration,
+        'stop_reason'    : budget.stop_reason
     }
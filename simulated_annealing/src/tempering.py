@@ -0,0 +1,172 @@
+# tempering.py
+
+import time
+import numpy as np
+from batch import ChainMembers
+from budget import Budget
+from fitness import build_score_matrix, compute_fitness, normalize_capacities, tutor_capacities
+
+def temperature_ladder(T_min: float, T_max: float, replicas: int) -> np.ndarray:
+    """Suhu geometrik dari T_min (replika 0) sampai T_max (replika terakhir)."""
+    if replicas == 1:
+        return np.array([T_min], dtype=float)
+    return np.geomspace(T_min, T_max, replicas)
+
+def run_pt(df_students, df_tutors, weights,
+           T_min: float = 0.01,
+           T_max: float = 1.0,
+           replicas: int = 8,
+           steps: int = 1000,
+           swap_interval: int = 10,
+           score_matrix=None,
+           move: str = 'reassign',
+           seed=None,
+           capacities=None,
+           time_limit: float = None,
+           patience: int = None,
+           tol: float = 0.0,
+           callback=None):
+    """
+    Parallel tempering (replica exchange) untuk matching murid→tutor.
+    M replika jalan berdampingan di suhu tetap (tanpa cooling), semua move
+    divektorkan numpy; tiap swap_interval langkah replika bertetangga
+    tukeran konfigurasi dengan kriteria Metropolis.
+
+    Args:
+        df_students: pd.DataFrame, index 0..n-1
+        df_tutors  : pd.DataFrame, index 0..m-1
+        weights    : dict, bobot per constraint
+        T_min      : suhu replika paling dingin
+        T_max      : suhu replika paling panas
+        replicas   : jumlah replika (M)
+        steps      : batas jumlah iterasi (tiap iterasi = 1 move per replika; None = tanpa batas)
+        swap_interval: tiap berapa iterasi coba tukar replika bertetangga
+        score_matrix: hasil build_score_matrix; kalau None dibangun sekali di sini
+        move       : 'reassign' (ganti tutor 1 murid) atau 'swap' (tukar tutor 2 murid,
+                     mulai dari matching 1:1 kalau m >= n)
+        seed       : seed atau numpy Generator
+        capacities : kapasitas tutor (int atau list); None = baca kolom 'kapasitas'
+                     di df_tutors, kalau ga ada tutor ga dibatasi. Beban tutor per
+                     replika disimpan di array (replicas, m) dan di-update per move;
+                     reassign ke tutor penuh diganti swap dengan murid acak
+        time_limit, patience, tol, callback: kriteria berhenti anytime, sama seperti run_sa
+
+    Returns:
+        sama seperti run_sa, plus 'temperatures' dan 'swap_acceptance'
+    """
+    if steps is None and time_limit is None and patience is None:
+        raise ValueError("Minimal salah satu dari steps, time_limit, atau patience harus diisi")
+    if score_matrix is None:
+        score_matrix = build_score_matrix(df_students, df_tutors, weights)
+    if move not in ('reassign', 'swap'):
+        raise ValueError(f"move harus 'reassign' atau 'swap', bukan {move!r}")
+    score = score_matrix['score']
+    n, m = score.shape
+    if move == 'swap' and n < 2:
+        raise ValueError("move 'swap' butuh minimal 2 murid")
+    if capacities is None:
+        capacities = tutor_capacities(df_tutors)
+    capacities = normalize_capacities(capacities, m)
+    rng = np.random.default_rng(seed)
+    temps = temperature_ladder(T_min, T_max, replicas)
+    rows = np.arange(replicas)
+
+    # Inisialisasi acak tiap replika; swap mulai dari matching 1:1 kalau tutor cukup
+    if capacities is not None:
+        caps = np.asarray(capacities, dtype=np.int64)
+        slots = np.repeat(np.arange(m), caps)
+        if len(slots) < n:
+            raise ValueError(f"Total kapasitas tutor ({len(slots)}) kurang dari jumlah murid ({n})")
+        curr = rng.permuted(np.tile(slots, (replicas, 1)), axis=1)[:, :n]
+        groups = ChainMembers(curr, caps)
+        open_tutors = np.flatnonzero(caps > 0)
+    elif move == 'swap' and m >= n:
+        curr = rng.permuted(np.tile(np.arange(m), (replicas, 1)), axis=1)[:, :n]
+    else:
+        curr = rng.integers(0, m, size=(replicas, n))
+    totals = score[np.arange(n), curr].sum(axis=1)
+    b = int(totals.argmax())
+    best = curr[b].copy()
+    best_score = totals[b]
+    swaps_tried = 0
+    swaps_done = 0
+
+    start = time.perf_counter()
+    budget = Budget(steps, time_limit, patience, tol, callback).start(best_score)
+    while not budget.exhausted():
+        budget.tick()
+        step = budget.iteration
+        i = rng.integers(0, n, replicas)
+        if move == 'swap':
+            j = (i + rng.integers(1, n, replicas)) % n
+            a, c = curr[rows, i], curr[rows, j]
+            delta = (score[i, c] + score[j, a]) - (score[i, a] + score[j, c])
+        elif capacities is not None:
+            t = open_tutors[rng.integers(0, len(open_tutors), replicas)]
+            a = curr[rows, i]
+            full = groups.full(rows, a, t)
+            # Tutor t penuh: tukar dengan salah satu muridnya supaya beban tetap
+            j = groups.pick(rows, t, rng.random(replicas))
+            c = curr[rows, j]
+            delta = np.where(full,
+                             (score[i, c] + score[j, a]) - (score[i, a] + score[j, c]),
+                             score[i, t] - score[i, a])
+        else:
+            t = rng.integers(0, m, replicas)
+            delta = score[i, t] - score[i, curr[rows, i]]
+
+        # Metropolis per replika, masing-masing dengan suhunya sendiri
+        with np.errstate(over='ignore'):
+            accept = (delta > 0) | (rng.random(replicas) < np.exp(delta / temps))
+        r = rows[accept]
+        if len(r):
+            if move == 'swap':
+                curr[r, i[accept]], curr[r, j[accept]] = c[accept], a[accept]
+                if capacities is not None:
+                    groups.swap(r, i[accept], j[accept], a[accept], c[accept])
+            elif capacities is not None:
+                sw = accept & full
+                re = accept & ~full
+                rs, rr = rows[sw], rows[re]
+                curr[rs, i[sw]], curr[rs, j[sw]] = c[sw], a[sw]
+                curr[rr, i[re]] = t[re]
+                groups.swap(rs, i[sw], j[sw], a[sw], c[sw])
+                groups.move(rr, i[re], a[re], t[re])
+            else:
+                curr[r, i[accept]] = t[accept]
+            totals[r] += delta[accept]
+            k = int(totals.argmax())
+            if totals[k] > best_score:
+                best = curr[k].copy()
+                best_score = totals[k]
+                budget.improved(best_score, best.tolist)
+
+        # Replica exchange: pasangan genap/ganjil bergantian
+        if replicas > 1 and step % swap_interval == 0:
+            first = (step // swap_interval) % 2
+            lo = np.arange(first, replicas - 1, 2)
+            hi = lo + 1
+            # Maksimasi skor: p = min(1, exp((1/T_lo - 1/T_hi) * (score_hi - score_lo)))
+            log_p = (1.0 / temps[lo] - 1.0 / temps[hi]) * (totals[hi] - totals[lo])
+            with np.errstate(over='ignore'):
+                ok = rng.random(len(lo)) < np.exp(np.minimum(log_p, 0.0))
+            swaps_tried += len(lo)
+            swaps_done += int(ok.sum())
+            lo, hi = lo[ok], hi[ok]
+            curr[lo], curr[hi] = curr[hi], curr[lo].copy()
+            totals[lo], totals[hi] = totals[hi], totals[lo].copy()
+            if capacities is not None:
+                groups.exchange(lo, hi)
+
+    exec_time = time.perf_counter() - start
+    best_assignment = best.tolist()
+    return {
+        'best_assignment': best_assignment,
+        'best_fitness'   : compute_fitness(best_assignment, df_students, df_tutors, weights, score_matrix),
+        'exec_time'      : exec_time,
+        'deterministic'  : seed is not None,
+        'iterations'     : budget.iteration,
+        'stop_reason'    : budget.stop_reason,
+        'temperatures'   : temps.tolist(),
+        'swap_acceptance': (swaps_done / swaps_tried) if swaps_tried else 0.0
+    }
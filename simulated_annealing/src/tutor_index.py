@@ -0,0 +1,189 @@
+# tutor_index.py
+
+"""
+Inverted index atribut tutor: tiap nilai atribut (mata_kuliah, subbab, waktu, ...)
+dipetakan ke bitset tutor (int Python, bit t = tutor t, sama seperti domain di
+back_CSP), jadi cari tutor yang cocok cukup AND/OR beberapa bitset, tanpa scan
+df_tutors. Dipakai untuk bikin domain backtracking_csp dan kandidat move run_sa.
+
+Cek index vs scan brute-force di semua skenario bawaan:
+
+    python tutor_index.py [path CSV ...]
+"""
+import numpy as np
+import pandas as pd
+from fitness import CRITERIA, FLEKS_COLUMN, normalize_capacities
+
+def scan(df_tutors, s, all_of=('mata_kuliah', 'subbab'), any_of=(), capacities=None) -> np.ndarray:
+    """
+    Versi brute-force TutorIndex.query: mask pandas per kolom atas seluruh df_tutors.
+    Lambat (O(m) per atribut), dipakai sebagai acuan TutorIndex.check.
+    """
+    m = len(df_tutors)
+    fleks = bool(s.get(FLEKS_COLUMN, False))
+
+    def hit(key):
+        if key == 'waktu' and fleks:
+            return np.ones(m, dtype=bool)
+        if pd.isna(s[key]):
+            return np.zeros(m, dtype=bool)
+        return (df_tutors[key].astype(object) == s[key]).to_numpy(dtype=bool)
+
+    ok = np.ones(m, dtype=bool)
+    for key in all_of:
+        ok &= hit(key)
+    if any_of:
+        either = np.zeros(m, dtype=bool)
+        for key in any_of:
+            either |= hit(key)
+        ok &= either
+    capacities = normalize_capacities(capacities, m)
+    if capacities is not None:
+        ok &= np.asarray(capacities) > 0
+    return np.flatnonzero(ok)
+
+def _to_bits(mask) -> int:
+    """Array bool panjang m -> bitset int (bit t = mask[t])."""
+    return int.from_bytes(np.packbits(mask, bitorder='little').tobytes(), 'little')
+
+class TutorIndex:
+    """
+    Args:
+        df_tutors : DataFrame tutor, index 0..m-1
+        keys      : kolom yang di-index (default semua kriteria score_pair)
+        capacities: kapasitas tutor (int/list); tutor berkapasitas 0 ga pernah ikut hasil
+
+    Query:
+        match(key, value)          -> bitset tutor dengan df_tutors[key] == value
+        student_bits(s, key)       -> sama, nilai dari baris murid s; 'waktu' jadi
+                                      wildcard (semua tutor) kalau murid fleksibel
+        query(s, all_of, any_of)   -> irisan atribut all_of ∩ gabungan atribut any_of
+        tutors(bits)               -> array index tutor dari bitset
+        check(df_students, ...)    -> bandingkan neighbours dengan scan brute-force
+    Nilai kosong (NaN) ga pernah cocok, sama seperti score_pair.
+    """
+
+    def __init__(self, df_tutors, keys=CRITERIA, capacities=None):
+        self.m = m = len(df_tutors)
+        self.nbytes = (m + 7) // 8
+        capacities = normalize_capacities(capacities, m)
+        self.capacities = capacities
+        usable = np.ones(m, dtype=bool) if capacities is None else np.asarray(capacities) > 0
+        self.all = _to_bits(usable)
+        self.bits = {}
+        for key in keys:
+            codes, values = pd.factorize(df_tutors[key])
+            order = np.argsort(codes, kind='stable')
+            starts = np.searchsorted(codes[order], np.arange(len(values) + 1))
+            table = {}
+            for c, value in enumerate(values):
+                mask = np.zeros(m, dtype=bool)
+                mask[order[starts[c]:starts[c + 1]]] = True
+                table[value] = _to_bits(mask & usable)
+            self.bits[key] = table
+
+    def match(self, key: str, value) -> int:
+        if key not in self.bits:
+            raise KeyError(f"Kolom {key!r} ga di-index")
+        if pd.isna(value):
+            return 0
+        return self.bits[key].get(value, 0)
+
+    def student_bits(self, s, key: str) -> int:
+        """Bitset tutor yang memenuhi constraint `key` untuk murid s (Series/dict)."""
+        if key == 'waktu' and bool(s.get(FLEKS_COLUMN, False)):
+            return self.all
+        return self.match(key, s[key])
+
+    def query(self, s, all_of=('mata_kuliah', 'subbab'), any_of=()) -> int:
+        """Tutor yang cocok di semua atribut all_of dan (kalau diisi) minimal satu atribut any_of."""
+        bits = self.all
+        for key in all_of:
+            bits &= self.student_bits(s, key)
+        if any_of:
+            either = 0
+            for key in any_of:
+                either |= self.student_bits(s, key)
+            bits &= either
+        return bits
+
+    def tutors(self, bits: int) -> np.ndarray:
+        """Index tutor (urut naik) yang bit-nya nyala."""
+        if not bits:
+            return np.zeros(0, dtype=np.int64)
+        raw = np.frombuffer(bits.to_bytes(self.nbytes, 'little'), dtype=np.uint8)
+        # nonzero di view bool jauh lebih cepat daripada flatnonzero di uint8
+        return np.unpackbits(raw, bitorder='little')[:self.m].view(bool).nonzero()[0]
+
+    def neighbours(self, df_students, all_of=('mata_kuliah', 'subbab'), any_of=(), min_size: int = 1):
+        """
+        Tutor kompatibel tiap murid (hasil query), disimpan per grup murid dengan nilai
+        atribut sama (CSR), jadi memorinya ikut jumlah grup, bukan n × hasil.
+        Grup yang hasilnya kurang dari min_size pakai semua tutor.
+
+        Returns dict (bisa langsung jadi `candidates` run_sa):
+          - indptr, indices: tutor grup g = indices[indptr[g]:indptr[g + 1]]
+          - group          : ndarray int (n,), grup tiap murid
+        """
+        cols = list(dict.fromkeys([*all_of, *any_of]))
+        parts = [pd.factorize(df_students[key])[0] for key in cols]
+        if 'waktu' in cols and FLEKS_COLUMN in df_students:
+            parts.append(df_students[FLEKS_COLUMN].map(bool).to_numpy(dtype=np.int64))
+        n = len(df_students)
+        keys = np.column_stack(parts) if parts else np.zeros((n, 1), dtype=np.int64)
+        _, rep, group = np.unique(keys, axis=0, return_index=True, return_inverse=True)
+
+        everyone = self.tutors(self.all)
+        lists = []
+        for i in rep.tolist():
+            found = self.tutors(self.query(df_students.iloc[i], all_of, any_of))
+            lists.append(found if len(found) >= min_size else everyone)
+        indptr = np.zeros(len(lists) + 1, dtype=np.int64)
+        indptr[1:] = np.cumsum([len(t) for t in lists])
+        return {
+            'indptr': indptr,
+            'indices': np.concatenate(lists) if lists else np.zeros(0, dtype=np.int64),
+            'group': group.ravel().astype(np.int64)
+        }
+
+    def domains(self, df_students, all_of=('mata_kuliah', 'subbab'), any_of=(), min_size: int = 1):
+        """Domain backtracking_csp {murid: [tutor, ...]} dari neighbours."""
+        nb = self.neighbours(df_students, all_of, any_of, min_size)
+        indptr, indices = nb['indptr'], nb['indices']
+        lists = [indices[indptr[g]:indptr[g + 1]].tolist() for g in range(len(indptr) - 1)]
+        return {i: lists[g] for i, g in enumerate(nb['group'].tolist())}
+
+    def check(self, df_students, df_tutors, all_of=('mata_kuliah', 'subbab'), any_of=()) -> int:
+        """
+        Cocokkan hasil neighbours (min_size=0) tiap murid dengan scan brute-force,
+        termasuk murid fleksibel yang waktu-nya wildcard. AssertionError di murid
+        pertama yang beda; kalau lolos kembalikan jumlah murid yang dicek.
+        """
+        nb = self.neighbours(df_students, all_of, any_of, min_size=0)
+        indptr, indices = nb['indptr'], nb['indices']
+        for i, g in enumerate(nb['group'].tolist()):
+            got = indices[indptr[g]:indptr[g + 1]]
+            want = scan(df_tutors, df_students.iloc[i], all_of, any_of, self.capacities)
+            assert np.array_equal(got, want), \
+                f"Murid {i} ({all_of=}, {any_of=}): index {got.tolist()} != scan {want.tolist()}"
+        return len(df_students)
+
+if __name__ == '__main__':
+    import glob
+    import os
+    import sys
+    from fitness import tutor_capacities
+
+    root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    sys.path.append(root)
+    from benchmark.scenarios import load_preferences
+
+    paths = sys.argv[1:] or sorted(glob.glob(os.path.join(root, 'simulated_annealing', 'data', '*.csv')))
+    queries = [(('mata_kuliah', 'subbab'), ()), (('waktu',), ()), (('mata_kuliah',), ('subbab', 'waktu'))]
+    for path in paths:
+        df_students, df_tutors = load_preferences(path)
+        index = TutorIndex(df_tutors, capacities=tutor_capacities(df_tutors))
+        for all_of, any_of in queries:
+            index.check(df_students, df_tutors, all_of, any_of)
+        fleks = int(df_students[FLEKS_COLUMN].map(bool).sum()) if FLEKS_COLUMN in df_students else 0
+        print(f"{os.path.basename(path)}: cocok ({len(df_students)} murid, {fleks} fleksibel)")
@@ -1,7 +1,7 @@
-import random
+import math
 import numpy as np
 
-def sa_match(murid, tutor, cap_init, pref, T0=1.0, cooling=0.995, steps=1500):
+def sa_match(murid, tutor, cap_init, pref, T0=1.0, cooling=0.995, steps=1500, seed=None):
     """
     Simulated Annealing for matching murid→tutor under capacity constraints.
 
@@ -13,6 +13,7 @@ def sa_match(murid, tutor, cap_init, pref, T0=1.0, cooling=0.995, steps=1500):
         T0 (float): suhu awal
         cooling (float): faktor pendinginan per iterasi
         steps (int): jumlah iterasi
+        seed: seed (int/SeedSequence) atau numpy Generator; None = acak dari OS
 
     Returns:
         best (dict): assignment terbaik {murid_id: tutor_id}
@@ -22,8 +23,10 @@ def sa_match(murid, tutor, cap_init, pref, T0=1.0, cooling=0.995, steps=1500):
     score_pair = {(m,t): sum(pref[(m,t)].values()) for m in murid for t in tutor}
     PEN        = max(score_pair.values()) * len(murid)
 
+    rng = np.random.default_rng(seed)
+
     # Inisialisasi random assignment
-    curr     = {m: random.choice(tutor) for m in murid}
+    curr     = {m: tutor[k] for m, k in zip(murid, rng.integers(len(tutor), size=len(murid)).tolist())}
     best     = curr.copy()
     best_fit = sum(score_pair[(m, curr[m])] for m in murid)
 
@@ -35,19 +38,24 @@ def sa_match(murid, tutor, cap_init, pref, T0=1.0, cooling=0.995, steps=1500):
         )
         return s - PEN * overflow
 
+    # Angka acak semua langkah diambil sekaligus, bukan per langkah
+    pick_m = rng.integers(len(murid), size=steps).tolist()
+    pick_t = rng.integers(len(tutor), size=steps).tolist()
+    accept = rng.random(steps).tolist()
+
     T = T0
-    for _ in range(steps):
+    for step in range(steps):
         # Propose neighbor dengan mengganti satu murid acak
         child = curr.copy()
-        m = random.choice(murid)
-        child[m] = random.choice(tutor)
+        m = murid[pick_m[step]]
+        child[m] = tutor[pick_t[step]]
 
         f_child = fitness(child)
         f_curr  = fitness(curr)
         delta   = f_child - f_curr
 
         # Terima dengan Metropolis criterion
-        if delta > 0 or random.random() < np.exp(delta / T):
+        if delta > 0 or accept[step] < math.exp(delta / T):
             curr = child
             if f_child > best_fit:
                 best_fit = f_child
@@ -1,4 +1,4 @@
-import random
+import math
 import time
 import numpy as np
 import pandas as pd
@@ -6,13 +6,14 @@ import statistics
 
 # 1. Utilities: Generate Preferences & Scenarios
 
-def generate_preferences(murid, tutor, mode="random", popular_subset=None, weights=None):
+def generate_preferences(murid, tutor, mode="random", popular_subset=None, weights=None, rng=None):
     attrs = ["waktu","topik","mode","gaya"]
+    rng = np.random.default_rng(rng)
     pref = {}
     for m in murid:
         if mode == "conflict":
             # Setiap murid hanya cocok dengan satu tutor random
-            t_good = random.choice(tutor)
+            t_good = tutor[rng.integers(len(tutor))]
             for t in tutor:
                 pref[(m,t)] = {a: (1 if t == t_good else 0) for a in attrs}
         elif mode == "popular":
@@ -23,7 +24,7 @@ def generate_preferences(murid, tutor, mode="random", popular_subset=None, weigh
         else:
             # Random binary untuk tiap atribut
             for t in tutor:
-                pref[(m,t)] = {a: random.randint(0,1) for a in attrs}
+                pref[(m,t)] = {a: int(rng.integers(2)) for a in attrs}
         # Apply weights jika disediakan
         if weights:
             for t in tutor:
@@ -31,15 +32,15 @@ def generate_preferences(murid, tutor, mode="random", popular_subset=None, weigh
                     pref[(m,t)][a] *= weights.get(a,1)
     return pref
 
-def scenario_conflict_heavy(n_m, n_t):
+def scenario_conflict_heavy(n_m, n_t, rng=None):
     murid = list(range(n_m))
     tutor = list(range(n_t))
     # Kapasitas 1 → paksa 1-on-1, banyak konflik
     cap = {t:1 for t in tutor}
-    pref = generate_preferences(murid, tutor, mode="conflict")
+    pref = generate_preferences(murid, tutor, mode="conflict", rng=rng)
     return murid, tutor, cap, pref
 
-def scenario_capacity(n_m, n_t, asym=False):
+def scenario_capacity(n_m, n_t, asym=False, rng=None):
     murid = list(range(n_m))
     tutor = list(range(n_t))
     if asym:
@@ -48,7 +49,7 @@ def scenario_capacity(n_m, n_t, asym=False):
     else:
         # Distribusi merata
         cap = {t: max(1, n_m//n_t) for t in tutor}
-    pref = generate_preferences(murid, tutor, mode="random")
+    pref = generate_preferences(murid, tutor, mode="random", rng=rng)
     return murid, tutor, cap, pref
 
 # 2. CSP Backtracking + MRV + Forward Checking
@@ -98,12 +99,13 @@ def csp_backtrack(murid, tutor, cap_init, pref):
 
 # 3. Simulated Annealing
 
-def sa_match(murid, tutor, cap_init, pref, T0=1.0, cooling=0.995, steps=2000):
+def sa_match(murid, tutor, cap_init, pref, T0=1.0, cooling=0.995, steps=2000, seed=None):
     score_pair = {(m,t): sum(pref[(m,t)].values()) for m in murid for t in tutor}
     PEN = max(score_pair.values()) * len(murid)
+    rng = np.random.default_rng(seed)
 
     # Inisialisasi random
-    curr = {m: random.choice(tutor) for m in murid}
+    curr = {m: tutor[k] for m, k in zip(murid, rng.integers(len(tutor), size=len(murid)).tolist())}
     def fitness(assign):
         # Skor minus penalti overflow kapasitas
         s = sum(score_pair[(m,assign[m])] for m in murid)
@@ -111,14 +113,18 @@ def sa_match(murid, tutor, cap_init, pref, T0=1.0, cooling=0.995, steps=2000):
         return s - PEN*overflow
 
     best, best_fit = curr.copy(), fitness(curr)
+    # Angka acak semua langkah diambil sekaligus, bukan per langkah
+    pick_m = rng.integers(len(murid), size=steps).tolist()
+    pick_t = rng.integers(len(tutor), size=steps).tolist()
+    accept = rng.random(steps).tolist()
     T = T0
-    for _ in range(steps):
+    for step in range(steps):
         child = curr.copy()
-        m = random.choice(murid)
-        child[m] = random.choice(tutor)
+        m = murid[pick_m[step]]
+        child[m] = tutor[pick_t[step]]
         f_child, f_curr = fitness(child), fitness(curr)
         delta = f_child - f_curr
-        if delta > 0 or random.random() < np.exp(delta/T):
+        if delta > 0 or accept[step] < math.exp(delta/T):
             curr = child
             if f_child > best_fit:
                 best, best_fit = child.copy(), f_child
@@ -129,7 +135,7 @@ def sa_match(murid, tutor, cap_init, pref, T0=1.0, cooling=0.995, steps=2000):
 # 4. Genetic Algorithm
 
 def ga_match(murid, tutor, cap_init, pref,
-             pop_size=30, gens=80, cross_p=0.8, mut_p=0.1):
+             pop_size=30, gens=80, cross_p=0.8, mut_p=0.1, seed=None):
     score_pair = {(m,t): sum(pref[(m,t)].values()) for m in murid for t in tutor}
     PEN = max(score_pair.values()) * len(murid)
 
@@ -140,24 +146,26 @@ def ga_match(murid, tutor, cap_init, pref,
                for t in tutor)
         return s - PEN*overflow
 
+    rng = np.random.default_rng(seed)
     # Inisiasi populasi
-    pop = [[random.choice(tutor) for _ in murid] for _ in range(pop_size)]
+    pop = [[tutor[k] for k in row] for row in rng.integers(len(tutor), size=(pop_size, len(murid))).tolist()]
     for _ in range(gens):
         pop = sorted(pop, key=lambda c: fitness(c), reverse=True)
         new_pop = pop[:2]
         while len(new_pop) < pop_size:
-            p1, p2 = random.sample(pop[:10], 2)
-            if random.random() < cross_p:
-                cp = random.randint(1, len(murid)-1)
+            i, j = rng.choice(min(10, len(pop)), 2, replace=False).tolist()
+            p1, p2 = pop[i], pop[j]
+            if rng.random() < cross_p:
+                cp = int(rng.integers(1, len(murid)))
                 c1 = p1[:cp] + p2[cp:]
                 c2 = p2[:cp] + p1[cp:]
             else:
                 c1, c2 = p1[:], p2[:]
             # Mutasi
             for c in (c1, c2):
-                if random.random() < mut_p:
-                    idx = random.randrange(len(murid))
-                    c[idx] = random.choice(tutor)
+                if rng.random() < mut_p:
+                    idx = int(rng.integers(len(murid)))
+                    c[idx] = tutor[rng.integers(len(tutor))]
             new_pop += [c1, c2]
         pop = new_pop[:pop_size]
 
@@ -174,15 +182,17 @@ def evaluate(assign, pref, cap):
     percent = match_score / total_attr * 100
     return match_score, percent
 
-def run_scenario(scenario_args, repeat=3):
+def run_scenario(scenario_args, repeat=3, seed=None):
     records = []
     murid, tutor, cap, pref = scenario_args
-    for _ in range(repeat):
+    # Stream independen per repeat untuk SA dan GA
+    for child in np.random.SeedSequence(seed).spawn(repeat):
+        sa_seed, ga_seed = child.spawn(2)
         t0 = time.perf_counter(); sol_csp, _ = csp_backtrack(murid,tutor,cap,pref); t1 = time.perf_counter()
         m1,_pct1 = evaluate(sol_csp, pref, cap)
-        t2 = time.perf_counter(); sol_sa, _ = sa_match(murid,tutor,cap,pref); t3 = time.perf_counter()
+        t2 = time.perf_counter(); sol_sa, _ = sa_match(murid,tutor,cap,pref,seed=sa_seed); t3 = time.perf_counter()
         m2,_pct2 = evaluate(sol_sa, pref, cap)
-        t4 = time.perf_counter(); sol_ga, _ = ga_match(murid,tutor,cap,pref); t5 = time.perf_counter()
+        t4 = time.perf_counter(); sol_ga, _ = ga_match(murid,tutor,cap,pref,seed=ga_seed); t5 = time.perf_counter()
         m3,_pct3 = evaluate(sol_ga, pref, cap)
 
         for alg, score, t_start, t_end in [
@@ -199,15 +209,16 @@ def run_scenario(scenario_args, repeat=3):
     return pd.DataFrame(records)
 
 if __name__ == "__main__":
+    rng = np.random.default_rng(42)
     scenarios = {
-        "Conflict-Heavy": scenario_conflict_heavy(15, 5),
-        "Capacity-Sym":   scenario_capacity(20,10,asym=False),
-        "Capacity-Asym":  scenario_capacity(20,10,asym=True),
+        "Conflict-Heavy": scenario_conflict_heavy(15, 5, rng=rng),
+        "Capacity-Sym":   scenario_capacity(20,10,asym=False,rng=rng),
+        "Capacity-Asym":  scenario_capacity(20,10,asym=True,rng=rng),
     }
 
     results = []
     for name, sc in scenarios.items():
-        df = run_scenario(sc, repeat=3)
+        df = run_scenario(sc, repeat=3, seed=42)
         df["Scenario"] = name
         results.append(df)
 
@@ -0,0 +1,295 @@
+"""
+Cek kecil ber-seed untuk properti yang diandalkan engine-engine di repo ini:
+
+  - IncrementalFitness (SA) : delta per move sama dengan hitung ulang penuh
+  - delta_fitness (GA)      : skor anak dari delta sama dengan compute_fitness
+  - backtracking_csp        : versi TrailDomains sama optimalnya dengan versi deepcopy (Back_CSP.py)
+  - run_lap & OnlineMatcher : optimal dibanding brute force di instance kecil
+  - backend numba           : hasil sama dengan numpy untuk seed yang sama
+
+Bisa jalan sebagai script (python tests/test_engines.py) atau lewat pytest.
+"""
+import contextlib
+import io
+import itertools
+import os
+import sys
+import warnings
+
+import numpy as np
+import pandas as pd
+
+TESTS_DIR = os.path.dirname(os.path.abspath(__file__))
+# Root repo biar package benchmark kebaca; benchmark.engines yang masukin folder engine ke sys.path
+sys.path.insert(0, os.path.dirname(TESTS_DIR))
+import benchmark.engines  # noqa: E402,F401
+
+import kernels                                         # noqa: E402
+from back_CSP import backtracking_csp                  # noqa: E402
+from fitness import CAPACITY_COLUMN, CRITERIA, FLEKS_COLUMN, IncrementalFitness, build_score_matrix, compute_fitness  # noqa: E402
+from ga import kernels as ga_kernels                   # noqa: E402
+from ga.chromosome import capacity_slots               # noqa: E402
+from ga.fitness import delta_fitness, population_fitness  # noqa: E402
+from ga.ga import decode_chromosome, run_ga            # noqa: E402
+from lap import run_lap, solve_assignment              # noqa: E402
+from online import OnlineMatcher                       # noqa: E402
+from sa import run_sa                                  # noqa: E402
+
+WEIGHTS = {'mata_kuliah': 0.3, 'subbab': 0.2, 'gaya_belajar': 0.2, 'mode': 0.1, 'waktu': 0.2}
+TOL = 1e-9
+
+# Utilities
+
+def random_score_matrix(n, m, rng):
+    # Skor kelipatan 0.1 biar banyak seri, seperti skor bobot asli
+    return {
+        'score': np.round(rng.random((n, m)) * 10) / 10,
+        'satisfied': rng.integers(0, 6, size=(n, m)),
+        'num_constraints': 5
+    }
+
+def random_record(rng, capacity=None):
+    record = {key: f"{key}_{rng.integers(3)}" for key in CRITERIA}
+    record[FLEKS_COLUMN] = bool(rng.random() < 0.3)
+    if capacity is not None:
+        record[CAPACITY_COLUMN] = capacity
+    return record
+
+def brute_force(score, capacities):
+    """Optimum eksak: coba semua assignment yang muat di kapasitas (None = tanpa batas)."""
+    n, m = score.shape
+    best = -np.inf
+    for assign in itertools.product(range(m), repeat=n):
+        if capacities is not None and (np.bincount(assign, minlength=m) > capacities).any():
+            continue
+        best = max(best, score[np.arange(n), assign].sum())
+    return best
+
+def with_numba(module, fn):
+    # Tanpa numba, kernel tetap fungsi Python biasa; HAVE_NUMBA dipaksa True supaya
+    # jalur kernel yang sama ikut dicek
+    saved = module.HAVE_NUMBA
+    module.HAVE_NUMBA = True
+    try:
+        return fn()
+    finally:
+        module.HAVE_NUMBA = saved
+
+# SA: IncrementalFitness
+
+def test_incremental_fitness_matches_rescore():
+    rng = np.random.default_rng(1)
+    for trial in range(20):
+        n, m = int(rng.integers(2, 12)), int(rng.integers(2, 8))
+        sm = random_score_matrix(n, m, rng)
+        capacities = None
+        if trial % 2:
+            capacities = rng.integers(1, 4, size=m)
+            capacities[rng.integers(m)] += n   # total kapasitas pasti cukup
+            capacities = capacities.tolist()
+            start = np.repeat(np.arange(m), capacities)[rng.permutation(sum(capacities))[:n]]
+        else:
+            start = rng.integers(m, size=n)
+        inc = IncrementalFitness(start.tolist(), sm, capacities)
+        for _ in range(200):
+            i, j, t = int(rng.integers(n)), int(rng.integers(n)), int(rng.integers(m))
+            if rng.random() < 0.5:
+                if inc.is_full(t):
+                    continue
+                delta = inc.delta_reassign(i, t)
+                before = inc.total_score
+                inc.apply_reassign(i, t, delta)
+            else:
+                delta = inc.delta_swap(i, j)
+                before = inc.total_score
+                inc.apply_swap(i, j, delta)
+            full = compute_fitness(inc.assignment, None, None, None, sm)
+            assert abs(inc.total_score - before - delta) < TOL
+            assert abs(inc.total_score - full['total_score']) < TOL
+            assert abs(inc.fitness()['pct_satisfied'] - full['pct_satisfied']) < TOL
+            if capacities is not None:
+                loads = np.bincount(inc.assignment, minlength=m)
+                assert inc.loads == loads.tolist()
+                assert (loads <= capacities).all()
+                for tutor in range(m):
+                    assert sorted(inc.members[tutor]) == np.flatnonzero(np.array(inc.assignment) == tutor).tolist()
+
+# GA: delta_fitness
+
+def test_ga_delta_matches_compute_fitness():
+    rng = np.random.default_rng(2)
+    for trial in range(20):
+        n = int(rng.integers(2, 10))
+        slots = None
+        if trial % 2:
+            m = int(rng.integers(1, n + 1))
+            slots = capacity_slots(rng.integers(1, 4, size=m) + (n // m))
+            genome_len = len(slots)
+        else:
+            m = int(rng.integers(n, n + 4))
+            genome_len = n
+        sm = random_score_matrix(n, m, rng)
+        pop_size = 8
+        population = rng.permuted(np.tile(np.arange(genome_len), (pop_size, 1)), axis=1)
+        base = population_fitness(population, sm, slots)
+
+        # Mutasi swap 2 gen per baris, seperti operator GA (kromosom tetap permutasi)
+        rows, cols, new, old = [], [], [], []
+        child = population.copy()
+        for r in range(pop_size):
+            a, b = rng.choice(genome_len, size=2, replace=False)
+            rows += [r, r]
+            cols += [a, b]
+            new += [population[r, b], population[r, a]]
+            old += [population[r, a], population[r, b]]
+            child[r, a], child[r, b] = population[r, b], population[r, a]
+        scores = delta_fitness(base, np.array(rows), np.array(cols), np.array(new), np.array(old), sm, slots)
+
+        for r in range(pop_size):
+            full = compute_fitness(decode_chromosome(child[r], slots, n), None, None, None, sm)
+            assert abs(scores[r] - full['total_score']) < TOL
+
+# CSP: TrailDomains vs deepcopy
+
+def test_csp_matches_deepcopy_baseline():
+    # Back_CSP.py (di folder ini) ngeprint contohnya waktu di-import
+    with contextlib.redirect_stdout(io.StringIO()):
+        from Back_CSP import backtracking_csp as deepcopy_csp
+    rng = np.random.default_rng(3)
+    checks = {
+        'ne': lambda x, y: x != y,
+        'lt': lambda x, y: x < y,
+        'sum': lambda x, y: (x + y) % 3 != 0,
+    }
+    for trial in range(60):
+        n = int(rng.integers(1, 6))
+        variables = list(range(n))
+        domains = {v: rng.choice(6, size=int(rng.integers(1, 5)), replace=False).tolist() for v in variables}
+        score = np.round(rng.random((n, 6)) * 10) / 10
+        soft = lambda v, x: float(score[v, x])
+        constraints = []
+        if n > 1:
+            for _ in range(int(rng.integers(0, 5))):
+                a, b = rng.choice(n, size=2, replace=False).tolist()
+                constraints.append((a, b, checks[rng.choice(list(checks))]))
+
+        expected = deepcopy_csp(variables, domains, constraints, soft)
+        for bound in ('max', 'assignment'):
+            assignment, best = backtracking_csp(variables, domains, constraints, soft_score=soft, bound=bound)
+            if expected[0]:
+                assert abs(best - expected[1]) < TOL
+                assert all(assignment[v] in domains[v] for v in variables)
+                assert all(f(assignment[a], assignment[b]) for a, b, f in constraints)
+                assert abs(sum(soft(v, x) for v, x in assignment.items()) - best) < TOL
+            else:
+                assert assignment == {}
+
+# LAP & OnlineMatcher vs brute force
+
+def test_lap_optimal_against_brute_force():
+    rng = np.random.default_rng(4)
+    for trial in range(40):
+        n, m = int(rng.integers(1, 6)), int(rng.integers(1, 5))
+        sm = random_score_matrix(n, m, rng)
+        capacities = rng.integers(0, 3, size=m)
+        capacities[rng.integers(m)] += n
+        result = run_lap(None, None, None, capacities=capacities.tolist(), score_matrix=sm)
+        assign = np.array(result['best_assignment'])
+        assert (np.bincount(assign, minlength=m) <= capacities).all()
+        assert abs(result['best_fitness']['total_score'] - brute_force(sm['score'], capacities)) < TOL
+
+def test_lap_warm_start_matches_cold():
+    # Warm start dari dual masalah induk (baris/kolom dibuang, cost naik), dipakai AssignmentBound
+    rng = np.random.default_rng(5)
+    for trial in range(200):
+        n = int(rng.integers(2, 7))
+        m = int(rng.integers(n, 9))
+        cost = np.round(rng.random((n, m)) * 10) / 10
+        cols, u, v = solve_assignment(cost, duals=True)
+        keep_r = np.sort(rng.choice(n, size=n - 1, replace=False))
+        keep_c = np.sort(rng.choice(m, size=m - 1, replace=False))
+        child = cost[np.ix_(keep_r, keep_c)]
+        child[rng.random(child.shape) < 0.2] += 5
+        col_pos = {c: k for k, c in enumerate(keep_c)}
+        warm = (u[keep_r], v[keep_c], np.array([col_pos.get(c, -1) for c in cols[keep_r]]))
+        rows = np.arange(n - 1)
+        warm_total = child[rows, solve_assignment(child, warm)].sum()
+        assert abs(warm_total - child[rows, solve_assignment(child)].sum()) < TOL
+
+def test_online_matcher_optimal_against_brute_force():
+    rng = np.random.default_rng(6)
+    for trial in range(8):
+        students = {k: random_record(rng) for k in range(int(rng.integers(1, 5)))}
+        tutors = {k: random_record(rng, int(rng.integers(1, 3))) for k in range(int(rng.integers(2, 4)))}
+        matcher = OnlineMatcher.from_frames(pd.DataFrame.from_dict(students, orient='index'),
+                                            pd.DataFrame.from_dict(tutors, orient='index'), WEIGHTS)
+        next_id = 100
+        for step in range(12):
+            caps = np.array([tutors[t][CAPACITY_COLUMN] for t in tutors])
+            op = rng.integers(4)
+            if op == 0 and caps.sum() > len(students) and len(students) < 5:
+                students[next_id] = random_record(rng)
+                matcher.add_student(students[next_id], student_id=next_id)
+            elif op == 1 and len(students) > 1:
+                sid = list(students)[rng.integers(len(students))]
+                del students[sid]
+                matcher.remove_student(sid)
+            elif op == 2 and len(tutors) < 4:
+                tutors[next_id] = random_record(rng, int(rng.integers(1, 3)))
+                matcher.add_tutor(tutors[next_id], tutor_id=next_id)
+            elif op == 3 and len(tutors) > 1:
+                tid = list(tutors)[rng.integers(len(tutors))]
+                if caps.sum() - tutors[tid][CAPACITY_COLUMN] >= len(students):
+                    del tutors[tid]
+                    matcher.remove_tutor(tid)
+            next_id += 1
+
+            df_students = pd.DataFrame.from_dict(students, orient='index').reset_index(drop=True)
+            df_tutors = pd.DataFrame.from_dict(tutors, orient='index').reset_index(drop=True)
+            score = build_score_matrix(df_students, df_tutors, WEIGHTS)['score']
+            caps = df_tutors[CAPACITY_COLUMN].to_numpy()
+            tutor_pos = {t: k for k, t in enumerate(tutors)}
+            assign = np.array([tutor_pos[matcher.assignment()[s]] for s in students])
+            assert (np.bincount(assign, minlength=len(tutors)) <= caps).all()
+            total = matcher.fitness()['total_score']
+            assert abs(total - score[np.arange(len(students)), assign].sum()) < TOL
+            assert abs(total - brute_force(score, caps)) < TOL
+
+# Backend numba vs numpy
+
+def test_numba_matches_numpy():
+    rng = np.random.default_rng(7)
+    sm = random_score_matrix(12, 8, rng)
+    square = random_score_matrix(8, 10, rng)
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', RuntimeWarning)
+        for move, capacities in (('reassign', None), ('swap', None), ('reassign', 2)):
+            run = lambda backend: run_sa(None, None, None, score_matrix=sm, steps=3000, seed=5,
+                                         move=move, capacities=capacities, backend=backend)
+            expected = run('numpy')
+            stats = {}
+            got = with_numba(kernels, lambda: run_sa(None, None, None, score_matrix=sm, steps=3000, seed=5,
+                                                     move=move, capacities=capacities, backend='numba',
+                                                     stats=stats))
+            assert stats['backend'] == 'numba'
+            assert got['best_assignment'] == expected['best_assignment']
+            assert got['best_fitness'] == expected['best_fitness']
+
+        for matrix, capacities in ((square, None), (sm, 2)):
+            run = lambda backend, stats=None: run_ga(None, None, None, score_matrix=matrix, pop_size=20,
+                                                     generations=15, capacities=capacities, seed=3,
+                                                     backend=backend, stats=stats)
+            expected = run('numpy')
+            stats = {}
+            got = with_numba(ga_kernels, lambda: run('numba', stats))
+            assert stats['backend'] == 'numba'
+            assert got['best_chromosome'] == expected['best_chromosome']
+            assert got['best_fitness'] == expected['best_fitness']
+
+
+if __name__ == "__main__":
+    tests = [fn for name, fn in sorted(globals().items()) if name.startswith('test_')]
+    for fn in tests:
+        fn()
+        print(f"ok  {fn.__name__}")
+    print(f"\n{len(tests)} cek lulus")
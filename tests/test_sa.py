@@ -1,63 +1,69 @@
-import random
+import math
 import time
 import numpy as np
 import pandas as pd
 
 # Utilities: Generate Preferences & Scenarios
-def generate_preferences(murid, tutor, mode="random", popular_subset=None, weights=None):
+def generate_preferences(murid, tutor, mode="random", popular_subset=None, weights=None, rng=None):
     attrs = ["waktu","topik","mode","gaya"]
+    rng = np.random.default_rng(rng)
     pref = {}
     for m in murid:
         if mode == "conflict":
-            t_good = random.choice(tutor)
+            t_good = tutor[rng.integers(len(tutor))]
             for t in tutor:
                 pref[(m,t)] = {a: (1 if t == t_good else 0) for a in attrs}
         else:
             for t in tutor:
-                pref[(m,t)] = {a: random.randint(0,1) for a in attrs}
+                pref[(m,t)] = {a: int(rng.integers(2)) for a in attrs}
         if weights:
             for t in tutor:
                 for a in attrs:
                     pref[(m,t)][a] *= weights.get(a,1)
     return pref
 
-def scenario_conflict_heavy(n_m, n_t):
+def scenario_conflict_heavy(n_m, n_t, rng=None):
     murid = list(range(n_m))
     tutor = list(range(n_t))
     cap = {t:1 for t in tutor}
-    pref = generate_preferences(murid, tutor, mode="conflict")
+    pref = generate_preferences(murid, tutor, mode="conflict", rng=rng)
     return murid, tutor, cap, pref
 
-def scenario_capacity(n_m, n_t, asym=False):
+def scenario_capacity(n_m, n_t, asym=False, rng=None):
     murid = list(range(n_m))
     tutor = list(range(n_t))
     if asym:
         cap = {t:(5 if t<2 else 1) for t in tutor}
     else:
         cap = {t: max(1, n_m//n_t) for t in tutor}
-    pref = generate_preferences(murid, tutor, mode="random")
+    pref = generate_preferences(murid, tutor, mode="random", rng=rng)
     return murid, tutor, cap, pref
 
 # Simulated Annealing
-def sa_match(murid, tutor, cap_init, pref, T0=1.0, cooling=0.995, steps=2000):
+def sa_match(murid, tutor, cap_init, pref, T0=1.0, cooling=0.995, steps=2000, seed=None):
     score_pair = {(m,t): sum(pref[(m,t)].values()) for m in murid for t in tutor}
     PEN = max(score_pair.values()) * len(murid)
+    rng = np.random.default_rng(seed)
 
-    curr = {m: random.choice(tutor) for m in murid}
+    curr = {m: tutor[k] for m, k in zip(murid, rng.integers(len(tutor), size=len(murid)).tolist())}
     def fitness(assign):
         s = sum(score_pair[(m,assign[m])] for m in murid)
         overflow = sum(max(0, sum(1 for x in assign if assign[x]==t)-cap_init[t]) for t in tutor)
         return s - PEN*overflow
 
     best, best_fit = curr.copy(), fitness(curr)
+    # Angka acak semua langkah diambil sekaligus, bukan per langkah
+    pick_m = rng.integers(len(murid), size=steps).tolist()
+    pick_t = rng.integers(len(tutor), size=steps).tolist()
+    accept = rng.random(steps).tolist()
     T = T0
-    for _ in range(steps):
+    for step in range(steps):
         child = curr.copy()
-        m = random.choice(murid)
-        child[m] = random.choice(tutor)
+        m = murid[pick_m[step]]
+        child[m] = tutor[pick_t[step]]
         f_child, f_curr = fitness(child), fitness(curr)
         delta = f_child - f_curr
-        if delta > 0 or random.random() < np.exp(delta/T):
+        if delta > 0 or accept[step] < math.exp(delta/T):
             curr = child
             if f_child > best_fit:
                 best, best_fit = child.copy(), f_child
@@ -75,12 +81,14 @@ def evaluate(assign, pref, cap):
     return match_score, percent
 
 # Runner khusus SA
-def run_sa_only(scenarios, repeat=3, **sa_kwargs):
+def run_sa_only(scenarios, repeat=3, seed=None, **sa_kwargs):
     records = []
+    # Tiap run dapat stream sendiri dari SeedSequence, jadi seluruh tabel bisa diulang
+    seeds = iter(np.random.SeedSequence(seed).spawn(len(scenarios) * repeat))
     for name, (murid, tutor, cap, pref) in scenarios.items():
         for _ in range(repeat):
             t0 = time.perf_counter()
-            sol_sa, _ = sa_match(murid, tutor, cap, pref, **sa_kwargs)
+            sol_sa, _ = sa_match(murid, tutor, cap, pref, seed=next(seeds), **sa_kwargs)
             t1 = time.perf_counter()
             score, pct = evaluate(sol_sa, pref, cap)
             records.append({
@@ -94,14 +102,15 @@ def run_sa_only(scenarios, repeat=3, **sa_kwargs):
 
 if __name__ == "__main__":
     # Definisikan skenario
+    rng = np.random.default_rng(42)
     scenarios = {
-        "Conflict-Heavy": scenario_conflict_heavy(15, 5),
-        "Capacity-Sym":   scenario_capacity(10, 10, asym=False),
-        "Capacity-Asym":  scenario_capacity(10, 10, asym=True),
+        "Conflict-Heavy": scenario_conflict_heavy(15, 5, rng=rng),
+        "Capacity-Sym":   scenario_capacity(10, 10, asym=False, rng=rng),
+        "Capacity-Asym":  scenario_capacity(10, 10, asym=True, rng=rng),
     }
 
     # Jalankan SA dengan parameter default (T0, cooling, steps)
-    df_sa = run_sa_only(scenarios, repeat=5, T0=1.0, cooling=0.995, steps=1500)
+    df_sa = run_sa_only(scenarios, repeat=5, seed=42, T0=1.0, cooling=0.995, steps=1500)
 
     # Tampilkan hasil
     summary = df_sa.groupby("Scenario")[["Score","%Constraint","Time(s)"]].agg(['mean','std']).round(3)